@@ -1,8 +1,15 @@
-from .AF import *
-from .CAS import *
-from .D3DLEVEL import *
-from .DLS import *
-from .FXAA import *
-from .HDR import *
-from .SMAA import *
-from .VSYNC import *
\ No newline at end of file
+import importlib
+
+from .base import BaseSetting, VKBASALT, DXVK
+from .dependencies import DependencyGraph
+
+
+def __getattr__(name):
+    # The registry (SETTINGS, SETTINGS_BY_KEY, SETTING_IDS, GROUPS, DEPENDENCIES and every
+    # setting descriptor) is only built when one of its names is first looked up. Its names
+    # then replace the submodules of the same name, e.g. Settings.FXAA is the descriptor.
+    registry = importlib.import_module(".registry", __name__)
+    globals().update((key, value) for key, value in vars(registry).items() if not key.startswith("_"))
+    if name.startswith("_") or name not in vars(registry):
+        raise AttributeError(f"module 'Settings' has no attribute '{name}'")
+    return globals()[name]
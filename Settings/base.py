@@ -0,0 +1,148 @@
+"""
+File:
+    base.py
+Description:
+    Contains the descriptor shared by every graphics setting. Tooltips are kept as plain
+    text, they are only turned into rich text when first shown (see tooltips.py).
+    Descriptors are built once, when the settings registry is first used, and are immutable,
+    so a single instance of each setting is shared by the GUI and the headless tooling.
+"""
+
+VKBASALT = "vkBasalt"
+DXVK = "dxvk"
+
+
+class BaseSetting:
+    """
+    Describes a graphics setting.
+
+    Attributes:
+        key (str): Unique name of the setting, e.g. "FXAA_Quality_Subpixel".
+        title (str): Plain text title of the setting.
+        sub (bool): Whether the setting is a sub-option of the setting above it.
+        target (str): Conf file the setting is written to, VKBASALT or DXVK.
+        conf_key (str): Key written to the conf file, None if the setting only toggles an effect.
+        effect (str): vkBasalt effect the setting belongs to, None for dxvk settings.
+        options (tuple): Option labels shown in the combobox, the first one is the placeholder.
+        values (tuple): Conf value of every option, None for the placeholder.
+        tooltip_header (str): Header of the tooltip.
+        tooltip_body (tuple): Lines of the tooltip's description.
+        tooltip_notes (tuple): Lines of the tooltip's notes, usually one per option.
+        requires (tuple): (setting key, allowed option labels) pairs that must all hold for the
+            setting to be editable, None in the allowed labels stands for the placeholder.
+    """
+
+    __slots__ = ("key", "title", "sub", "target", "conf_key", "effect", "options", "values",
+                 "tooltip_header", "tooltip_body", "tooltip_notes", "requires", "_option_index")
+
+    def __init__(self, key, title, options, values, tooltip_header, tooltip_body,
+                 target, conf_key=None, effect=None, sub=False, requires=(), tooltip_notes=()):
+        """
+        Initializes a graphics setting.
+
+        Args:
+            key (str): Unique name of the setting.
+            title (str): Plain text title of the setting.
+            options (tuple): Option labels, starting with the placeholder.
+            values (tuple): Conf value of every option except the placeholder.
+            tooltip_header (str): Header of the tooltip.
+            tooltip_body (tuple): Lines of the tooltip's description.
+            target (str): Conf file the setting is written to.
+            conf_key (str): Key written to the conf file.
+            effect (str): vkBasalt effect the setting belongs to.
+            sub (bool): Whether the setting is a sub-option.
+            requires (tuple): (setting key, allowed option labels) pairs the setting depends on.
+            tooltip_notes (tuple): Lines of the tooltip's notes.
+        """
+        if len(values) != len(options) - 1:
+            raise ValueError(f"{key}: expected {len(options) - 1} values, got {len(values)}")
+        fields = {
+            "key": key,
+            "title": title,
+            "sub": sub,
+            "target": target,
+            "conf_key": conf_key,
+            "effect": effect,
+            "options": tuple(options),
+            "values": (None, *values),
+            "tooltip_header": tooltip_header,
+            "tooltip_body": tuple(tooltip_body),
+            "tooltip_notes": tuple(tooltip_notes),
+            "requires": tuple((source, tuple(allowed)) for source, allowed in requires),
+            "_option_index": {option: index for index, option in enumerate(options)},
+        }
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} '{self.key}' is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} '{self.key}' is read-only")
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.key}>"
+
+    def option_index(self, label):
+        """
+        Gets the index of an option.
+
+        Args:
+            label (str): Option label.
+
+        Returns:
+            int: Index of the option.
+
+        Raises:
+            ValueError: If the setting has no such option.
+        """
+        try:
+            return self._option_index[label]
+        except KeyError:
+            raise ValueError(f"Unknown option '{label}' for setting '{self.key}'") from None
+
+    def get_title(self):
+        """
+        Gets the title of the setting.
+
+        Returns:
+            str: Title of the setting encoded in HTML.
+        """
+        indent = "&nbsp;&nbsp;&nbsp;&nbsp;-" if self.sub else ""
+        return f'<p>{indent}{self.title}&nbsp;&nbsp;&nbsp;&nbsp;\u2753</p>'
+
+    def get_options(self):
+        """
+        Gets the options of the setting.
+
+        Returns:
+            tuple: Option labels of the setting.
+        """
+        return self.options
+
+    def get_tooltip_header(self):
+        """
+        Gets the header text for the tooltip.
+
+        Returns:
+            str: Header of the tooltip.
+        """
+        return self.tooltip_header
+
+    def get_tooltip_body(self):
+        """
+        Gets the description lines of the tooltip.
+
+        Returns:
+            tuple: Lines of the tooltip's description.
+        """
+        return self.tooltip_body
+
+    def get_tooltip_notes(self):
+        """
+        Gets the note lines of the tooltip.
+
+        Returns:
+            tuple: Lines of the tooltip's notes.
+        """
+        return self.tooltip_notes
@@ -0,0 +1,112 @@
+"""
+File:
+    dependencies.py
+Description:
+    Compiles the `requires` constraints declared on the settings into a dependency graph.
+    The graph answers which settings are editable for a given selection, either for a whole
+    profile in one pass or incrementally for a single changed setting, in which case only the
+    dependents of that setting are looked at.
+"""
+
+
+class DependencyGraph:
+    """
+    Compiled enable/disable constraints between settings.
+
+    A setting is enabled when every one of its `requires` constraints holds. For each
+    (setting ID, option index) pair the graph precomputes which dependents that choice
+    enables, which it disables, and which have further constraints that need a recheck.
+    """
+
+    def __init__(self, settings):
+        """
+        Compiles the constraints of the given settings.
+
+        Args:
+            settings (tuple): Setting descriptors, the position of a setting is its ID.
+
+        Raises:
+            ValueError: If a setting requires an unknown setting or option.
+        """
+        ids = {setting.key: index for index, setting in enumerate(settings)}
+
+        # Setting ID -> ((source ID, frozenset of allowed option indices), ...)
+        self.conditions = []
+        # Setting ID -> IDs of the settings that depend on it
+        self.dependents = [[] for _ in settings]
+
+        for target, setting in enumerate(settings):
+            conditions = []
+            for source_key, allowed in setting.requires:
+                if source_key not in ids:
+                    raise ValueError(f"{setting.key} requires unknown setting '{source_key}'")
+                source = ids[source_key]
+                source_setting = settings[source]
+                indices = frozenset(0 if label is None else source_setting.option_index(label)
+                                    for label in allowed)
+                conditions.append((source, indices))
+                self.dependents[source].append(target)
+            self.conditions.append(tuple(conditions))
+
+        # (source ID, option index) -> (enabled IDs, disabled IDs, IDs to recheck)
+        self.index = {}
+        for source, targets in enumerate(self.dependents):
+            if not targets:
+                continue
+            for option in range(len(settings[source].options)):
+                enabled, disabled, recheck = [], [], []
+                for target in targets:
+                    if len(self.conditions[target]) > 1:
+                        recheck.append(target)
+                    elif option in self.conditions[target][0][1]:
+                        enabled.append(target)
+                    else:
+                        disabled.append(target)
+                self.index[(source, option)] = (tuple(enabled), tuple(disabled), tuple(recheck))
+
+    def is_enabled(self, setting_id, values):
+        """
+        Checks whether a setting is editable.
+
+        Args:
+            setting_id (int): ID of the setting.
+            values (list): Selected option index of every setting.
+
+        Returns:
+            bool: True if every constraint of the setting holds.
+        """
+        return all(values[source] in allowed for source, allowed in self.conditions[setting_id])
+
+    def evaluate(self, values):
+        """
+        Works out the enabled state of every setting in a single pass, used when a whole
+        profile is loaded.
+
+        Args:
+            values (list): Selected option index of every setting.
+
+        Returns:
+            list: Enabled state of every setting.
+        """
+        return [self.is_enabled(setting_id, values) for setting_id in range(len(self.conditions))]
+
+    def propagate(self, setting_id, option, values):
+        """
+        Works out the settings whose enabled state follows from a changed setting.
+
+        Args:
+            setting_id (int): ID of the changed setting.
+            option (int): Newly selected option index of the setting.
+            values (list): Selected option index of every setting, including the change.
+
+        Returns:
+            list: (setting ID, enabled) pairs for every dependent of the changed setting.
+        """
+        entry = self.index.get((setting_id, option))
+        if entry is None:
+            return []
+        enabled, disabled, recheck = entry
+        changes = [(target, True) for target in enabled]
+        changes.extend((target, False) for target in disabled)
+        changes.extend((target, self.is_enabled(target, values)) for target in recheck)
+        return changes
@@ -0,0 +1,66 @@
+"""
+File:
+    registry.py
+Description:
+    Builds the registry of every setting. The Settings package imports this module on first
+    use of one of the names below, so importing the package alone stays cheap.
+"""
+
+from .dependencies import DependencyGraph
+from .AF import *
+from .CAS import *
+from .D3DLEVEL import *
+from .DLS import *
+from .FXAA import *
+from .HDR import *
+from .SMAA import *
+from .VSYNC import *
+
+# Registry of every setting in the order they are shown in the settings panel, the position
+# of a setting in this tuple is its ID
+SETTINGS = (
+    FXAA,                           #ID - 00
+    FXAA_Quality_Subpixel,          #ID - 01
+    FXAA_Quality_Edge_Threshold,    #ID - 02
+    FXAA_Edge_Threshold_Bias,       #ID - 03
+    SMAA,                           #ID - 04
+    SMAA_Edge_Detection,            #ID - 05
+    SMAA_Threshold,                 #ID - 06
+    SMAA_Search_Steps,              #ID - 07
+    SMAA_Search_Steps_Diagonal,     #ID - 08
+    SMAA_Corner_Rounding,           #ID - 09
+    CAS,                            #ID - 10
+    DLS_Sharpness,                  #ID - 11
+    DLS_Denoise,                    #ID - 12
+    VSYNC,                          #ID - 13
+    Frame_Limit,                    #ID - 14
+    VSYNC_D3D9,                     #ID - 15
+    Frame_Limit_D3D9,               #ID - 16
+    Anistropic_Filtering,           #ID - 17
+    LOD_Bias,                       #ID - 18
+    Clamp_Negative_LOD,             #ID - 19
+    Anistropic_Filtering_D3D9,      #ID - 20
+    LOD_Bias_D3D9,                  #ID - 21
+    Clamp_Negative_LOD_D3D9,        #ID - 22
+    HDR,                            #ID - 23
+    D3D_Level,                      #ID - 24
+)
+
+# Setting key -> setting and setting key -> ID
+SETTINGS_BY_KEY = {setting.key: setting for setting in SETTINGS}
+SETTING_IDS = {setting.key: index for index, setting in enumerate(SETTINGS)}
+
+# Sections of the settings panel, (title, first ID, ID after the last one)
+GROUPS = (
+    ("FXAA", 0, 4),
+    ("SMAA", 4, 10),
+    ("Contrast Adaptive Sharpening", 10, 11),
+    ("Denoised Luma Sharpening", 11, 13),
+    ("VSync and Frame Limit", 13, 17),
+    ("Texture Filtering", 17, 23),
+    ("HDR", 23, 24),
+    ("Feature Level", 24, 25),
+)
+
+# Constraints between the settings, compiled once
+DEPENDENCIES = DependencyGraph(SETTINGS)
@@ -0,0 +1,159 @@
+"""
+Compact, array-backed catalog of applications with a prefix/trigram search index.
+
+Every application is a row holding a display name, a path that identifies it (an executable
+or a game's install directory) and the source it was found by. Rows are only ever appended,
+so the postings of the search index stay sorted without any extra work.
+
+This module must stay free of any PyQt6 imports, it is shared with the library scanners.
+"""
+from array import array
+
+# Where an application was found
+SOURCE_MANUAL = 0
+SOURCE_STEAM = 1
+SOURCE_WINE = 2
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _word_prefixes(text):
+    # One and two character prefixes of every word, used for queries too short for trigrams
+    prefixes = set()
+    for word in text.split():
+        prefixes.add(word[:1])
+        prefixes.add(word[:2])
+    return prefixes
+
+
+class AppCatalog:
+    """
+    Array-backed store of applications.
+
+    Attributes:
+        names (list): Display name of every row.
+        paths (list): Path of every row, unique within the catalog.
+        sources (array): Source of every row, one of the SOURCE_* constants.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.paths = []
+        self.sources = array("B")
+        self.row_of_path = {}
+
+        # Lower-cased names used to verify matches, and the postings of the search index
+        self._folded = []
+        self._trigrams = {}
+        self._prefixes = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, path):
+        return path in self.row_of_path
+
+    def add_many(self, entries):
+        """
+        Appends applications in one go, skipping paths that are already in the catalog.
+
+        Args:
+            entries (iterable): (name, path, source) tuples.
+
+        Returns:
+            range: Rows of the applications that were added.
+        """
+        first = len(self.names)
+        trigrams = self._trigrams
+        prefixes = self._prefixes
+        for name, path, source in entries:
+            if path in self.row_of_path:
+                continue
+            row = len(self.names)
+            folded = name.casefold()
+            self.names.append(name)
+            self.paths.append(path)
+            self.sources.append(source)
+            self.row_of_path[path] = row
+            self._folded.append(folded)
+            for gram in _trigrams(folded):
+                posting = trigrams.get(gram)
+                if posting is None:
+                    posting = trigrams[gram] = array("I")
+                posting.append(row)
+            for prefix in _word_prefixes(folded):
+                posting = prefixes.get(prefix)
+                if posting is None:
+                    posting = prefixes[prefix] = array("I")
+                posting.append(row)
+        return range(first, len(self.names))
+
+    def new_entries(self, entries):
+        """
+        Drops the applications that are already in the catalog or repeated within a batch.
+
+        Args:
+            entries (iterable): (name, path, source) tuples.
+
+        Returns:
+            list: The entries that add_many would add.
+        """
+        seen = set()
+        fresh = []
+        for entry in entries:
+            path = entry[1]
+            if path not in self.row_of_path and path not in seen:
+                seen.add(path)
+                fresh.append(entry)
+        return fresh
+
+    def matches(self, row, query):
+        """
+        Checks whether a row matches a search query.
+
+        Args:
+            row (int): Row to check.
+            query (str): Case-folded search query.
+
+        Returns:
+            bool: True if the row matches.
+        """
+        folded = self._folded[row]
+        if len(query) < 3:
+            return any(word.startswith(query) for word in folded.split())
+        return query in folded
+
+    def search(self, query, within=None):
+        """
+        Finds the rows whose name matches a query.
+
+        Queries shorter than three characters match the start of any word of a name, longer
+        queries match anywhere in the name.
+
+        Args:
+            query (str): Search query, matched case-insensitively.
+            within (array): Rows to narrow down, e.g. the result of a shorter query that this
+                query extends, so typing a character only rechecks the previous matches.
+
+        Returns:
+            array: Matching rows in ascending order, None if the query is empty.
+        """
+        query = query.casefold().strip()
+        if not query:
+            return None
+
+        # Word prefixes are indexed exactly, their postings need no further checks
+        if len(query) < 3:
+            return array("I", self._prefixes.get(query, ()))
+
+        # The rarest trigram of the query gives the smallest set of candidates
+        postings = [self._trigrams.get(gram) for gram in _trigrams(query)]
+        if any(posting is None for posting in postings):
+            return array("I")
+        candidates = min(postings, key=len)
+
+        if within is not None and len(within) < len(candidates):
+            candidates = within
+        return array("I", (row for row in candidates if self.matches(row, query)))
@@ -1,6 +1,129 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QListWidget, QLabel
+import os
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QListView, QLabel, QLineEdit, QFileDialog
+from app_index import AppCatalog, SOURCE_MANUAL
+from workers import Worker
+
+PathRole = Qt.ItemDataRole.UserRole + 1  # str: Path of an application
+
+
+class AppListModel(QAbstractListModel):
+    """
+    List model over an AppCatalog, showing either every application or those matching a filter.
+    """
+
+    def __init__(self, catalog=None, parent=None):
+        """
+        Initializes the AppListModel.
+
+        Args:
+            catalog (AppCatalog): Catalog to show, a new empty one if None.
+            parent (QObject): Parent object.
+
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        self.catalog = catalog if catalog is not None else AppCatalog()
+
+        # Current filter and the catalog rows it matches, None while unfiltered
+        self.filter_text = ""
+        self.visible = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.catalog) if self.visible is None else len(self.visible)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.catalog_row(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.catalog.names[row]
+        if role in (Qt.ItemDataRole.ToolTipRole, PathRole):
+            return self.catalog.paths[row]
+        return None
+
+    def catalog_row(self, row):
+        """
+        Maps a row of the model onto a row of the catalog.
+
+        Args:
+            row (int): Row in the model.
+
+        Returns:
+            int: Row in the catalog.
+        """
+        return row if self.visible is None else self.visible[row]
+
+    def add_apps(self, entries):
+        """
+        Adds a batch of applications with a single row insertion.
+
+        Args:
+            entries (iterable): (name, path, source) tuples.
+
+        Returns:
+            int: Number of applications added.
+        """
+        entries = self.catalog.new_entries(entries)
+        if not entries:
+            return 0
+
+        if self.visible is None:
+            first = len(self.catalog)
+            self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+            added = self.catalog.add_many(entries)
+            self.endInsertRows()
+        else:
+            # Rows outside the filter are added to the catalog without touching the view
+            added = self.catalog.add_many(entries)
+            query = self.filter_text.casefold().strip()
+            matches = [row for row in added if self.catalog.matches(row, query)]
+            if matches:
+                first = len(self.visible)
+                self.beginInsertRows(QModelIndex(), first, first + len(matches) - 1)
+                self.visible.extend(matches)
+                self.endInsertRows()
+        return len(added)
+
+    def set_filter(self, text):
+        """
+        Shows only the applications whose name matches a search query.
+
+        Args:
+            text (str): Search query, an empty query shows every application.
+
+        Returns:
+            None
+        """
+        previous = self.filter_text.casefold().strip()
+        query = text.casefold().strip()
+
+        # A query that extends the previous one can only narrow its matches, as long as both
+        # are matched the same way (word prefix below three characters, substring above)
+        within = None
+        if (self.visible is not None and previous and query.startswith(previous)
+                and (len(previous) >= 3) == (len(query) >= 3)):
+            within = self.visible
+
+        self.beginResetModel()
+        self.filter_text = text
+        self.visible = self.catalog.search(query, within)
+        self.endResetModel()
+
 
 class AppListPanel(QWidget):
+    # Emitted with the path of the application that became current
+    appSelected = pyqtSignal(str)
+
+    # Emitted with the number of selected applications whenever the selection changes
+    selectionCountChanged = pyqtSignal(int)
+
+    # Emitted once a library scan is over, whether it completed or was cancelled
+    scanFinished = pyqtSignal()
+
     def __init__(self):
         super().__init__()
 
@@ -11,17 +134,164 @@ class AppListPanel(QWidget):
         self.label = QLabel("Application List")
         layout.addWidget(self.label)
 
-        # Add application list widget
-        self.app_list_widget = QListWidget()
-        layout.addWidget(self.app_list_widget)
+        # Add search box
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search applications...")
+        self.search_box.setClearButtonEnabled(True)
+        layout.addWidget(self.search_box)
 
-        # Add button to add applications
+        # Add application list view, backed by a model so only visible rows are painted
+        self.app_model = AppListModel(parent=self)
+        self.app_list_view = QListView()
+        self.app_list_view.setModel(self.app_model)
+        self.app_list_view.setUniformItemSizes(True)
+        self.app_list_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.app_list_view.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        layout.addWidget(self.app_list_view)
+
+        # Add buttons to scan for applications and to add executables by hand
+        buttons = QHBoxLayout()
         self.add_app_button = QPushButton("Add Application")
-        layout.addWidget(self.add_app_button)
+        self.add_exe_button = QPushButton("Add Executable...")
+        buttons.addWidget(self.add_app_button)
+        buttons.addWidget(self.add_exe_button)
+        layout.addLayout(buttons)
+
+        # Scan that is currently running, kept referenced until it finishes
+        self.scan_worker = None
 
-        # Connect button click signal to handler
+        # Connect signals to handlers
         self.add_app_button.clicked.connect(self.add_application)
+        self.add_exe_button.clicked.connect(self.add_executable)
+        self.search_box.textChanged.connect(self.app_model.set_filter)
+        self.app_list_view.selectionModel().currentChanged.connect(self.current_changed)
+        self.app_list_view.selectionModel().selectionChanged.connect(self.selection_changed)
+        self.app_model.modelReset.connect(self.selection_changed)
 
     def add_application(self):
-        # Logic to add application goes here
-        pass
+        """
+        Discovers the installed games in the background, Steam libraries first and then the
+        executables in Wine/Proton prefixes, and adds them to the application list as they are
+        found.
+
+        Returns:
+            None
+        """
+        if self.scan_worker is not None:
+            return
+        self.scan_worker = Worker(self.scan_libraries)
+        self.scan_worker.signals.batch.connect(self.add_apps)
+        self.scan_worker.signals.finished.connect(self.scan_finished)
+        self.add_app_button.setEnabled(False)
+        QThreadPool.globalInstance().start(self.scan_worker)
+
+    def scan_libraries(self, worker):
+        """
+        Runs the library scanners, called on the worker's pool thread.
+
+        Args:
+            worker (Worker): Worker running the scan.
+
+        Returns:
+            None
+        """
+        # The scanners pull in concurrent.futures and json, which the window doesn't need to
+        # come up, so they are only imported by the first scan
+        from steam_scanner import scan_steam_libraries
+        from wine_scanner import scan_wine_prefixes
+
+        scan_steam_libraries(on_batch=worker.signals.batch.emit)
+        if not worker.is_cancelled():
+            scan_wine_prefixes(on_batch=worker.signals.batch.emit, cancelled=worker.is_cancelled)
+
+    def scan_finished(self):
+        """
+        Re-enables scanning once a scan is done.
+
+        Returns:
+            None
+        """
+        self.scan_worker = None
+        self.add_app_button.setEnabled(True)
+        self.scanFinished.emit()
+
+    def current_changed(self, current, previous):
+        """
+        Announces the application that became current in the list.
+
+        Args:
+            current (QModelIndex): Index of the new current application.
+            previous (QModelIndex): Index of the previous one.
+
+        Returns:
+            None
+        """
+        if current.isValid():
+            self.appSelected.emit(current.data(PathRole))
+
+    def selection_changed(self):
+        """
+        Announces the number of selected applications.
+
+        Returns:
+            None
+        """
+        self.selectionCountChanged.emit(self.selection_count())
+
+    def selection_count(self):
+        """
+        Counts the selected applications without visiting them one by one.
+
+        Returns:
+            int: Number of selected applications.
+        """
+        return sum(selection_range.height() for selection_range in self.app_list_view.selectionModel().selection())
+
+    def selected_apps(self):
+        """
+        Gets the paths of the selected applications.
+
+        Returns:
+            list: Path of every selected application, in list order.
+        """
+        # Walking the selection ranges avoids building a QModelIndex per selected row
+        model = self.app_model
+        paths = model.catalog.paths
+        rows = set()
+        for selection_range in self.app_list_view.selectionModel().selection():
+            rows.update(range(selection_range.top(), selection_range.bottom() + 1))
+        return [paths[model.catalog_row(row)] for row in sorted(rows)]
+
+    def cancel_scan(self):
+        """
+        Stops a running scan and waits for its worker to return.
+
+        Returns:
+            None
+        """
+        if self.scan_worker is not None:
+            self.scan_worker.cancel()
+            QThreadPool.globalInstance().waitForDone()
+
+    def add_executable(self):
+        """
+        Asks for one or more executables and adds them to the application list.
+
+        Returns:
+            None
+        """
+        paths, _ = QFileDialog.getOpenFileNames(self, "Add Application", os.path.expanduser("~"),
+                                                "Executables (*.exe);;All files (*)")
+        self.add_apps((os.path.basename(path), path, SOURCE_MANUAL) for path in paths)
+
+    def add_apps(self, entries):
+        """
+        Adds a batch of applications to the list.
+
+        Args:
+            entries (iterable): (name, path, source) tuples.
+
+        Returns:
+            int: Number of applications added.
+        """
+        return self.app_model.add_apps(entries)
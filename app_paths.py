@@ -0,0 +1,44 @@
+"""
+Locations of the files the settings manager keeps between runs, following the XDG base
+directory specification.
+"""
+import os
+
+APP_DIR_NAME = "3d-settings-manager"
+
+
+def _xdg_dir(variable, fallback):
+    base = os.environ.get(variable) or os.path.join(os.path.expanduser("~"), fallback)
+    path = os.path.join(base, APP_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_dir():
+    """
+    Gets the directory for caches that can be rebuilt at any time.
+
+    Returns:
+        str: Path of the cache directory, created if missing.
+    """
+    return _xdg_dir("XDG_CACHE_HOME", ".cache")
+
+
+def data_dir():
+    """
+    Gets the directory for the user's data, such as the profile store.
+
+    Returns:
+        str: Path of the data directory, created if missing.
+    """
+    return _xdg_dir("XDG_DATA_HOME", os.path.join(".local", "share"))
+
+
+def config_dir():
+    """
+    Gets the directory the generated conf files are written to.
+
+    Returns:
+        str: Path of the config directory, created if missing.
+    """
+    return _xdg_dir("XDG_CONFIG_HOME", ".config")
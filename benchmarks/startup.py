@@ -0,0 +1,108 @@
+"""
+Startup benchmark of the settings manager.
+
+Usage:
+    python benchmarks/startup.py [-n RUNS] [-o results.json] [--imports N]
+
+Starts main.py RUNS times under "python -X importtime" with SETTINGS_MANAGER_STARTUP_REPORT
+set, which makes the application print its startup timings and quit as soon as it is usable.
+Reports the median time to import the application modules, to show the window, to paint it
+for the first time (time-to-first-paint) and to finish building the settings panel
+(time-to-interactive), all measured from the first line of main.py, along with the wall
+time of the whole process and the slowest imports.
+
+Runs headless on the offscreen platform unless QT_QPA_PLATFORM is already set.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKS = ("imports", "shown", "first_paint", "interactive")
+
+
+def parse_importtime(stderr):
+    """
+    Parses the output of -X importtime.
+
+    Args:
+        stderr (str): Standard error of the process.
+
+    Returns:
+        dict: Module name -> cumulative import time in seconds.
+    """
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        try:
+            imports[name.strip()] = int(cumulative) / 1e6
+        except ValueError:
+            continue  # The header line
+    return imports
+
+
+def run_once(env):
+    """
+    Starts the application once and collects its startup timings.
+
+    Args:
+        env (dict): Environment of the process.
+
+    Returns:
+        tuple: (startup timings dict, wall time in seconds, imports dict).
+    """
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", os.path.join(ROOT, "main.py")],
+                             cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    wall = time.perf_counter() - start
+    timings = None
+    for line in process.stdout.splitlines():
+        if line.startswith("{"):
+            timings = json.loads(line)
+    if timings is None:
+        raise RuntimeError(f"main.py didn't report its startup timings:\n{process.stderr[-2000:]}")
+    return timings, wall, parse_importtime(process.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python benchmarks/startup.py",
+                                     description="Measure the startup time of the settings manager.")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="number of runs (default: 5)")
+    parser.add_argument("-o", "--output", default=None, help="write the results as JSON")
+    parser.add_argument("--imports", type=int, default=10, help="slowest imports to list (default: 10)")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, SETTINGS_MANAGER_STARTUP_REPORT="1")
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    runs = [run_once(env) for _ in range(args.runs)]
+    results = {mark: statistics.median(timings[mark] for timings, _, _ in runs) for mark in MARKS}
+    results["wall"] = statistics.median(wall for _, wall, _ in runs)
+
+    # Imports of the median run by wall time, a single run keeps the numbers consistent
+    _, _, imports = sorted(runs, key=lambda run: run[1])[len(runs) // 2]
+    slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:args.imports]
+    results["imports_slowest"] = dict(slowest)
+
+    print(f"Startup over {args.runs} runs (median, seconds from the first line of main.py):")
+    for mark in MARKS:
+        print(f"    {mark:<12} {results[mark] * 1000:8.1f} ms")
+    print(f"    {'process':<12} {results['wall'] * 1000:8.1f} ms (wall time of the whole process)")
+    print("Slowest imports (cumulative):")
+    for name, seconds in slowest:
+        print(f"    {seconds * 1000:8.1f} ms  {name}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,492 @@
+"""
+Performance benchmark suite of the settings manager.
+
+Usage:
+    python benchmarks/suite.py [-o results.json] [--baseline baseline.json] [--tolerance 0.25]
+                               [--save-baseline baseline.json] [-r REPEAT] [-k PATTERN]
+
+Every case is run REPEAT times and its fastest run is kept. The cases cover:
+    panel_build_N        SettingsPanel construction with N synthetic settings, up to its first paint
+    propagation_storm    Dependency propagation through SettingsModel.set_option with a view attached
+    load_values          Whole profiles loaded into a SettingsPanel
+    app_insert_N         Adding N applications to an AppListPanel in scanner-sized batches
+    app_filter           Incremental search over 100k applications
+    conf_render          Rendering vkBasalt.conf and dxvk.conf for random profiles
+    conf_write_unchanged Compiling a manifest whose confs are already up to date
+    steam_scan_cold/warm Scanning a synthetic Steam library without and with the manifest index
+    wine_scan_cold/warm  Walking a synthetic Wine prefix without and with the directory index
+
+The results are written as JSON. When a baseline is given, a case that got slower than its
+baseline time by more than the tolerance is reported as a regression and the suite exits
+with status 1. Baselines depend on the machine, record one with --save-baseline.
+
+Runs headless on the offscreen platform unless QT_QPA_PLATFORM is already set.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+from PyQt6.QtWidgets import QApplication
+
+from Settings import SETTINGS, GROUPS, BaseSetting
+
+WORDS = ("half", "life", "portal", "witcher", "elden", "ring", "dark", "souls", "counter",
+         "strike", "doom", "eternal", "cyber", "punk", "red", "dead", "grand", "theft", "auto",
+         "stardew", "valley", "hollow", "knight", "mass", "effect", "fallout", "skyrim")
+
+# Size of the batches the library scanners hand to the app list
+SCAN_BATCH = 256
+
+
+def synthetic_registry(count):
+    """
+    Builds a registry of count settings out of copies of the real one, each copy with its own
+    keys and constraints.
+
+    Args:
+        count (int): Number of settings, rounded up to a whole number of copies.
+
+    Returns:
+        tuple: (settings, groups) in the form SettingsPanel takes.
+    """
+    settings = []
+    groups = []
+    for copy in range((count + len(SETTINGS) - 1) // len(SETTINGS)):
+        offset = len(settings)
+        for setting in SETTINGS:
+            settings.append(BaseSetting(
+                key=f"{setting.key}#{copy}",
+                title=setting.title,
+                options=setting.options,
+                values=setting.values[1:],
+                tooltip_header=setting.tooltip_header,
+                tooltip_body=setting.tooltip_body,
+                tooltip_notes=setting.tooltip_notes,
+                target=setting.target,
+                conf_key=setting.conf_key,
+                effect=setting.effect,
+                sub=setting.sub,
+                requires=tuple((f"{source}#{copy}", allowed) for source, allowed in setting.requires),
+            ))
+        groups.extend((f"{title} #{copy}", offset + first, offset + stop) for title, first, stop in GROUPS)
+    return tuple(settings), tuple(groups)
+
+
+def random_profile(rng):
+    """
+    Picks a random option label for a random subset of the settings.
+
+    Args:
+        rng (random.Random): Random number generator.
+
+    Returns:
+        dict: Setting key -> option label.
+    """
+    return {setting.key: rng.choice(setting.options[1:]) for setting in SETTINGS if rng.random() < 0.6}
+
+
+def app_entries(count, rng):
+    """
+    Builds synthetic app list entries.
+
+    Args:
+        count (int): Number of entries.
+        rng (random.Random): Random number generator.
+
+    Returns:
+        list: (name, path, source) tuples.
+    """
+    return [(f"{' '.join(rng.sample(WORDS, 3))} {i}", f"/games/{i}/game.exe", 0) for i in range(count)]
+
+
+def process_events():
+    """
+    Runs the event loop until no events are pending, so queued layouts and paints are done.
+
+    Returns:
+        None
+    """
+    QApplication.processEvents()
+    QApplication.processEvents()
+
+
+# Cases, each one returns (seconds, items processed)
+
+
+def bench_panel_build(count):
+    from settings_panel import SettingsPanel
+    settings, groups = synthetic_registry(count)
+    start = time.perf_counter()
+    panel = SettingsPanel(settings, groups)
+    panel.resize(800, 900)
+    panel.show()
+    process_events()
+    elapsed = time.perf_counter() - start
+    panel.close()
+    panel.deleteLater()
+    return elapsed, len(settings)
+
+
+def bench_propagation_storm():
+    from settings_panel import SettingsPanel
+    settings, groups = synthetic_registry(2500)
+    panel = SettingsPanel(settings, groups)
+    panel.resize(800, 900)
+    panel.show()
+    process_events()
+
+    # Flip every setting that others depend on back and forth
+    sources = [setting_id for setting_id, dependents in enumerate(panel.model.graph.dependents) if dependents]
+    changes = 0
+    start = time.perf_counter()
+    for option in (1, 2, 1, 0):
+        for setting_id in sources:
+            panel.model.set_option(setting_id, min(option, len(settings[setting_id].options) - 1))
+            changes += 1
+    process_events()
+    elapsed = time.perf_counter() - start
+    panel.close()
+    panel.deleteLater()
+    return elapsed, changes
+
+
+def bench_load_values():
+    from settings_panel import SettingsPanel
+    settings, groups = synthetic_registry(2500)
+    panel = SettingsPanel(settings, groups)
+    panel.resize(800, 900)
+    panel.show()
+    process_events()
+
+    rng = random.Random(13)
+    profiles = [[rng.randrange(len(setting.options)) for setting in settings] for _ in range(50)]
+    start = time.perf_counter()
+    for values in profiles:
+        panel.load_values(values)
+        process_events()
+    elapsed = time.perf_counter() - start
+    panel.close()
+    panel.deleteLater()
+    return elapsed, len(profiles)
+
+
+def bench_app_insert(count):
+    from app_list_panel import AppListPanel
+    entries = app_entries(count, random.Random(7))
+    panel = AppListPanel()
+    panel.resize(400, 900)
+    panel.show()
+    process_events()
+    start = time.perf_counter()
+    for first in range(0, count, SCAN_BATCH):
+        panel.add_apps(entries[first:first + SCAN_BATCH])
+    process_events()
+    elapsed = time.perf_counter() - start
+    panel.close()
+    panel.deleteLater()
+    return elapsed, count
+
+
+def bench_app_filter():
+    from app_list_panel import AppListPanel
+    panel = AppListPanel()
+    panel.add_apps(app_entries(100000, random.Random(7)))
+    panel.resize(400, 900)
+    panel.show()
+    process_events()
+    queries = ("w", "wi", "wit", "witc", "witch", "witcher", "witcher r", "", "ring 9999", "", "do", "doom e")
+    start = time.perf_counter()
+    for query in queries:
+        panel.search_box.setText(query)
+        process_events()
+    elapsed = time.perf_counter() - start
+    panel.close()
+    panel.deleteLater()
+    return elapsed, len(queries)
+
+
+def bench_conf_render():
+    from conf_render import render_vkbasalt, render_dxvk
+    rng = random.Random(3)
+    profiles = [random_profile(rng) for _ in range(5000)]
+    start = time.perf_counter()
+    for profile in profiles:
+        render_vkbasalt(profile)
+        render_dxvk(profile)
+    return time.perf_counter() - start, len(profiles)
+
+
+def bench_conf_write_unchanged():
+    from conf_compiler import compile_manifest
+    from conf_writer import ConfWriter
+    rng = random.Random(5)
+    manifest = {"apps": {f"app{i}": random_profile(rng) for i in range(1000)}}
+    with tempfile.TemporaryDirectory() as root:
+        writer = ConfWriter()
+        compile_manifest(manifest, root, jobs=1, writer=writer)
+        start = time.perf_counter()
+        compile_manifest(manifest, root, jobs=1, writer=writer)
+        elapsed = time.perf_counter() - start
+    return elapsed, len(manifest["apps"])
+
+
+def bench_profile_intern():
+    from profile_codec import ProfileTable, profile_vector
+    rng = random.Random(7)
+    shared = [profile_vector(random_profile(rng)) for _ in range(500)]
+    picks = [shared[rng.randrange(len(shared))] for _ in range(100000)]
+    table = ProfileTable()
+    start = time.perf_counter()
+    for row, values in enumerate(picks):
+        table.set(row, values)
+    return time.perf_counter() - start, len(picks)
+
+
+def bench_profile_validate():
+    import numpy as np
+    from profile_validator import ProfileValidator
+    validator = ProfileValidator()
+    rng = np.random.default_rng(11)
+    matrix = (rng.random((1000000, len(SETTINGS))) * validator.counts).astype(np.uint8)
+    start = time.perf_counter()
+    validator.check(matrix)
+    return time.perf_counter() - start, len(matrix)
+
+
+def bench_edge_thresholds():
+    import numpy as np
+    from edge_masks import EdgePlanes, FXAA_EDGES, SMAA_EDGES
+    rng = np.random.default_rng(12)
+    planes = EdgePlanes(rng.integers(0, 256, (2160, 3840, 3), dtype=np.uint8))
+    planes.fxaa_range, planes.smaa_luma_delta, planes.smaa_color_delta
+    start = time.perf_counter()
+    counts = [planes.option_counts(edges, {}) for edges in (FXAA_EDGES, SMAA_EDGES)]
+    return time.perf_counter() - start, sum(len(rows) for count in counts for rows in count.values())
+
+
+def bench_frametime_log():
+    import numpy as np
+    from frametime_log import analyze_log
+    rng = np.random.default_rng(13)
+    frametimes = rng.gamma(20.0, 0.8, 1000000)
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "mangohud.csv")
+        with open(path, "w") as file:
+            file.write("os,cpu,gpu\nLinux,CPU,GPU\nfps,frametime,cpu_load,gpu_load,elapsed\n")
+            file.writelines(f"{1000 / frametime:.0f},{frametime:.4f},25,97,{row}\n" for row, frametime in enumerate(frametimes))
+        start = time.perf_counter()
+        stats = analyze_log(path)
+        return time.perf_counter() - start, stats["frames"]
+
+
+def bench_cost_model_refit():
+    from cost_model import CostModel
+    from profile_codec import profile_vector
+    rng = random.Random(14)
+    runs = [(f"app{rng.randrange(4000)}", f"log{row}", profile_vector(random_profile(rng)), 0.0,
+             {"frames": 1000, "avg_fps": rng.uniform(30, 240)}) for row in range(20100)]
+    model = CostModel()
+    model.add_runs(runs[:20000])
+    model.option_costs()
+    start = time.perf_counter()
+    for run in runs[20000:]:
+        model.add_runs((run,))
+        model.option_costs()
+    return time.perf_counter() - start, len(runs) - 20000
+
+
+def make_steam_library(root, count):
+    """
+    Writes a Steam root holding count app manifests.
+
+    Args:
+        root (str): Directory of the Steam root.
+        count (int): Number of manifests.
+
+    Returns:
+        None
+    """
+    steamapps = os.path.join(root, "steamapps")
+    os.makedirs(os.path.join(steamapps, "common"))
+    for appid in range(count):
+        with open(os.path.join(steamapps, f"appmanifest_{appid}.acf"), "w") as file:
+            file.write(f'"AppState"\n{{\n\t"appid"\t\t"{appid}"\n\t"name"\t\t"Game {appid}"\n'
+                       f'\t"installdir"\t\t"Game{appid}"\n\t"StateFlags"\t\t"4"\n}}\n')
+
+
+def make_wine_prefix(root, games):
+    """
+    Writes a Wine prefix with a few games and the directories the scanner prunes.
+
+    Args:
+        root (str): Directory of the prefix.
+        games (int): Number of game directories.
+
+    Returns:
+        None
+    """
+    drive_c = os.path.join(root, "drive_c")
+    for pruned in ("windows/system32", "users/steamuser", "ProgramData/Package Cache"):
+        os.makedirs(os.path.join(drive_c, pruned))
+    for game in range(games):
+        directory = os.path.join(drive_c, "Games", f"Game {game}", "bin", "x64")
+        os.makedirs(directory)
+        for name in ("game.exe", "unins000.exe", "readme.txt"):
+            open(os.path.join(directory, name), "w").close()
+
+
+def bench_steam_scan(warm):
+    from steam_scanner import scan_steam_libraries
+    with tempfile.TemporaryDirectory() as root:
+        make_steam_library(os.path.join(root, "Steam"), 2000)
+        index_path = os.path.join(root, "steam_index.json")
+        if warm:
+            scan_steam_libraries([os.path.join(root, "Steam")], index_path)
+        start = time.perf_counter()
+        entries = scan_steam_libraries([os.path.join(root, "Steam")], index_path)
+        return time.perf_counter() - start, len(entries)
+
+
+def bench_wine_scan(warm):
+    from wine_scanner import scan_wine_prefixes
+    with tempfile.TemporaryDirectory() as root:
+        make_wine_prefix(os.path.join(root, "prefix"), 300)
+        index_path = os.path.join(root, "wine_index.json")
+        if warm:
+            scan_wine_prefixes([os.path.join(root, "prefix")], index_path)
+        start = time.perf_counter()
+        entries = scan_wine_prefixes([os.path.join(root, "prefix")], index_path)
+        return time.perf_counter() - start, len(entries)
+
+
+CASES = (
+    ("panel_build_25", lambda: bench_panel_build(25)),
+    ("panel_build_250", lambda: bench_panel_build(250)),
+    ("panel_build_2500", lambda: bench_panel_build(2500)),
+    ("propagation_storm", bench_propagation_storm),
+    ("load_values", bench_load_values),
+    ("app_insert_1k", lambda: bench_app_insert(1000)),
+    ("app_insert_10k", lambda: bench_app_insert(10000)),
+    ("app_insert_100k", lambda: bench_app_insert(100000)),
+    ("app_filter", bench_app_filter),
+    ("conf_render", bench_conf_render),
+    ("conf_write_unchanged", bench_conf_write_unchanged),
+    ("profile_intern_100k", bench_profile_intern),
+    ("profile_validate_1m", bench_profile_validate),
+    ("edge_thresholds_4k", bench_edge_thresholds),
+    ("frametime_log_1m", bench_frametime_log),
+    ("cost_model_refit", bench_cost_model_refit),
+    ("steam_scan_cold", lambda: bench_steam_scan(False)),
+    ("steam_scan_warm", lambda: bench_steam_scan(True)),
+    ("wine_scan_cold", lambda: bench_wine_scan(False)),
+    ("wine_scan_warm", lambda: bench_wine_scan(True)),
+)
+
+
+def run_cases(patterns, repeat):
+    """
+    Runs the selected cases.
+
+    Args:
+        patterns (list): fnmatch patterns of the cases to run, every case if empty.
+        repeat (int): Number of runs of every case, the fastest one is kept.
+
+    Returns:
+        dict: Case name -> {"seconds", "items", "per_second"}.
+    """
+    results = {}
+    for name, case in CASES:
+        if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+        runs = [case() for _ in range(repeat)]
+        seconds, items = min(runs)
+        results[name] = {"seconds": seconds, "items": items, "per_second": items / seconds if seconds > 0 else None}
+        print(f"{name:<22} {seconds * 1000:10.2f} ms  {items:>8} items", flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results against a baseline.
+
+    Args:
+        results (dict): Results of this run.
+        baseline (dict): Results of the baseline run.
+        tolerance (float): Allowed slowdown, 0.25 allows a case to take 25% longer.
+
+    Returns:
+        list: Names of the cases that regressed.
+    """
+    regressions = []
+    print(f"\n{'case':<22} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<22} {'-':>12} {result['seconds'] * 1000:10.2f}ms {'new':>8}")
+            continue
+        change = result["seconds"] / base["seconds"] - 1 if base["seconds"] > 0 else 0.0
+        regressed = change > tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<22} {base['seconds'] * 1000:10.2f}ms {result['seconds'] * 1000:10.2f}ms "
+              f"{change:+8.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python benchmarks/suite.py",
+                                     description="Run the performance benchmarks of the settings manager.")
+    parser.add_argument("-o", "--output", default=None, help="write the results as JSON")
+    parser.add_argument("--baseline", default=None, help="compare against the results in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline (default: 0.25 = 25%%)")
+    parser.add_argument("--save-baseline", default=None, help="write the results as a new baseline")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="runs per case, the fastest is kept (default: 3)")
+    parser.add_argument("-k", dest="patterns", action="append", default=[],
+                        help="only run the cases matching this fnmatch pattern, may be repeated")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = run_cases(args.patterns, args.repeat)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "repeat": args.repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as file:
+                json.dump(report, file, indent=4)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.tolerance:.0%}: "
+                  f"{', '.join(regressions)}", file=sys.stderr)
+    app.quit()
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Headless batch compiler that turns a profile manifest into vkBasalt.conf and dxvk.conf files.
+
+Usage:
+    python -m conf_compiler profiles.json -o confs/ [-j JOBS]
+
+The manifest is a JSON file of the form:
+
+    {
+        "apps": {
+            "witcher3": {"CAS": "0.50", "Frame_Limit": "144"},
+            "eldenring": {"SMAA": "Enabled", "SMAA_Search_Steps": "x32"},
+            "portal2": "AQ7xAAAAAAAAAAA"
+        }
+    }
+
+A profile is either a dict of option labels or a profile code, the shareable text form made by
+ProfileCodec.to_text (see profile_codec.py).
+
+Each app gets its own directory under the output directory holding its vkBasalt.conf and
+dxvk.conf, named after the app followed by a short hash of its full name, so apps whose names
+only differ in characters that can't be used in a file name don't share a directory. Profiles are compiled on a process pool and the throughput is reported once the
+run finishes. Confs are written through a ConfWriter, so unchanged confs are left untouched
+and keys added to them by hand are kept. This module never imports PyQt6.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app_paths import cache_dir
+from conf_render import render_dxvk, render_vkbasalt, VKBASALT_CONF, DXVK_CONF
+from conf_writer import ConfWriter, load_hashes, save_hashes, HASHES_FILE
+from profile_codec import ProfileCodec, vector_profile
+from Settings import VKBASALT, DXVK
+
+# Decodes the profile codes of a manifest
+CODEC = ProfileCodec()
+
+
+def app_conf_dir(root, app):
+    """
+    Gets the directory the confs of an app are written to.
+
+    Args:
+        root (str): Output directory of the run.
+        app (str): Name of the application.
+
+    Returns:
+        str: Path of the app's conf directory, the readable part of the name followed by a
+            hash of the whole name.
+    """
+    safe_name = "".join(ch if ch.isalnum() or ch in "._- " else "_" for ch in app).strip(". ")
+    digest = hashlib.blake2b(app.encode("utf-8", "surrogatepass"), digest_size=4).hexdigest()
+    return os.path.join(root, f"{safe_name or '_'}-{digest}")
+
+
+def conf_paths(root, app):
+    """
+    Gets the paths of the confs of an app.
+
+    Args:
+        root (str): Output directory of the run.
+        app (str): Name of the application.
+
+    Returns:
+        tuple: Absolute paths of the app's vkBasalt.conf and dxvk.conf.
+    """
+    directory = os.path.abspath(app_conf_dir(root, app))
+    return os.path.join(directory, VKBASALT_CONF), os.path.join(directory, DXVK_CONF)
+
+
+def compile_profile(job):
+    """
+    Renders and writes the confs of a single app.
+
+    Args:
+        job (tuple): (app name, profile dict or code, output directory, hash cache entries of the
+            app's confs).
+
+    Returns:
+        tuple: (app name, error message or None, write outcomes, updated hash cache entries).
+    """
+    app, profile, root, hashes = job
+    try:
+        if isinstance(profile, str):
+            profile = vector_profile(CODEC.from_text(profile))
+        vkbasalt = render_vkbasalt(profile)
+        dxvk = render_dxvk(profile)
+    except ValueError as error:
+        return app, str(error), [], {}
+
+    writer = ConfWriter(hashes)
+    vkbasalt_path, dxvk_path = conf_paths(root, app)
+    outcomes = [writer.write(vkbasalt_path, vkbasalt, VKBASALT), writer.write(dxvk_path, dxvk, DXVK)]
+    error = "; ".join(message for _, message in writer.errors) or None
+    return app, error, outcomes, writer.hashes
+
+
+def compile_manifest(manifest, root, jobs=None, writer=None):
+    """
+    Compiles every profile of a manifest.
+
+    Args:
+        manifest (dict): Parsed manifest, see the module docstring.
+        root (str): Output directory of the run.
+        jobs (int): Number of worker processes, defaults to the CPU count.
+        writer (ConfWriter): Writer whose hash cache and counts are used, a new one if None.
+
+    Returns:
+        list: (app name, error message) for every profile that failed.
+    """
+    writer = writer if writer is not None else ConfWriter()
+    apps = manifest.get("apps", {})
+    jobs = jobs or os.cpu_count() or 1
+
+    # A pool only pays for itself once there is enough work to spread around
+    if jobs == 1 or len(apps) < 64:
+        # The writer's own cache is handed over, so it is updated in place
+        results = map(compile_profile, ((app, profile, root, writer.hashes) for app, profile in apps.items()))
+        failures = []
+        for app, error, outcomes, _ in results:
+            for outcome in outcomes:
+                writer.count(outcome)
+            if error:
+                failures.append((app, error))
+        return failures
+
+    # Each worker process only gets the cache entries of the confs it writes
+    work = []
+    for app, profile in apps.items():
+        hashes = {path: writer.hashes[path] for path in conf_paths(root, app) if path in writer.hashes}
+        work.append((app, profile, root, hashes))
+
+    failures = []
+    chunksize = max(1, len(work) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for app, error, outcomes, hashes in pool.map(compile_profile, work, chunksize=chunksize):
+            for outcome in outcomes:
+                writer.count(outcome)
+            writer.hashes.update(hashes)
+            if error:
+                failures.append((app, error))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m conf_compiler",
+                                     description="Compile a profile manifest into vkBasalt.conf and dxvk.conf files.")
+    parser.add_argument("manifest", help="JSON profile manifest")
+    parser.add_argument("-o", "--output", default="confs", help="output directory (default: confs)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    with open(args.manifest) as file:
+        manifest = json.load(file)
+
+    hashes_path = os.path.join(cache_dir(), HASHES_FILE)
+    writer = ConfWriter(load_hashes(hashes_path))
+
+    start = time.perf_counter()
+    failures = compile_manifest(manifest, args.output, args.jobs, writer)
+    elapsed = time.perf_counter() - start
+
+    try:
+        save_hashes(hashes_path, writer.hashes)
+    except OSError:
+        pass
+
+    total = len(manifest.get("apps", {}))
+    for app, error in failures:
+        print(f"{app}: {error}", file=sys.stderr)
+    rate = total / elapsed if elapsed > 0 else float("inf")
+    print(f"Compiled {total - len(failures)}/{total} profiles in {elapsed:.3f}s ({rate:.0f} profiles/sec), "
+          f"{writer.written} confs written, {writer.skipped} unchanged, {writer.failed} failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+Parses existing vkBasalt.conf and dxvk.conf files back into settings profiles.
+
+Usage:
+    python -m conf_parser DIR_OR_FILE... [-o manifest.json] [-j JOBS]
+
+Files are read one line at a time. Every "key = value" line whose key belongs to a setting of
+the registry is mapped onto the option of that setting with the same value, compared as numbers
+where both sides are numeric (so "fxaaQualitySubpix = .750" picks the "0.75" option of
+FXAA_Quality_Subpixel). Lines that can't be mapped, because the key is unknown or the value
+isn't one of the setting's options, are reported as issues instead of being dropped silently.
+
+dxvk.conf files may hold "[app.exe]" sections, which only apply to that executable. Each one
+becomes a profile of its own, keyed by the section name; the lines above the first section
+form the profile of the conf's directory.
+
+Directory trees are searched for vkBasalt.conf and dxvk.conf files, which are parsed on a
+process pool. The imported profiles can be written out as a manifest that conf_compiler
+accepts. This module never imports PyQt6.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from conf_render import EFFECTS, VKBASALT_CONF, DXVK_CONF
+from Settings import SETTINGS, SETTINGS_BY_KEY, VKBASALT, DXVK
+
+# Name of the profile made of the lines above the first section of a conf
+GLOBAL_SECTION = ""
+
+
+def normalize_value(value):
+    """
+    Brings a conf value into the form used to compare it against the values of the options.
+
+    Args:
+        value (str): Value as written in a conf file or in a setting descriptor.
+
+    Returns:
+        str: The value as a canonical float if it is numeric, case-folded otherwise.
+    """
+    value = value.strip().strip('"').strip()
+    try:
+        return repr(float(value))
+    except ValueError:
+        return value.casefold()
+
+
+def _build_reverse_index():
+    # (target, conf key) -> (setting, {normalized value -> option label})
+    index = {}
+    for setting in SETTINGS:
+        if setting.conf_key is None:
+            continue
+        labels = {}
+        for label, value in zip(setting.options[1:], setting.values[1:]):
+            if isinstance(value, str):
+                labels.setdefault(normalize_value(value), label)
+        index[(setting.target, setting.conf_key)] = (setting, labels)
+    return index
+
+
+REVERSE_INDEX = _build_reverse_index()
+
+
+def split_line(line):
+    """
+    Splits a conf line into its key and value, ignoring comments.
+
+    Args:
+        line (str): Line of a conf file.
+
+    Returns:
+        tuple: (key, value) of a "key = value" line, (text, None) of any other line such as a
+            "[section]" header, None for blank and comment lines.
+    """
+    hash_at = line.find("#")
+    if hash_at >= 0:
+        line = line[:hash_at]
+    line = line.strip()
+    if not line:
+        return None
+    key, sep, value = line.partition("=")
+    if not sep:
+        return line, None
+    return key.strip(), value.strip()
+
+
+def _map_option(target, key, value, profile, issues, number):
+    # Maps one "key = value" line onto a setting option, or records why it can't be
+    entry = REVERSE_INDEX.get((target, key))
+    if entry is None:
+        issues.append((number, f"Unknown key '{key}'"))
+        return
+    setting, labels = entry
+    label = labels.get(normalize_value(value))
+    if label is None:
+        issues.append((number, f"Value '{value}' of '{key}' isn't an option of {setting.key}"))
+    else:
+        profile[setting.key] = label
+
+
+def parse_vkbasalt(lines):
+    """
+    Parses the lines of a vkBasalt.conf.
+
+    Args:
+        lines (iterable): Lines of the file.
+
+    Returns:
+        tuple: (profile, issues). The profile maps setting keys to option labels, issues is a
+            list of (line number, message) for every line that couldn't be mapped.
+    """
+    profile = {}
+    issues = []
+    effects = None
+    for number, line in enumerate(lines, 1):
+        pair = split_line(line)
+        if pair is None:
+            continue
+        key, value = pair
+        if value is None:
+            issues.append((number, f"Expected 'key = value', got '{key}'"))
+        elif key == "effects":
+            effects_line = number
+            effects = [effect.strip() for effect in value.split(":") if effect.strip()]
+            for effect in effects:
+                if effect not in EFFECTS:
+                    issues.append((number, f"Unknown effect '{effect}'"))
+        else:
+            _map_option(VKBASALT, key, value, profile, issues, number)
+
+    # The effects line switches effects on and off, an effect that is missing from it is off
+    if effects is not None:
+        for effect, owner in EFFECTS.items():
+            setting = SETTINGS_BY_KEY[owner]
+            if effect not in effects:
+                profile[owner] = setting.options[setting.values.index(False)]
+            elif owner not in profile:
+                if True in setting.values:
+                    profile[owner] = setting.options[setting.values.index(True)]
+                else:
+                    issues.append((effects_line, f"Effect '{effect}' is enabled without a {setting.conf_key}"))
+    return profile, issues
+
+
+def parse_dxvk(lines):
+    """
+    Parses the lines of a dxvk.conf.
+
+    Args:
+        lines (iterable): Lines of the file.
+
+    Returns:
+        tuple: (sections, issues). Sections maps a section name (an executable name, or
+            GLOBAL_SECTION for the lines above the first section) to its profile, issues is a
+            list of (line number, message) for every line that couldn't be mapped.
+    """
+    sections = {GLOBAL_SECTION: {}}
+    issues = []
+    profile = sections[GLOBAL_SECTION]
+    for number, line in enumerate(lines, 1):
+        pair = split_line(line)
+        if pair is None:
+            continue
+        key, value = pair
+        if value is None and key.startswith("[") and key.endswith("]"):
+            profile = sections.setdefault(key[1:-1].strip(), {})
+        elif value is None:
+            issues.append((number, f"Expected 'key = value', got '{key}'"))
+        else:
+            _map_option(DXVK, key, value, profile, issues, number)
+    if not sections[GLOBAL_SECTION]:
+        del sections[GLOBAL_SECTION]
+    return sections, issues
+
+
+def parse_conf_file(path):
+    """
+    Parses a vkBasalt.conf or dxvk.conf, chosen by the file name.
+
+    Args:
+        path (str): Path of the conf.
+
+    Returns:
+        tuple: (path, sections, issues, error). Sections maps section names to profiles,
+            issues is a list of (line number, message) and error is the message of an
+            OSError that stopped the file from being read, otherwise None.
+    """
+    try:
+        with open(path, encoding="utf-8", errors="replace") as file:
+            if os.path.basename(path) == VKBASALT_CONF:
+                profile, issues = parse_vkbasalt(file)
+                sections = {GLOBAL_SECTION: profile} if profile else {}
+            else:
+                sections, issues = parse_dxvk(file)
+    except OSError as error:
+        return path, {}, [], str(error)
+    return path, sections, issues, None
+
+
+def find_confs(paths):
+    """
+    Finds the vkBasalt.conf and dxvk.conf files in files and directory trees.
+
+    Args:
+        paths (iterable): Conf files and directories to search.
+
+    Returns:
+        list: Paths of the conf files found.
+    """
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(path)
+            continue
+        for directory, _, files in os.walk(path):
+            for name in files:
+                if name == VKBASALT_CONF or name == DXVK_CONF:
+                    found.append(os.path.join(directory, name))
+    return found
+
+
+def import_confs(paths, jobs=None):
+    """
+    Parses every conf file found in files and directory trees.
+
+    Args:
+        paths (iterable): Conf files and directories to search.
+        jobs (int): Number of worker processes, defaults to the CPU count.
+
+    Returns:
+        list: parse_conf_file results, one per conf file.
+    """
+    files = find_confs(paths)
+    jobs = jobs or os.cpu_count() or 1
+
+    # A pool only pays for itself once there is enough work to spread around
+    if jobs == 1 or len(files) < 64:
+        return list(map(parse_conf_file, files))
+
+    chunksize = max(1, len(files) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(parse_conf_file, files, chunksize=chunksize))
+
+
+def _app_name(directory):
+    # Drops the hash app_conf_dir() appended, if the directory is the one it gives the name;
+    # conf_compiler imports this module through conf_writer
+    from conf_compiler import app_conf_dir
+
+    parent, name = os.path.split(directory)
+    stem = name.rpartition("-")[0]
+    return os.path.join(parent, stem) if stem and app_conf_dir(parent, stem) == directory else directory
+
+
+def build_manifest(results, root="."):
+    """
+    Merges parsed confs into a conf_compiler manifest.
+
+    The global profile of a conf belongs to the app named after the conf's directory relative
+    to root, so a vkBasalt.conf and dxvk.conf side by side merge into one app; the hash
+    conf_compiler appends to a directory name is dropped again. Every dxvk section becomes an
+    app named after its executable.
+
+    Args:
+        results (list): parse_conf_file results.
+        root (str): Directory the app names are made relative to.
+
+    Returns:
+        dict: Manifest of the form {"apps": {app name: profile}}.
+    """
+    apps = {}
+    for path, sections, _, _ in results:
+        directory = _app_name(os.path.relpath(os.path.dirname(os.path.abspath(path)), os.path.abspath(root)))
+        for section, profile in sections.items():
+            apps.setdefault(directory if section == GLOBAL_SECTION else section, {}).update(profile)
+    return {"apps": apps}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m conf_parser",
+                                     description="Import existing vkBasalt.conf and dxvk.conf files as profiles.")
+    parser.add_argument("paths", nargs="+", help="conf files or directories to search")
+    parser.add_argument("-o", "--output", default=None, help="write the imported profiles as a JSON manifest")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = import_confs(args.paths, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    issue_count = 0
+    failed = 0
+    for path, _, issues, error in results:
+        if error is not None:
+            failed += 1
+            print(f"{path}: {error}", file=sys.stderr)
+        for number, message in issues:
+            print(f"{path}:{number}: {message}", file=sys.stderr)
+        issue_count += len(issues)
+
+    root = args.paths[0] if len(args.paths) == 1 and os.path.isdir(args.paths[0]) else "."
+    manifest = build_manifest(results, root)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(manifest, file, indent=4)
+
+    rate = len(results) / elapsed if elapsed > 0 else float("inf")
+    print(f"Imported {len(manifest['apps'])} profiles from {len(results) - failed}/{len(results)} files "
+          f"in {elapsed:.3f}s ({rate:.0f} files/sec), {issue_count} unmapped lines")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
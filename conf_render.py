@@ -0,0 +1,92 @@
+"""
+Renders settings profiles into vkBasalt.conf and dxvk.conf text.
+
+A profile is a dict mapping a setting key (the key of its descriptor in the Settings registry,
+e.g. "CAS") to the option label picked in that setting's combobox (e.g. "0.50").
+Settings left on "Select Option..." or missing from the profile are not written, so the
+layer's own default applies.
+
+This module must stay free of any PyQt6 imports, it is used by the headless tooling.
+"""
+
+from Settings import SETTINGS, SETTINGS_BY_KEY, VKBASALT, DXVK
+
+HEADER = "# Generated by 3D Settings Manager"
+
+# File names the layers read their conf from
+VKBASALT_CONF = "vkBasalt.conf"
+DXVK_CONF = "dxvk.conf"
+
+# vkBasalt effect -> setting that switches it on or off, in the order effects are applied.
+#
+# A conf value of True/False only switches an effect on or off, a string value is written out
+# as "conf key = value". Any value other than False on the setting that owns an effect
+# switches that effect on.
+EFFECTS = {"fxaa": "FXAA", "smaa": "SMAA", "cas": "CAS", "dls": "DLS_Sharpness"}
+
+
+def resolve_profile(profile):
+    """
+    Maps every option label of a profile onto its conf value.
+
+    Args:
+        profile (dict): Setting key -> selected option label.
+
+    Returns:
+        dict: Setting key -> conf value, for every setting that has a value to write.
+
+    Raises:
+        ValueError: If the profile names an unknown setting or option.
+    """
+    resolved = {}
+    for key, label in profile.items():
+        setting = SETTINGS_BY_KEY.get(key)
+        if setting is None:
+            raise ValueError(f"Unknown setting '{key}'")
+        value = setting.values[setting.option_index(label)]
+        if value is not None:
+            resolved[key] = value
+    return resolved
+
+
+def render_vkbasalt(profile):
+    """
+    Renders the vkBasalt.conf contents for a profile.
+
+    Args:
+        profile (dict): Setting key -> selected option label.
+
+    Returns:
+        str: Contents of vkBasalt.conf.
+    """
+    resolved = resolve_profile(profile)
+    effects = [effect for effect, owner in EFFECTS.items() if resolved.get(owner, False) is not False]
+    lines = []
+    if effects:
+        lines.append(f"effects = {':'.join(effects)}")
+
+    # Only write the keys of effects that are switched on
+    for setting in SETTINGS:
+        value = resolved.get(setting.key)
+        if setting.target == VKBASALT and isinstance(value, str) and setting.effect in effects:
+            lines.append(f"{setting.conf_key} = {value}")
+    return "\n".join([HEADER, *lines]) + "\n"
+
+
+def render_dxvk(profile):
+    """
+    Renders the dxvk.conf contents for a profile.
+
+    Args:
+        profile (dict): Setting key -> selected option label.
+
+    Returns:
+        str: Contents of dxvk.conf.
+    """
+    resolved = resolve_profile(profile)
+    lines = [HEADER]
+    for setting in SETTINGS:
+        if setting.target == DXVK and setting.key in resolved:
+            lines.append(f"{setting.conf_key} = {resolved[setting.key]}")
+    return "\n".join(lines) + "\n"
+
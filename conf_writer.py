@@ -0,0 +1,275 @@
+"""
+Writes conf files only when their contents change.
+
+The writer keeps a hash of what it last found on disk for every file, along with the file's
+modification time and size. When asked to write a file whose mtime and size still match, the
+new contents are compared against that hash without reading the file, and identical contents
+are skipped so the file keeps its mtime. Changed files are written to a temporary file that
+then replaces the old one atomically.
+
+Confs are merged with the file they replace: the keys the settings manager owns are
+rendered afresh, while comments, unknown keys, unknown vkBasalt effects and dxvk [app.exe]
+sections the user added by hand are kept below them.
+
+This module must stay free of any PyQt6 imports, it is shared with the headless tooling.
+"""
+import hashlib
+import json
+import os
+import stat
+
+from conf_parser import split_line
+from conf_render import HEADER, EFFECTS
+from Settings import SETTINGS, VKBASALT
+
+HASHES_FILE = "conf_hashes.json"
+HASHES_VERSION = 1
+
+# Outcome of a write
+WRITTEN = "written"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+def managed_keys(target):
+    """
+    Gets the keys of a conf that the settings manager renders itself.
+
+    Args:
+        target (str): VKBASALT or DXVK.
+
+    Returns:
+        frozenset: Conf keys owned by the settings of that target.
+    """
+    keys = {setting.conf_key for setting in SETTINGS if setting.target == target and setting.conf_key}
+    if target == VKBASALT:
+        keys.add("effects")
+    return frozenset(keys)
+
+
+MANAGED_KEYS = {target: managed_keys(target) for target in {setting.target for setting in SETTINGS}}
+
+
+def split_existing(lines, target):
+    """
+    Picks the lines of an existing conf that aren't rendered by the settings manager.
+
+    Args:
+        lines (iterable): Lines of the existing file.
+        target (str): VKBASALT or DXVK.
+
+    Returns:
+        tuple: (preserved lines, unknown vkBasalt effects that were switched on).
+    """
+    managed = MANAGED_KEYS[target]
+    preserved = []
+    extra_effects = []
+    in_section = False
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.strip() == HEADER:
+            continue
+        pair = split_line(line)
+        if pair is not None and not in_section:
+            key, value = pair
+            if value is None and key.startswith("["):
+                # Sections only apply to one executable, their keys are left alone
+                in_section = True
+            elif key in managed:
+                if key == "effects":
+                    extra_effects.extend(effect.strip() for effect in value.split(":")
+                                         if effect.strip() and effect.strip() not in EFFECTS)
+                continue
+        preserved.append(line)
+    return preserved, extra_effects
+
+
+def merge_conf(content, preserved, extra_effects):
+    """
+    Combines rendered conf contents with the lines kept from the existing file.
+
+    Args:
+        content (str): Rendered conf contents.
+        preserved (list): Lines of the existing file to keep.
+        extra_effects (list): Unknown vkBasalt effects to keep switched on.
+
+    Returns:
+        str: Contents to write.
+    """
+    lines = content.splitlines()
+    if extra_effects:
+        for i, line in enumerate(lines):
+            if line.startswith("effects = "):
+                lines[i] = ":".join([line, *extra_effects])
+                break
+        else:
+            lines.insert(1, f"effects = {':'.join(extra_effects)}")
+    return "\n".join(lines + preserved) + "\n"
+
+
+def content_digest(data):
+    """
+    Hashes the contents of a file.
+
+    Args:
+        data (bytes): File contents.
+
+    Returns:
+        str: Hex digest.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def load_hashes(path):
+    """
+    Loads the on-disk hash cache.
+
+    Args:
+        path (str): Path of the cache file.
+
+    Returns:
+        dict: File path -> [mtime_ns, size, digest, preserved lines, extra effects].
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != HASHES_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_hashes(path, hashes):
+    """
+    Writes the on-disk hash cache, replacing the old one atomically.
+
+    Args:
+        path (str): Path of the cache file.
+        hashes (dict): File path -> [mtime_ns, size, digest, preserved lines, extra effects].
+
+    Returns:
+        None
+    """
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"version": HASHES_VERSION, "files": hashes}, file, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ConfWriter:
+    """
+    Writes files through a hash cache, counting the files written, skipped and failed.
+
+    The message of every failed write is kept in errors as a (path, message) pair.
+    """
+
+    def __init__(self, hashes=None):
+        """
+        Initializes the ConfWriter.
+
+        Args:
+            hashes (dict): Hash cache to start from, see load_hashes.
+
+        Returns:
+            None
+        """
+        self.hashes = {} if hashes is None else hashes
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors = []
+
+    def counts(self):
+        """
+        Gets the outcome counts of the writes made so far.
+
+        Returns:
+            dict: Number of files written, skipped and failed.
+        """
+        return {WRITTEN: self.written, SKIPPED: self.skipped, FAILED: self.failed}
+
+    def count(self, outcome):
+        """
+        Adds the outcome of a write made elsewhere, e.g. by a worker process, to the counts.
+
+        Args:
+            outcome (str): WRITTEN, SKIPPED or FAILED.
+
+        Returns:
+            None
+        """
+        setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def _on_disk(self, path, target):
+        # Returns (stat, digest, preserved lines, extra effects) of the file currently on disk
+        try:
+            current = os.stat(path)
+        except FileNotFoundError:
+            return None, None, [], []
+        cached = self.hashes.get(path)
+        if cached is not None and cached[0] == current.st_mtime_ns and cached[1] == current.st_size:
+            return current, cached[2], cached[3], cached[4]
+
+        # The file is new to the writer or was changed outside of it
+        with open(path, "rb") as file:
+            data = file.read()
+        if target is None:
+            return current, content_digest(data), [], []
+        preserved, extra_effects = split_existing(data.decode("utf-8", errors="replace").splitlines(), target)
+        return current, content_digest(data), preserved, extra_effects
+
+    def write(self, path, content, target=None):
+        """
+        Writes a file unless it already holds the same contents.
+
+        Args:
+            path (str): Path of the file.
+            content (str): Contents to write.
+            target (str): VKBASALT or DXVK to merge the contents with the keys the user added
+                to the existing conf, None to replace the whole file.
+
+        Returns:
+            str: WRITTEN, SKIPPED or FAILED.
+        """
+        path = os.path.abspath(path)
+        try:
+            current, digest, preserved, extra_effects = self._on_disk(path, target)
+            if target is not None:
+                content = merge_conf(content, preserved, extra_effects)
+            data = content.encode("utf-8")
+            new_digest = content_digest(data)
+
+            if new_digest == digest:
+                outcome = SKIPPED
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.tmp"
+                try:
+                    with open(temp_path, "wb") as file:
+                        file.write(data)
+                    if current is not None:
+                        os.chmod(temp_path, stat.S_IMODE(current.st_mode))
+                    os.replace(temp_path, path)
+                except OSError:
+                    # A failed write must not leave a half-written temp file next to the conf
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                    raise
+                current = os.stat(path)
+                outcome = WRITTEN
+            self.hashes[path] = [current.st_mtime_ns, current.st_size, new_digest, preserved, extra_effects]
+        except OSError as error:
+            self.errors.append((path, str(error)))
+            outcome = FAILED
+        self.count(outcome)
+        return outcome
@@ -0,0 +1,231 @@
+"""
+Learned estimate of the frametime each option adds, fitted to the measured frametime logs.
+
+Every stored run (see frametime_log.py) is a row of a linear model of the mean frametime:
+
+    frametime = app intercept + sum of the weights of the options the profile selects
+
+Every option other than the unset placeholder has a one-hot column, so the weight of an option
+is the milliseconds it adds over leaving the setting unset, and every application has an
+intercept of its own, so games of different weights can share one model. The weights are a
+ridge regression solved from the normal equations. The intercepts aren't columns of the
+system: every application only keeps its run count, the sum of its option columns and the sum
+of its frametimes, and its intercept is eliminated through the Schur complement of its
+diagonal block, so only an options x options system is solved however many applications there
+are. X^T X, X^T y and the eliminated terms are updated a run at a time, so a new log only adds
+its row to them and the small system is solved again, instead of going through every run from
+scratch. The rows are kept too, so a log that is imported again replaces its old row. The GUI
+builds the model from the stored runs once, in the background, and adds the logs imported
+afterwards to it.
+
+This module must stay free of any PyQt6 imports.
+"""
+import numpy as np
+
+from Settings import SETTINGS
+
+# Ridge penalty of the option weights; the app intercepts get a tiny one that only keeps the
+# system solvable
+RIDGE = 0.1
+INTERCEPT_RIDGE = 1e-6
+
+# Options need this many runs before an estimate is shown for them
+MIN_RUNS = 2
+
+
+class CostModel:
+    """
+    Ridge regression of the mean frametime over one-hot option columns and app intercepts.
+    """
+
+    def __init__(self, settings=SETTINGS, ridge=RIDGE):
+        """
+        Initializes an empty CostModel.
+
+        Args:
+            settings (tuple): Setting descriptors, the position of a setting is its ID.
+            ridge (float): Ridge penalty of the option weights.
+
+        Returns:
+            None
+        """
+        self.settings = settings
+        self.ridge = ridge
+
+        # First column of every setting; option o > 0 of a setting is column offset + o - 1
+        self.offsets = []
+        columns = 0
+        for setting in settings:
+            self.offsets.append(columns)
+            columns += len(setting.options) - 1
+        self.features = columns
+
+        # X^T X and X^T y of the option columns
+        self.xtx = np.zeros((columns, columns))
+        self.xty = np.zeros(columns)
+
+        # App -> [run count, sum of the option columns, sum of the frametimes], and the sum
+        # over every app of s s^T / (n + ridge) and s t / (n + ridge), the terms its eliminated
+        # intercept takes off the system
+        self.apps = {}
+        self.schur_xtx = np.zeros((columns, columns))
+        self.schur_xty = np.zeros(columns)
+
+        # Run key -> (app, option columns, frametime) of every row added
+        self.rows = {}
+        self._weights = None
+
+    def columns(self, values):
+        """
+        Gets the option columns a profile sets.
+
+        Args:
+            values (list): Option index of every setting.
+
+        Returns:
+            list: Column of every selected option.
+        """
+        return [self.offsets[setting_id] + option - 1 for setting_id, option in enumerate(values) if option]
+
+    def _eliminate(self, sums, sign):
+        # Adds or takes off the terms an app's intercept contributes to the Schur complement
+        count, columns, frametimes = sums
+        scale = sign / (count + INTERCEPT_RIDGE)
+        self.schur_xtx += scale * np.outer(columns, columns)
+        self.schur_xty += scale * frametimes * columns
+
+    def _accumulate(self, app, columns, frametime, sign):
+        row = np.array(columns, dtype=np.intp)
+        self.xtx[np.ix_(row, row)] += sign
+        self.xty[row] += sign * frametime
+
+        sums = self.apps.get(app)
+        if sums is None:
+            sums = self.apps[app] = [0, np.zeros(self.features), 0.0]
+        else:
+            self._eliminate(sums, -1.0)
+        sums[0] += sign
+        sums[1][row] += sign
+        sums[2] += sign * frametime
+        if sums[0]:
+            self._eliminate(sums, 1.0)
+        else:
+            del self.apps[app]
+        self._weights = None
+
+    def add(self, key, app, values, frametime):
+        """
+        Adds a run, replacing the run added with the same key before.
+
+        Args:
+            key (str): Unique key of the run, e.g. its log path.
+            app (str): Path identifying the application.
+            values (list): Option index of every setting the run was recorded with.
+            frametime (float): Mean frametime of the run in milliseconds.
+
+        Returns:
+            bool: True if the model changed.
+        """
+        columns = self.columns(values)
+        old = self.rows.get(key)
+        if old is not None:
+            if old == (app, columns, frametime):
+                return False
+            self._accumulate(old[0], old[1], old[2], -1.0)
+        self._accumulate(app, columns, frametime, 1.0)
+        self.rows[key] = (app, columns, frametime)
+        return True
+
+    def add_runs(self, runs):
+        """
+        Adds stored runs, skipping the ones already added unchanged.
+
+        Args:
+            runs (iterable): (app, log, values, recorded, stats) tuples, see ProfileStore.all_runs().
+
+        Returns:
+            int: Number of runs that changed the model.
+        """
+        changed = 0
+        for app, log, values, _, stats in runs:
+            if stats.get("frames") and stats.get("avg_fps"):
+                changed += self.add(f"{app}\0{log}", app, values, 1000 / stats["avg_fps"])
+        return changed
+
+    @property
+    def weights(self):
+        """
+        numpy.ndarray: Milliseconds every option column adds, solved on demand.
+        """
+        if self._weights is None:
+            system = self.xtx - self.schur_xtx + self.ridge * np.eye(self.features)
+            self._weights = np.linalg.solve(system, self.xty - self.schur_xty)
+        return self._weights
+
+
+    def option_costs(self):
+        """
+        Gets the estimated cost of every option that has enough runs.
+
+        Returns:
+            dict: Setting ID -> milliseconds every option adds over leaving the setting unset,
+                None for options without enough runs and for the placeholder.
+        """
+        if not self.rows:
+            return {}
+        weights = self.weights
+        runs = np.diagonal(self.xtx)[:self.features]
+        costs = {}
+        for setting_id, setting in enumerate(self.settings):
+            offset = self.offsets[setting_id]
+            options = [None] + [float(weights[offset + option - 1]) if runs[offset + option - 1] >= MIN_RUNS else None
+                                for option in range(1, len(setting.options))]
+            if any(cost is not None for cost in options):
+                costs[setting_id] = tuple(options)
+        return costs
+
+    def profile_cost(self, values):
+        """
+        Estimates the milliseconds a profile adds over leaving every setting unset.
+
+        Args:
+            values (list): Option index of every setting.
+
+        Returns:
+            float: Estimated milliseconds, counting only options with enough runs; None if
+                none of the selected options has.
+        """
+        if not self.rows:
+            return None
+        runs = np.diagonal(self.xtx)
+        columns = [column for column in self.columns(values) if runs[column] >= MIN_RUNS]
+        return float(self.weights[columns].sum()) if columns else None
+
+
+def option_notes(costs, measured=None):
+    """
+    Builds the notes shown next to the options from the estimated costs and the measured
+    frametimes.
+
+    Args:
+        costs (dict): Setting ID -> estimated milliseconds of every option, see CostModel.option_costs().
+        measured (dict): Setting ID -> measured note of every option, see frametime_log.option_costs().
+
+    Returns:
+        dict: Setting ID -> note of every option, None for options with neither.
+    """
+    measured = measured or {}
+    notes = {}
+    for setting_id in costs.keys() | measured.keys():
+        estimates = costs.get(setting_id, ())
+        measurements = measured.get(setting_id, ())
+        options = []
+        for option in range(max(len(estimates), len(measurements))):
+            parts = []
+            if option < len(estimates) and estimates[option] is not None:
+                parts.append(f"est. {estimates[option]:+.1f} ms")
+            if option < len(measurements) and measurements[option] is not None:
+                parts.append(measurements[option])
+            options.append(", ".join(parts) or None)
+        notes[setting_id] = tuple(options)
+    return notes
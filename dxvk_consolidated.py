@@ -0,0 +1,304 @@
+"""
+Consolidated dxvk.conf holding the DXVK settings of every application in `[game.exe]` sections.
+
+DXVK applies the lines before the first section to every game and the lines of a section only
+to the executable named in its header, so a single file can serve a whole machine. Every
+distinct set of DXVK settings is rendered once and the sections of the executables that use
+it are written next to each other. DXVK compares a header with one executable name, so
+executables can't share a header; with hoisting enabled, values every profile sets and most
+of them agree on are moved to the global section instead, and executables left without any
+setting of their own get no section at all. Hoisted values apply to every other DXVK game
+started with this file too, which is why hoisting is opt-in.
+
+Applications identified by an executable get a section for it. Applications identified by an
+install directory, as Steam games are, get one section for every game executable found under
+that directory, skipping installers and redistributables the way the Wine scanner does.
+
+A JSON index written next to the conf maps every executable onto its section, so the
+settings that apply to an executable are found with a single lookup instead of parsing the
+conf.
+
+Usage:
+    python -m dxvk_consolidated [MANIFEST] -o dxvk.conf [--hoist-common]
+
+Without a manifest the resolved profiles of the GUI's profile store are consolidated. This
+module must stay free of any PyQt6 imports.
+"""
+import argparse
+import json
+import ntpath
+import os
+import sys
+from collections import Counter
+from functools import lru_cache
+
+from conf_render import HEADER, render_dxvk
+from conf_writer import ConfWriter
+from profile_codec import ProfileCodec, profile_vector, vector_profile
+from wine_scanner import PRUNED_DIRS, is_game_exe
+
+INDEX_SUFFIX = ".index.json"
+INDEX_VERSION = 1
+
+
+def exe_name(app):
+    """
+    Gets the executable name DXVK matches a section header against.
+
+    Args:
+        app (str): Name or path identifying the application.
+
+    Returns:
+        str: File name of the executable, None if the app isn't a Windows executable.
+    """
+    name = ntpath.basename(app)
+    return name if name.casefold().endswith(".exe") else None
+
+
+def exe_names(app):
+    """
+    Gets the executable names the sections of an application are written for.
+
+    Args:
+        app (str): Name or path identifying the application, an executable or an install
+            directory.
+
+    Returns:
+        list: Executable names, empty if the app is neither an executable nor a directory
+            holding any.
+    """
+    name = exe_name(app)
+    if name is not None:
+        return [name]
+    names = set()
+    for _, directories, files in os.walk(app):
+        directories[:] = [directory for directory in directories if directory.casefold() not in PRUNED_DIRS]
+        names.update(file for file in files if is_game_exe(file))
+    return sorted(names)
+
+
+def dxvk_settings(profile):
+    """
+    Renders the DXVK settings of a profile.
+
+    Args:
+        profile (dict): Setting key -> selected option label.
+
+    Returns:
+        tuple: (conf key, value) pairs in registry order.
+    """
+    return _render_settings(tuple(sorted(profile.items())))
+
+
+@lru_cache(maxsize=4096)
+def _render_settings(items):
+    # Profiles shared by many apps are only rendered once
+    lines = render_dxvk(dict(items)).splitlines()[1:]
+    return tuple(tuple(part.strip() for part in line.split("=", 1)) for line in lines)
+
+
+def hoist_common(bodies):
+    """
+    Picks the values that can be moved to the global section: for every key that every body
+    sets, its most common value.
+
+    Args:
+        bodies (list): (conf key, value) tuples of every executable.
+
+    Returns:
+        dict: Conf key -> hoisted value.
+    """
+    if not bodies:
+        return {}
+    counts = Counter(pair for body in bodies for pair in body)
+    keys = set.intersection(*(set(key for key, _ in body) for body in bodies))
+    hoisted = {}
+    for (key, value), _ in counts.most_common():
+        if key in keys and key not in hoisted:
+            hoisted[key] = value
+    return hoisted
+
+
+def consolidate(profiles, hoist=False):
+    """
+    Builds a consolidated dxvk.conf and its section index.
+
+    Args:
+        profiles (dict): App -> profile dict.
+        hoist (bool): Move the values every profile sets, and most agree on, to the global section.
+
+    Returns:
+        tuple: (conf text, index dict, skipped apps, conflicting apps). Skipped apps are
+            neither Windows executables nor directories holding any; conflicting apps share an
+            executable name with an earlier app whose settings differ, and that executable was
+            left out.
+    """
+    bodies = {}
+    skipped, conflicts = [], []
+    for app, profile in profiles.items():
+        exes = exe_names(app)
+        if not exes:
+            skipped.append(app)
+            continue
+        body = dxvk_settings(profile)
+        if any([bodies.setdefault(exe, body) != body for exe in exes]):
+            conflicts.append(app)
+
+    hoisted = hoist_common(list(bodies.values())) if hoist else {}
+
+    # Each distinct body is rendered once and its executables are kept together
+    groups = {}
+    for exe, body in sorted(bodies.items()):
+        own = tuple((key, value) for key, value in body if hoisted.get(key) != value)
+        if own:
+            groups.setdefault(own, []).append(exe)
+
+    lines = [HEADER]
+    lines.extend(f"{key} = {value}" for key, value in hoisted.items())
+    sections, index = [], {}
+    for own, exes in groups.items():
+        text = [f"{key} = {value}" for key, value in own]
+        for exe in exes:
+            lines.append("")
+            lines.append(f"[{exe}]")
+            lines.extend(text)
+            index[exe] = len(sections)
+        sections.append(dict(own))
+
+    data = {"version": INDEX_VERSION, "global": hoisted, "sections": sections, "exes": index}
+    return "\n".join(lines) + "\n", data, skipped, conflicts
+
+
+class SectionIndex:
+    """
+    Answers which settings of a consolidated dxvk.conf apply to an executable.
+    """
+
+    def __init__(self, data):
+        """
+        Initializes the SectionIndex.
+
+        Args:
+            data (dict): Index built by consolidate().
+
+        Returns:
+            None
+        """
+        self.globals = data["global"]
+        self.sections = data["sections"]
+        self.exes = data["exes"]
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads the index written next to a consolidated dxvk.conf.
+
+        Args:
+            path (str): Path of the index file.
+
+        Returns:
+            SectionIndex: The loaded index.
+
+        Raises:
+            ValueError: If the file isn't an index of a supported version.
+        """
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            raise ValueError(f"{path} is not a dxvk.conf section index")
+        return cls(data)
+
+    def section(self, app):
+        """
+        Gets the section of an executable.
+
+        Args:
+            app (str): Executable name or path.
+
+        Returns:
+            dict: Conf key -> value written in the executable's section, None if it has none.
+        """
+        exe = exe_name(app)
+        position = self.exes.get(exe) if exe is not None else None
+        return None if position is None else self.sections[position]
+
+    def settings(self, app):
+        """
+        Gets every setting that applies to an executable, the global ones included.
+
+        Args:
+            app (str): Executable name or path.
+
+        Returns:
+            dict: Conf key -> value.
+        """
+        settings = dict(self.globals)
+        settings.update(self.section(app) or {})
+        return settings
+
+
+def store_profiles():
+    """
+    Resolves the profile of every application in the GUI's profile store.
+
+    Returns:
+        dict: App -> profile dict.
+    """
+    from profile_layers import LayeredProfiles
+    from profile_store import ProfileStore, default_store_path
+
+    store = ProfileStore(default_store_path())
+    try:
+        layers = LayeredProfiles(store)
+        return {app: vector_profile(layers.resolve(app)) for app, _ in store.items()}
+    finally:
+        store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dxvk_consolidated",
+                                     description="Write the DXVK settings of every application into one dxvk.conf.")
+    parser.add_argument("manifest", nargs="?", default=None, help="JSON profile manifest (default: the profile store)")
+    parser.add_argument("-o", "--output", default="dxvk.conf", help="conf to write (default: dxvk.conf)")
+    parser.add_argument("--hoist-common", action="store_true",
+                        help="move values every profile shares to the global section, which applies to every game")
+    args = parser.parse_args(argv)
+
+    failures = []
+    if args.manifest is None:
+        profiles = store_profiles()
+    else:
+        codec = ProfileCodec()
+        with open(args.manifest) as file:
+            apps = json.load(file).get("apps", {})
+        profiles = {}
+        for app, profile in apps.items():
+            try:
+                values = codec.from_text(profile) if isinstance(profile, str) else profile_vector(profile)
+            except ValueError as error:
+                failures.append((app, str(error)))
+                continue
+            profiles[app] = vector_profile(values)
+
+    text, data, skipped, conflicts = consolidate(profiles, args.hoist_common)
+    writer = ConfWriter()
+    writer.write(args.output, text)
+    writer.write(args.output + INDEX_SUFFIX, json.dumps(data, separators=(",", ":")))
+
+    for app, error in failures:
+        print(f"{app}: {error}", file=sys.stderr)
+    for app in skipped:
+        reason = "no Windows executables found in it" if os.path.isdir(app) else "not a Windows executable"
+        print(f"{app}: {reason}, skipped", file=sys.stderr)
+    for app in conflicts:
+        print(f"{app}: another app with the same executable name has different settings, "
+              f"that executable was skipped", file=sys.stderr)
+    for path, error in writer.errors:
+        print(f"{path}: {error}", file=sys.stderr)
+    print(f"Wrote {len(data['exes'])} sections sharing {len(data['sections'])} distinct settings "
+          f"({os.path.getsize(args.output) if os.path.exists(args.output) else 0} bytes)")
+    return 1 if writer.failed or failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
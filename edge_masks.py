@@ -0,0 +1,242 @@
+"""
+Edge masks of the FXAA and SMAA edge detection passes on a screenshot.
+
+Both anti-aliasing effects only process the pixels their edge detection pass accepts, so the
+share of accepted pixels is a fair proxy for their per-frame cost:
+
+- FXAA accepts a pixel when the luma range of its cross neighbourhood reaches
+  max(fxaaQualityEdgeThresholdMin, fxaaQualityEdgeThreshold * largest luma).
+- SMAA accepts a pixel when its luma (or, with colour detection, any colour channel) differs
+  from its left or top neighbour by more than smaaThreshold.
+
+Everything that doesn't depend on a threshold, the luma plane, the FXAA luma range and
+maximum, the largest SMAA deltas and the tinted image edges are drawn with, is computed once
+per image and kept, so trying another threshold only redoes the comparison.
+
+This module must stay free of any PyQt6 imports.
+"""
+import numpy as np
+
+from image_filters import LUMA
+from Settings import SETTINGS_BY_KEY
+
+# Values vkBasalt uses when a conf doesn't set them
+FXAA_EDGE_THRESHOLD_DEFAULT = 0.125
+FXAA_EDGE_THRESHOLD_MIN_DEFAULT = 0.0312
+SMAA_EDGE_DETECTION_DEFAULT = "luma"
+SMAA_THRESHOLD_DEFAULT = 0.05
+
+# Colour and strength of the tint edges are drawn with
+EDGE_COLOR = (255, 0, 255)
+EDGE_OPACITY = 0.6
+
+# Edge passes that can be shown
+FXAA_EDGES = "fxaa"
+SMAA_EDGES = "smaa"
+
+
+def _value(profile, key, default):
+    # Conf value of the option selected for a setting, the default when it isn't written
+    label = profile.get(key)
+    if label is None:
+        return default
+    setting = SETTINGS_BY_KEY[key]
+    value = setting.values[setting.option_index(label)]
+    return default if value is None else value
+
+
+def edge_parameters(profile):
+    """
+    Gets the thresholds of both edge passes selected in a profile.
+
+    Args:
+        profile (dict): Setting key -> selected option label.
+
+    Returns:
+        dict: FXAA_EDGES -> (threshold, threshold min), SMAA_EDGES -> (detection, threshold).
+    """
+    return {
+        FXAA_EDGES: (float(_value(profile, "FXAA_Quality_Edge_Threshold", FXAA_EDGE_THRESHOLD_DEFAULT)),
+                     float(_value(profile, "FXAA_Edge_Threshold_Bias", FXAA_EDGE_THRESHOLD_MIN_DEFAULT))),
+        SMAA_EDGES: (_value(profile, "SMAA_Edge_Detection", SMAA_EDGE_DETECTION_DEFAULT),
+                     float(_value(profile, "SMAA_Threshold", SMAA_THRESHOLD_DEFAULT))),
+    }
+
+
+class EdgePlanes:
+    """
+    Threshold independent planes of an image, computed on first use and kept.
+    """
+
+    def __init__(self, image):
+        """
+        Initializes the EdgePlanes.
+
+        Args:
+            image (numpy.ndarray): (height, width, 3) uint8 RGB image.
+
+        Returns:
+            None
+        """
+        self.image = image
+        self.pixels = image.shape[0] * image.shape[1]
+        self._planes = {}
+
+    def _plane(self, name, build):
+        plane = self._planes.get(name)
+        if plane is None:
+            plane = self._planes[name] = build()
+        return plane
+
+    @property
+    def luma(self):
+        """
+        numpy.ndarray: (height, width) float32 luma in 0..1.
+        """
+        return self._plane("luma", lambda: self.image @ (LUMA / np.float32(255)))
+
+    def _fxaa_planes(self):
+        padded = np.pad(self.luma, 1, mode="edge")
+        neighbours = (padded[:-2, 1:-1], padded[2:, 1:-1], padded[1:-1, :-2], padded[1:-1, 2:], self.luma)
+        highest = np.maximum.reduce(neighbours)
+        lowest = np.minimum.reduce(neighbours)
+        self._planes["fxaa_max"] = highest
+        return highest - lowest
+
+    @property
+    def fxaa_range(self):
+        """
+        numpy.ndarray: (height, width) luma range of every pixel's cross neighbourhood.
+        """
+        return self._plane("fxaa_range", self._fxaa_planes)
+
+    @property
+    def fxaa_max(self):
+        """
+        numpy.ndarray: (height, width) largest luma of every pixel's cross neighbourhood.
+        """
+        self.fxaa_range
+        return self._planes["fxaa_max"]
+
+    def _smaa_delta(self, channels):
+        # Largest absolute difference to the left and top neighbours over the given channels
+        left = np.zeros(channels.shape, dtype=np.float32)
+        top = np.zeros(channels.shape, dtype=np.float32)
+        np.abs(channels[:, 1:] - channels[:, :-1], out=left[:, 1:])
+        np.abs(channels[1:] - channels[:-1], out=top[1:])
+        delta = np.maximum(left, top)
+        return delta.max(axis=2) if delta.ndim == 3 else delta
+
+    @property
+    def smaa_luma_delta(self):
+        """
+        numpy.ndarray: (height, width) largest luma difference to the left or top neighbour.
+        """
+        return self._plane("smaa_luma", lambda: self._smaa_delta(self.luma))
+
+    @property
+    def smaa_color_delta(self):
+        """
+        numpy.ndarray: (height, width) largest colour channel difference to the left or top
+        neighbour.
+        """
+        return self._plane("smaa_color", lambda: self._smaa_delta(self.image.astype(np.float32) / 255))
+
+    @property
+    def tinted(self):
+        """
+        numpy.ndarray: (height, width, 3) uint8 image with every pixel tinted as an edge.
+        """
+        return self._plane("tinted", lambda: tint(self.image))
+
+    def overlay(self, mask):
+        """
+        Draws an edge mask over the image.
+
+        Args:
+            mask (numpy.ndarray): (height, width) bool mask.
+
+        Returns:
+            numpy.ndarray: (height, width, 3) uint8 RGB image, the masked pixels tinted.
+        """
+        return np.where(mask[..., None], self.tinted, self.image)
+
+    def fxaa_mask(self, threshold, threshold_min):
+        """
+        Gets the pixels the FXAA pass processes.
+
+        Args:
+            threshold (float): fxaaQualityEdgeThreshold.
+            threshold_min (float): fxaaQualityEdgeThresholdMin.
+
+        Returns:
+            numpy.ndarray: (height, width) bool mask.
+        """
+        return self.fxaa_range >= np.maximum(np.float32(threshold_min), self.fxaa_max * np.float32(threshold))
+
+    def smaa_mask(self, detection, threshold):
+        """
+        Gets the pixels the SMAA edge detection pass marks as edges.
+
+        Args:
+            detection (str): "luma" or "color".
+            threshold (float): smaaThreshold.
+
+        Returns:
+            numpy.ndarray: (height, width) bool mask.
+        """
+        delta = self.smaa_color_delta if detection == "color" else self.smaa_luma_delta
+        return delta > np.float32(threshold)
+
+    def mask(self, edges, parameters):
+        """
+        Gets the mask of an edge pass.
+
+        Args:
+            edges (str): FXAA_EDGES or SMAA_EDGES.
+            parameters (tuple): Parameters of the pass, see edge_parameters().
+
+        Returns:
+            numpy.ndarray: (height, width) bool mask.
+        """
+        return self.fxaa_mask(*parameters) if edges == FXAA_EDGES else self.smaa_mask(*parameters)
+
+    def option_counts(self, edges, profile):
+        """
+        Counts the pixels an edge pass processes for every option of its threshold settings,
+        the other settings staying as selected in the profile.
+
+        Args:
+            edges (str): FXAA_EDGES or SMAA_EDGES.
+            profile (dict): Setting key -> selected option label.
+
+        Returns:
+            dict: Setting key -> [(option label, pixels processed), ...].
+        """
+        keys = (("FXAA_Quality_Edge_Threshold", "FXAA_Edge_Threshold_Bias") if edges == FXAA_EDGES
+                else ("SMAA_Edge_Detection", "SMAA_Threshold"))
+        counts = {}
+        for key in keys:
+            setting = SETTINGS_BY_KEY[key]
+            rows = []
+            for label in setting.options[1:]:
+                parameters = edge_parameters({**profile, key: label})[edges]
+                rows.append((label, int(np.count_nonzero(self.mask(edges, parameters)))))
+            counts[key] = rows
+        return counts
+
+
+def tint(image, color=EDGE_COLOR, opacity=EDGE_OPACITY):
+    """
+    Tints every pixel of an image.
+
+    Args:
+        image (numpy.ndarray): (height, width, 3) uint8 RGB image.
+        color (tuple): RGB tint.
+        opacity (float): Strength of the tint between 0 and 1.
+
+    Returns:
+        numpy.ndarray: (height, width, 3) uint8 RGB image.
+    """
+    tinted = image * np.float32(1 - opacity) + np.array(color, dtype=np.float32) * np.float32(opacity)
+    return tinted.astype(np.uint8)
@@ -0,0 +1,458 @@
+"""
+A/B experiments that sweep combinations of options against a benchmark command.
+
+For every combination of the swept settings' options, applied on top of a base profile, the
+confs are rendered into a directory of their own and the benchmark command is run with
+DXVK_CONFIG_FILE, ENABLE_VKBASALT and VKBASALT_CONFIG_FILE pointing at them, and with MangoHud
+set up to log the frametimes into the same directory. The frametime log is analyzed with
+frametime_log and the configurations are ranked by the chosen metrics.
+
+The command can be any executable, e.g. a game's benchmark mode or a script wrapping it. Its
+arguments may contain {log_dir}, {vkbasalt_conf} and {dxvk_conf}, which are replaced with the
+paths of the combination being run; any other braces, e.g. of a JSON argument, are passed on
+unchanged.
+
+The results are kept in a JSON state file, written after every run, with every combination
+keyed by its profile code (see profile_codec.py). An interrupted sweep picks up where it
+stopped when started again, and combinations that were already measured aren't run again.
+Settings whose requirements a combination doesn't meet, e.g. SMAA search steps with SMAA off,
+are reset to unset in that combination, the way the GUI disables them, and combinations that
+end up the same are run once. The SMAA off baseline of an SMAA sweep is thus kept.
+
+Usage:
+    python -m experiment_runner APP --sweep CAS --sweep "SMAA_Search_Steps=x16,x32" \\
+        --command "./benchmark.sh {log_dir}" [--rank avg_fps,low_1]
+
+Without --base, the swept options are applied on top of the application's profile in the
+GUI's profile store. The measured runs are also stored there, next to the frametime logs
+imported in the GUI. This module must stay free of any PyQt6 imports.
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+from app_paths import data_dir
+from conf_compiler import app_conf_dir
+from conf_render import render_dxvk, render_vkbasalt, VKBASALT_CONF, DXVK_CONF
+from conf_writer import ConfWriter
+from frametime_log import analyze_log, format_summary
+from profile_codec import ProfileCodec, vector_profile
+from Settings import SETTINGS, SETTINGS_BY_KEY, VKBASALT, DXVK, DependencyGraph
+
+EXPERIMENTS_NAME = "experiments"
+STATE_FILE = "experiment.json"
+STATE_VERSION = 1
+OUTPUT_FILE = "output.log"
+
+# MangoHud writes a summary next to every log, which holds no frametimes
+SUMMARY_SUFFIX = "_summary.csv"
+
+# Metrics configurations can be ranked by, and whether a higher value is better
+METRICS = {
+    "avg_fps": True,
+    "low_1": True,
+    "low_0_1": True,
+    "stutters": False,
+    "longest": False,
+    "p50": False,
+    "p90": False,
+    "p95": False,
+    "p99": False,
+    "p99.9": False,
+}
+
+
+def default_experiment_dir(app):
+    """
+    Gets the directory the experiments of an app are kept in.
+
+    Args:
+        app (str): Name or path identifying the application.
+
+    Returns:
+        str: Path in the data directory.
+    """
+    return app_conf_dir(os.path.join(data_dir(), EXPERIMENTS_NAME), app)
+
+
+def parse_sweep(specs, settings_by_key=SETTINGS_BY_KEY, settings=SETTINGS):
+    """
+    Parses the settings to sweep.
+
+    Args:
+        specs (list): "KEY" to sweep every option of a setting, or "KEY=label,label" to sweep
+            the listed options only.
+        settings_by_key (dict): Setting key -> descriptor.
+        settings (tuple): Setting descriptors, the position of a setting is its ID.
+
+    Returns:
+        list: (setting ID, option indices) pairs in the order given.
+
+    Raises:
+        ValueError: If a setting or option doesn't exist.
+    """
+    positions = {setting.key: setting_id for setting_id, setting in enumerate(settings)}
+    sweep = []
+    for spec in specs:
+        key, _, labels = spec.partition("=")
+        key = key.strip()
+        if key not in settings_by_key:
+            raise ValueError(f"Unknown setting '{key}'")
+        setting = settings_by_key[key]
+        if labels:
+            options = [setting.option_index(label.strip()) for label in labels.split(",")]
+        else:
+            options = list(range(1, len(setting.options)))
+        sweep.append((positions[key], options))
+    return sweep
+
+
+def fill_placeholders(argument, paths):
+    """
+    Replaces the placeholders of a command argument with the paths of a combination.
+
+    Args:
+        argument (str): Argument of the benchmark command.
+        paths (dict): Placeholder name -> path, e.g. "log_dir".
+
+    Returns:
+        str: The argument with every "{name}" of paths replaced, other braces left as they are.
+    """
+    for name, path in paths.items():
+        argument = argument.replace(f"{{{name}}}", path)
+    return argument
+
+
+def combinations(base, sweep, graph):
+    """
+    Builds every combination of the swept options on top of a base profile.
+
+    Args:
+        base (list): Option index of every setting of the base profile.
+        sweep (list): (setting ID, option indices) pairs, see parse_sweep().
+        graph (DependencyGraph): Requirements of the settings.
+
+    Returns:
+        tuple: (distinct vectors in sweep order, number of combinations merged into another
+            one after the settings whose requirements don't hold were reset).
+    """
+    vectors, merged = {}, 0
+    ids = [setting_id for setting_id, _ in sweep]
+    for options in itertools.product(*(options for _, options in sweep)):
+        values = list(base)
+        for setting_id, option in zip(ids, options):
+            values[setting_id] = option
+        # Resetting a setting can break the requirements of settings that depend on it, so
+        # the check is repeated until nothing changes
+        changed = True
+        while changed:
+            changed = False
+            for setting_id, value in enumerate(values):
+                if value and not graph.is_enabled(setting_id, values):
+                    values[setting_id] = 0
+                    changed = True
+        values = tuple(values)
+        if values in vectors:
+            merged += 1
+        else:
+            vectors[values] = None
+    return list(vectors), merged
+
+
+def metric(stats, name):
+    """
+    Gets a metric of a run's statistics.
+
+    Args:
+        stats (dict): Statistics of the run, see frametime_log.FrametimeStats.summary().
+        name (str): One of METRICS.
+
+    Returns:
+        float: Value of the metric.
+    """
+    if name.startswith("p"):
+        return stats["percentiles"][name[1:]]
+    return stats[name]
+
+
+class Experiment:
+    """
+    A sweep of option combinations for an app and a benchmark command, with its state file.
+    """
+
+    def __init__(self, app, command, directory, settings=SETTINGS, timeout=None):
+        """
+        Opens an experiment, loading the results of earlier runs from its state file.
+
+        Args:
+            app (str): Name or path identifying the application.
+            command (list): Benchmark command and its arguments.
+            directory (str): Directory holding the state file and a directory per combination.
+            settings (tuple): Setting descriptors, the position of a setting is its ID.
+            timeout (float): Seconds a run may take before it is stopped, None for no limit.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the state file belongs to another app or command.
+        """
+        self.app = app
+        self.command = list(command)
+        self.directory = directory
+        self.settings = settings
+        self.timeout = timeout
+        self.codec = ProfileCodec(settings)
+        self.state_path = os.path.join(directory, STATE_FILE)
+        self.results = {}
+
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as file:
+                state = json.load(file)
+            if state.get("version") != STATE_VERSION:
+                raise ValueError(f"{self.state_path} is not an experiment state file")
+            if state["app"] != app or state["command"] != self.command:
+                raise ValueError(f"{self.state_path} was made for another app or command, "
+                                 "use another directory or --restart")
+            self.results = state["results"]
+
+    def save(self):
+        """
+        Writes the state file, replacing the old one atomically so an interrupted write
+        doesn't lose it.
+
+        Returns:
+            None
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        state = {"version": STATE_VERSION, "app": self.app, "command": self.command, "results": self.results}
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(state, file, indent=4)
+        os.replace(temp_path, self.state_path)
+
+    def measured(self, values):
+        """
+        Checks whether a combination has been measured.
+
+        Args:
+            values (tuple): Option index of every setting.
+
+        Returns:
+            bool: True if a run of the combination produced statistics.
+        """
+        result = self.results.get(self.codec.to_text(values))
+        return result is not None and "stats" in result
+
+    def environment(self, run_dir):
+        """
+        Builds the environment a run's command is started with.
+
+        Args:
+            run_dir (str): Directory of the combination's confs and logs.
+
+        Returns:
+            dict: Environment variables.
+        """
+        environment = dict(os.environ)
+        environment.update({
+            "DXVK_CONFIG_FILE": os.path.join(run_dir, DXVK_CONF),
+            "ENABLE_VKBASALT": "1",
+            "VKBASALT_CONFIG_FILE": os.path.join(run_dir, VKBASALT_CONF),
+            "MANGOHUD": "1",
+            "MANGOHUD_CONFIG": f"output_folder={run_dir},autostart_log=1",
+        })
+        return environment
+
+    def run_one(self, values):
+        """
+        Runs the benchmark command with a combination and stores its result.
+
+        Args:
+            values (tuple): Option index of every setting.
+
+        Returns:
+            dict: The stored result, holding "stats" or "error".
+        """
+        code = self.codec.to_text(values)
+        run_dir = os.path.abspath(os.path.join(self.directory, code))
+        profile = vector_profile(values, self.settings)
+        paths = {"log_dir": run_dir, "vkbasalt_conf": os.path.join(run_dir, VKBASALT_CONF),
+                 "dxvk_conf": os.path.join(run_dir, DXVK_CONF)}
+        command = [fill_placeholders(argument, paths) for argument in self.command]
+        result = {"options": profile, "started": time.time()}
+        try:
+            # A combination whose confs can't be written fails on its own, the sweep goes on
+            writer = ConfWriter()
+            writer.write(paths["vkbasalt_conf"], render_vkbasalt(profile), VKBASALT)
+            writer.write(paths["dxvk_conf"], render_dxvk(profile), DXVK)
+            if writer.errors:
+                raise OSError("; ".join(f"{path}: {message}" for path, message in writer.errors))
+
+            # Logs left by an interrupted run of this combination must not be mistaken for its log
+            for stale in glob.glob(os.path.join(run_dir, "*.csv")):
+                os.remove(stale)
+
+            with open(os.path.join(run_dir, OUTPUT_FILE), "wb") as output:
+                process = subprocess.run(command, env=self.environment(run_dir), stdout=output,
+                                         stderr=subprocess.STDOUT, timeout=self.timeout)
+            logs = [path for path in glob.glob(os.path.join(run_dir, "*.csv")) if not path.endswith(SUMMARY_SUFFIX)]
+            if process.returncode != 0:
+                result["error"] = f"command exited with status {process.returncode}"
+            elif not logs:
+                result["error"] = "no frametime log was written"
+            else:
+                log = max(logs, key=os.path.getmtime)
+                result["log"] = log
+                result["stats"] = analyze_log(log)
+        except subprocess.TimeoutExpired:
+            result["error"] = f"command took longer than {self.timeout}s"
+        except (OSError, ValueError) as error:
+            result["error"] = str(error)
+        self.results[code] = result
+        self.save()
+        return result
+
+    def run(self, vectors, on_result=None, retry_failed=False):
+        """
+        Runs every combination that hasn't been measured yet.
+
+        Args:
+            vectors (list): Option index of every setting of every combination.
+            on_result (callable): Called with (values, result, runs done, runs in total) after
+                every run.
+            retry_failed (bool): Also run the combinations whose last run failed.
+
+        Returns:
+            int: Number of runs made.
+        """
+        todo = [values for values in vectors
+                if not self.measured(values) and (retry_failed or self.codec.to_text(values) not in self.results)]
+        for done, values in enumerate(todo, 1):
+            result = self.run_one(values)
+            if on_result is not None:
+                on_result(values, result, done, len(todo))
+        return len(todo)
+
+    def ranking(self, metrics, vectors=None):
+        """
+        Ranks the measured combinations, best first.
+
+        Args:
+            metrics (list): Names of METRICS, compared in order.
+            vectors (list): Combinations to rank, every measured one if None.
+
+        Returns:
+            list: (profile code, result) pairs.
+        """
+        codes = self.results if vectors is None else [self.codec.to_text(values) for values in vectors]
+        measured = [(code, self.results[code]) for code in codes
+                    if code in self.results and "stats" in self.results[code] and self.results[code]["stats"].get("frames")]
+
+        def key(item):
+            stats = item[1]["stats"]
+            return tuple(-metric(stats, name) if METRICS[name] else metric(stats, name) for name in metrics)
+
+        return sorted(measured, key=key)
+
+
+def swept_options(result, sweep, settings=SETTINGS):
+    """
+    Describes the swept options of a combination.
+
+    Args:
+        result (dict): Stored result of the combination.
+        sweep (list): (setting ID, option indices) pairs.
+        settings (tuple): Setting descriptors.
+
+    Returns:
+        str: "KEY=label" pairs.
+    """
+    options = result["options"]
+    return " ".join(f"{settings[setting_id].key}={options.get(settings[setting_id].key, '-')}"
+                    for setting_id, _ in sweep)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m experiment_runner",
+                                     description="Benchmark every combination of some settings' options.")
+    parser.add_argument("app", help="application the experiment is for")
+    parser.add_argument("--command", required=True,
+                        help="benchmark command; {log_dir}, {vkbasalt_conf} and {dxvk_conf} are replaced")
+    parser.add_argument("--sweep", action="append", required=True,
+                        help="setting to sweep, KEY or KEY=label,label (repeat for more settings)")
+    parser.add_argument("--base", default=None, help="profile code of the base profile (default: the stored profile)")
+    parser.add_argument("--rank", default="avg_fps,low_1",
+                        help=f"metrics to rank by, in order (default: avg_fps,low_1; one of {', '.join(METRICS)})")
+    parser.add_argument("--dir", default=None, help="experiment directory (default: in the data directory)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds a run may take")
+    parser.add_argument("--retry-failed", action="store_true", help="run the combinations that failed again")
+    parser.add_argument("--restart", action="store_true", help="drop the results of earlier runs")
+    parser.add_argument("--no-store", action="store_true", help="don't add the runs to the profile store")
+    args = parser.parse_args(argv)
+
+    metrics = [name.strip() for name in args.rank.split(",") if name.strip()]
+    unknown = [name for name in metrics if name not in METRICS]
+    if unknown:
+        parser.error(f"unknown metrics: {', '.join(unknown)}")
+    try:
+        sweep = parse_sweep(args.sweep)
+    except ValueError as error:
+        parser.error(str(error))
+
+    codec = ProfileCodec()
+    store = None
+    if not args.no_store or args.base is None:
+        from profile_layers import LayeredProfiles
+        from profile_store import ProfileStore, default_store_path
+        store = ProfileStore(default_store_path())
+    try:
+        base = codec.from_text(args.base) if args.base is not None else LayeredProfiles(store).resolve(args.app)
+        directory = args.dir if args.dir is not None else default_experiment_dir(args.app)
+        if args.restart and os.path.exists(os.path.join(directory, STATE_FILE)):
+            os.remove(os.path.join(directory, STATE_FILE))
+        experiment = Experiment(args.app, shlex.split(args.command), directory, timeout=args.timeout)
+        vectors, merged = combinations(base, sweep, DependencyGraph(SETTINGS))
+        if merged:
+            print(f"{merged} combinations only differ in settings whose requirements don't hold and are run once",
+                  file=sys.stderr)
+        skipped = sum(experiment.measured(values) for values in vectors)
+        print(f"{len(vectors)} combinations, {skipped} already measured")
+
+        def on_result(values, result, done, total):
+            outcome = format_summary(result["stats"]) if "stats" in result else result["error"]
+            print(f"[{done}/{total}] {swept_options(result, sweep)}: {outcome}")
+            if store is not None and not args.no_store and "stats" in result:
+                store.put_run(args.app, result["log"], values, result["started"], result["stats"])
+
+        try:
+            experiment.run(vectors, on_result, args.retry_failed)
+        except KeyboardInterrupt:
+            print("Interrupted, run again to continue the sweep", file=sys.stderr)
+            return 130
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    finally:
+        if store is not None:
+            store.close()
+
+    ranking = experiment.ranking(metrics, vectors)
+    print(f"Ranked by {', '.join(metrics)}:")
+    for place, (code, result) in enumerate(ranking, 1):
+        values = ", ".join(f"{name} {metric(result['stats'], name)}" for name in metrics)
+        print(f"{place:3}. {swept_options(result, sweep)}  {values}  {code}")
+    failed = sum("error" in experiment.results.get(codec.to_text(values), {}) for values in vectors)
+    if failed:
+        print(f"{failed} combinations failed, see the output.log in their directory; --retry-failed runs them again")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
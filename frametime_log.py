@@ -0,0 +1,331 @@
+"""
+Frametime statistics of MangoHud-style CSV logs.
+
+MangoHud writes a few lines of system information, then a header naming its columns and one
+line per frame; the frametime column holds the time the frame took in milliseconds. PresentMon
+logs, whose msBetweenPresents column holds the same, are read as well. Logs of long sessions
+run into gigabytes, so they are read in chunks of lines: every chunk is parsed by NumPy and
+folded into a FrametimeStats, which keeps a histogram of the frametimes instead of the
+frametimes themselves, so memory stays the same whatever the size of the log.
+
+The statistics reported for a log are:
+    avg_fps         Frames divided by the time they took.
+    low_1, low_0_1  The 1% and 0.1% lows, the FPS of the frametime that 1% and 0.1% of the
+                    frames were slower than.
+    percentiles     Frametime percentiles in milliseconds.
+    stutters        Frames that took more than STUTTER_FACTOR times the mean of the
+                    STUTTER_WINDOW frames before them.
+
+Usage:
+    python -m frametime_log LOG [LOG ...] [--app APP] [--json]
+
+With --app the statistics are stored in the GUI's profile store next to the resolved profile
+of the application, and the settings panel shows them next to the options of that profile.
+This module must stay free of any PyQt6 imports.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from Settings import SETTINGS
+
+# Names of the columns holding the frametime in milliseconds, compared case insensitively
+FRAMETIME_COLUMNS = ("frametime", "msbetweenpresents")
+
+# Lines searched for the column header before a file is rejected
+HEADER_LINES = 64
+
+# Bytes of lines parsed at once
+CHUNK_SIZE = 16 << 20
+
+# Width of a histogram bin and the frametime of the last bin, in milliseconds
+BIN_WIDTH = 0.01
+MAX_FRAMETIME = 1000.0
+
+PERCENTILES = (50, 90, 95, 99, 99.9)
+STUTTER_FACTOR = 2.0
+STUTTER_WINDOW = 30
+
+
+def find_frametime_column(file):
+    """
+    Reads up to the column header of a log and finds the frametime column.
+
+    Args:
+        file (BinaryIO): Log opened in binary mode, positioned at its start.
+
+    Returns:
+        tuple: (position of the frametime column, number of columns); the file is left at the
+            first frame.
+
+    Raises:
+        ValueError: If no frametime column is found in the first HEADER_LINES lines.
+    """
+    for _ in range(HEADER_LINES):
+        line = file.readline()
+        if not line:
+            break
+        columns = [column.strip().lower() for column in line.decode("utf-8", "replace").split(",")]
+        for name in FRAMETIME_COLUMNS:
+            if name in columns:
+                return columns.index(name), len(columns)
+    raise ValueError("no frametime column found")
+
+
+def _parse_lines(lines, column):
+    # Frametimes of a chunk of lines; a chunk holding a malformed line, e.g. the last line of a
+    # log cut short by a crash, is parsed line by line and the malformed lines are dropped
+    try:
+        return np.loadtxt(lines, delimiter=",", usecols=column, dtype=np.float64, ndmin=1)
+    except ValueError:
+        frametimes = []
+        for line in lines:
+            try:
+                frametimes.append(float(line.split(",")[column]))
+            except (ValueError, IndexError):
+                pass
+        return np.array(frametimes, dtype=np.float64)
+
+
+def read_frametimes(path, chunk_size=CHUNK_SIZE, on_progress=None):
+    """
+    Reads the frametimes of a log in chunks.
+
+    Args:
+        path (str): Path of the log.
+        chunk_size (int): Bytes of lines parsed at once.
+        on_progress (callable): Called with (bytes read, size of the file) after every chunk.
+
+    Yields:
+        numpy.ndarray: float64 frametimes in milliseconds of a chunk of frames.
+
+    Raises:
+        ValueError: If the log has no frametime column.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        column, count = find_frametime_column(file)
+        rest = b""
+        while True:
+            data = file.read(chunk_size)
+            if not data:
+                break
+            # Only whole lines are parsed, the cut-off line is completed by the next chunk
+            data = rest + data
+            end = data.rfind(b"\n") + 1
+            rest = data[end:]
+            lines = data[:end].decode("utf-8", "replace").splitlines()
+            if lines:
+                yield _parse_lines(lines, column)
+            if on_progress is not None:
+                on_progress(file.tell(), size)
+        # A last line without a line break is only complete if none of its columns are missing
+        last = rest.decode("utf-8", "replace").strip()
+        if last and last.count(",") == count - 1:
+            yield _parse_lines([last], column)
+
+
+class FrametimeStats:
+    """
+    Statistics of a stream of frametimes, fed in chunks.
+    """
+
+    def __init__(self):
+        """
+        Initializes empty FrametimeStats.
+
+        Returns:
+            None
+        """
+        self.histogram = np.zeros(int(MAX_FRAMETIME / BIN_WIDTH) + 1, dtype=np.int64)
+        self.frames = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.stutters = 0
+
+        # Last frametimes of the previous chunk, the window the next chunk's first frames are
+        # compared with
+        self._window = np.empty(0, dtype=np.float64)
+
+    def add(self, frametimes):
+        """
+        Adds a chunk of frametimes.
+
+        Args:
+            frametimes (numpy.ndarray): Frametimes in milliseconds.
+
+        Returns:
+            None
+        """
+        frametimes = frametimes[np.isfinite(frametimes) & (frametimes > 0)]
+        if not frametimes.size:
+            return
+        self.frames += frametimes.size
+        self.total += float(frametimes.sum())
+        self.longest = max(self.longest, float(frametimes.max()))
+        bins = np.minimum(frametimes * (1 / BIN_WIDTH), self.histogram.size - 1).astype(np.intp)
+        self.histogram += np.bincount(bins, minlength=self.histogram.size)
+
+        # Every frame with a full window before it is compared with the mean of that window
+        frames = np.concatenate((self._window, frametimes))
+        sums = np.concatenate(((0.0,), np.cumsum(frames)))
+        first = max(self._window.size, STUTTER_WINDOW)
+        if first < frames.size:
+            means = (sums[first:-1] - sums[first - STUTTER_WINDOW:-1 - STUTTER_WINDOW]) / STUTTER_WINDOW
+            self.stutters += int(np.count_nonzero(frames[first:] > means * STUTTER_FACTOR))
+        self._window = frames[-STUTTER_WINDOW:]
+
+    def percentile(self, point):
+        """
+        Gets a frametime percentile, accurate to BIN_WIDTH.
+
+        Args:
+            point (float): Percentile between 0 and 100.
+
+        Returns:
+            float: Frametime in milliseconds that point percent of the frames took at most,
+                None if no frames were added.
+        """
+        if not self.frames:
+            return None
+        rank = max(math.ceil(point / 100 * self.frames), 1)
+        position = int(np.searchsorted(np.cumsum(self.histogram), rank))
+        return min((position + 1) * BIN_WIDTH, self.longest)
+
+    def summary(self):
+        """
+        Gets the statistics of the frames added so far.
+
+        Returns:
+            dict: JSON serializable statistics, see the module docstring.
+        """
+        if not self.frames:
+            return {"frames": 0}
+        low_1, low_0_1 = self.percentile(99), self.percentile(99.9)
+        return {
+            "frames": self.frames,
+            "duration": round(self.total / 1000, 3),
+            "avg_fps": round(self.frames * 1000 / self.total, 2),
+            "low_1": round(1000 / low_1, 2),
+            "low_0_1": round(1000 / low_0_1, 2),
+            "percentiles": {str(point): round(self.percentile(point), 2) for point in PERCENTILES},
+            "longest": round(self.longest, 2),
+            "stutters": self.stutters,
+        }
+
+
+def analyze_log(path, on_progress=None, cancelled=None):
+    """
+    Computes the statistics of a frametime log.
+
+    Args:
+        path (str): Path of the log.
+        on_progress (callable): Called with (bytes read, size of the file) after every chunk.
+        cancelled (callable): Returns True once the analysis should stop.
+
+    Returns:
+        dict: Statistics of the log, see FrametimeStats.summary(), None if cancelled.
+
+    Raises:
+        ValueError: If the log has no frametime column.
+    """
+    stats = FrametimeStats()
+    for frametimes in read_frametimes(path, on_progress=on_progress):
+        if cancelled is not None and cancelled():
+            return None
+        stats.add(frametimes)
+    return stats.summary()
+
+
+def option_costs(runs, settings=SETTINGS):
+    """
+    Summarizes the stored runs of an application per option: the mean average FPS and 1% low
+    of the runs recorded with each option selected.
+
+    Args:
+        runs (list): (log, values, recorded, stats) tuples, see ProfileStore.runs().
+        settings (tuple): Setting descriptors, the position of a setting is its ID.
+
+    Returns:
+        dict: Setting ID -> text shown next to every option, None for options without runs.
+    """
+    measured = [(values, stats) for _, values, _, stats in runs if stats.get("frames")]
+    costs = {}
+    for setting_id, setting in enumerate(settings):
+        notes = [None] * len(setting.options)
+        for option in range(1, len(setting.options)):
+            selected = [stats for values, stats in measured
+                        if setting_id < len(values) and values[setting_id] == option]
+            if selected:
+                fps = sum(stats["avg_fps"] for stats in selected) / len(selected)
+                low = sum(stats["low_1"] for stats in selected) / len(selected)
+                notes[option] = f"{fps:.0f} fps, 1% low {low:.0f} ({len(selected)} run{'s' if len(selected) != 1 else ''})"
+        if any(notes):
+            costs[setting_id] = tuple(notes)
+    return costs
+
+
+def format_summary(stats):
+    """
+    Formats the statistics of a log on one line.
+
+    Args:
+        stats (dict): Statistics of the log.
+
+    Returns:
+        str: Human readable summary.
+    """
+    if not stats.get("frames"):
+        return "no frames"
+    percentiles = " ".join(f"p{point} {value:.2f}" for point, value in stats["percentiles"].items())
+    return (f"{stats['frames']} frames in {stats['duration']:.1f}s, avg {stats['avg_fps']:.1f} fps, "
+            f"1% low {stats['low_1']:.1f}, 0.1% low {stats['low_0_1']:.1f}, {stats['stutters']} stutters, "
+            f"frametime ms {percentiles}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m frametime_log",
+                                     description="Compute frametime statistics of MangoHud or PresentMon CSV logs.")
+    parser.add_argument("logs", nargs="+", help="frametime logs")
+    parser.add_argument("--app", default=None, help="store the statistics with the current profile of this application")
+    parser.add_argument("--json", action="store_true", help="print the statistics as JSON")
+    args = parser.parse_args(argv)
+
+    store = layers = None
+    if args.app is not None:
+        from profile_layers import LayeredProfiles
+        from profile_store import ProfileStore, default_store_path
+        store = ProfileStore(default_store_path())
+        layers = LayeredProfiles(store)
+
+    results, failed = {}, 0
+    try:
+        for path in args.logs:
+            start = time.perf_counter()
+            try:
+                stats = analyze_log(path)
+            except (OSError, ValueError) as error:
+                print(f"{path}: {error}", file=sys.stderr)
+                failed += 1
+                continue
+            results[path] = stats
+            if store is not None:
+                store.put_run(args.app, os.path.abspath(path), layers.resolve(args.app),
+                              os.path.getmtime(path), stats)
+            if not args.json:
+                print(f"{path}: {format_summary(stats)} ({time.perf_counter() - start:.2f}s)")
+    finally:
+        if store is not None:
+            store.close()
+    if args.json:
+        print(json.dumps(results, indent=4))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+CPU previews of vkBasalt's sharpening effects on a screenshot.
+
+The filters follow the shaders vkBasalt runs on the GPU, written as whole-array NumPy
+operations over a 3x3 neighbourhood:
+
+- CAS (contrast adaptive sharpening) sharpens each pixel less where the neighbourhood is
+  already close to black or white, so edges don't ring.
+- DLS (denoised luma sharpening) adds back the luma lost to a 3x3 blur, after dropping the
+  detail weaker than the denoise threshold so noise isn't amplified.
+
+A TileRenderer splits the image into tiles and renders only the tiles of the area asked for,
+on a thread pool (NumPy releases the GIL in its inner loops), keeping every rendered tile until
+the filters change. Scrolling a preview only renders the tiles that come into view.
+
+This module must stay free of any PyQt6 imports.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from Settings import SETTINGS_BY_KEY
+
+# Rec. 709 luma weights
+LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+# Denoise strength vkBasalt uses when a conf doesn't set it
+DLS_DENOISE_DEFAULT = 0.17
+
+# Detail weaker than this, times the denoise setting, is dropped by DLS
+DENOISE_SCALE = 0.1
+
+# Pixels on each side of a pixel a filter reads
+FILTER_HALO = 1
+
+
+def _neighbourhood(padded):
+    # Views of the 3x3 neighbours of every pixel of a padded tile, a b c / d e f / g h i
+    return (padded[:-2, :-2], padded[:-2, 1:-1], padded[:-2, 2:],
+            padded[1:-1, :-2], padded[1:-1, 1:-1], padded[1:-1, 2:],
+            padded[2:, :-2], padded[2:, 1:-1], padded[2:, 2:])
+
+
+def cas(padded, sharpness):
+    """
+    Applies contrast adaptive sharpening.
+
+    Args:
+        padded (numpy.ndarray): (h + 2, w + 2, 3) float32 RGB in 0..1, with a 1 pixel border.
+        sharpness (float): Strength between 0 and 1.
+
+    Returns:
+        numpy.ndarray: (h, w, 3) float32 RGB in 0..1.
+    """
+    a, b, c, d, e, f, g, h, i = _neighbourhood(padded)
+    cross_min = np.minimum(np.minimum(np.minimum(b, d), np.minimum(f, h)), e)
+    cross_max = np.maximum(np.maximum(np.maximum(b, d), np.maximum(f, h)), e)
+    low = cross_min + np.minimum(np.minimum(cross_min, a), np.minimum(np.minimum(c, g), i))
+    high = cross_max + np.maximum(np.maximum(cross_max, a), np.maximum(np.maximum(c, g), i))
+
+    # Sharpen less where there is little headroom left towards black or white
+    amplitude = np.sqrt(np.clip(np.minimum(low, 2.0 - high) / np.maximum(high, 1e-5), 0.0, 1.0))
+    weight = amplitude * np.float32(-1.0 / (8.0 - 3.0 * sharpness))
+    out = ((b + d + f + h) * weight + e) / (1.0 + 4.0 * weight)
+    return np.clip(out, 0.0, 1.0, out=out)
+
+
+def dls(padded, sharpness, denoise):
+    """
+    Applies denoised luma sharpening.
+
+    Args:
+        padded (numpy.ndarray): (h + 2, w + 2, 3) float32 RGB in 0..1, with a 1 pixel border.
+        sharpness (float): Strength between 0 and 1.
+        denoise (float): How much weak detail is treated as noise, between 0 and 1.
+
+    Returns:
+        numpy.ndarray: (h, w, 3) float32 RGB in 0..1.
+    """
+    a, b, c, d, e, f, g, h, i = _neighbourhood(padded)
+    blur = (a + c + g + i) * 0.0625 + (b + d + f + h) * 0.125 + e * 0.25
+    detail = (e - blur) @ LUMA
+    detail = np.sign(detail) * np.maximum(np.abs(detail) - denoise * DENOISE_SCALE, 0.0)
+    out = e + (sharpness * 2.0) * detail[..., None]
+    return np.clip(out, 0.0, 1.0, out=out)
+
+
+def _strength(profile, key):
+    # Strength selected for a setting, None when it is unset or switched off
+    label = profile.get(key)
+    if label is None:
+        return None
+    setting = SETTINGS_BY_KEY[key]
+    value = setting.values[setting.option_index(label)]
+    return None if value is None or value is False else float(value)
+
+
+def preview_filters(profile):
+    """
+    Works out the filters a profile switches on, in the order vkBasalt applies them.
+
+    Args:
+        profile (dict): Setting key -> selected option label.
+
+    Returns:
+        tuple: (filter name, strength arguments) pairs, hashable so they can be compared.
+    """
+    filters = []
+    sharpness = _strength(profile, "CAS")
+    if sharpness is not None:
+        filters.append(("cas", (sharpness,)))
+    sharpness = _strength(profile, "DLS_Sharpness")
+    if sharpness is not None:
+        denoise = _strength(profile, "DLS_Denoise")
+        filters.append(("dls", (sharpness, DLS_DENOISE_DEFAULT if denoise is None else denoise)))
+    return tuple(filters)
+
+
+FILTERS = {"cas": cas, "dls": dls}
+
+
+def render_region(image, top, left, bottom, right, filters):
+    """
+    Renders a region of an image through a chain of filters.
+
+    Args:
+        image (numpy.ndarray): (height, width, 3) uint8 RGB image.
+        top (int): First row of the region.
+        left (int): First column of the region.
+        bottom (int): Row after the last one.
+        right (int): Column after the last one.
+        filters (tuple): (filter name, strength arguments) pairs, see preview_filters().
+
+    Returns:
+        numpy.ndarray: (bottom - top, right - left, 3) uint8 RGB region.
+    """
+    if not filters:
+        return image[top:bottom, left:right]
+
+    # Read enough pixels around the region for every filter of the chain, repeating the
+    # image's edge pixels where the region touches it
+    halo = FILTER_HALO * len(filters)
+    height, width = image.shape[:2]
+    source = image[max(top - halo, 0):min(bottom + halo, height), max(left - halo, 0):min(right + halo, width)]
+    pad = ((max(halo - top, 0), max(bottom + halo - height, 0)),
+           (max(halo - left, 0), max(right + halo - width, 0)), (0, 0))
+    pixels = np.pad(source, pad, mode="edge").astype(np.float32) * np.float32(1 / 255)
+
+    for name, arguments in filters:
+        pixels = FILTERS[name](pixels, *arguments)
+    return (pixels * 255.0 + 0.5).astype(np.uint8)
+
+
+class TileRenderer:
+    """
+    Renders the tiles of an image through a chain of filters on demand, keeping the tiles
+    rendered so far until the filters change.
+
+    The rendered image is kept in output, a (height, width, 3) uint8 array.
+    """
+
+    def __init__(self, image, tile_size=256, workers=None):
+        """
+        Initializes the TileRenderer.
+
+        Args:
+            image (numpy.ndarray): (height, width, 3) uint8 RGB image.
+            tile_size (int): Width and height of a tile in pixels.
+            workers (int): Threads rendering tiles, defaults to the CPU count.
+
+        Returns:
+            None
+        """
+        self.image = image
+        self.tile_size = tile_size
+        self.output = image.copy()
+        self.filters = ()
+        height, width = image.shape[:2]
+        self.done = np.ones((-(-height // tile_size), -(-width // tile_size)), dtype=bool)
+        self._pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+
+    def set_filters(self, filters):
+        """
+        Changes the filter chain, dropping every rendered tile.
+
+        Args:
+            filters (tuple): (filter name, strength arguments) pairs, see preview_filters().
+
+        Returns:
+            bool: True if the filters changed.
+        """
+        if filters == self.filters:
+            return False
+        self.filters = filters
+        if filters:
+            self.done[:] = False
+        else:
+            # Without filters the preview is the image itself
+            self.output[:] = self.image
+            self.done[:] = True
+        return True
+
+    def _render_tile(self, row, column):
+        top, left = row * self.tile_size, column * self.tile_size
+        bottom = min(top + self.tile_size, self.image.shape[0])
+        right = min(left + self.tile_size, self.image.shape[1])
+        self.output[top:bottom, left:right] = render_region(self.image, top, left, bottom, right, self.filters)
+        self.done[row, column] = True
+
+    def render(self, left, top, width, height):
+        """
+        Renders the tiles of an area that haven't been rendered yet.
+
+        Args:
+            left (int): First column of the area.
+            top (int): First row of the area.
+            width (int): Width of the area.
+            height (int): Height of the area.
+
+        Returns:
+            int: Number of tiles rendered.
+        """
+        rows = range(max(top, 0) // self.tile_size, min(-(-(top + height) // self.tile_size), self.done.shape[0]))
+        columns = range(max(left, 0) // self.tile_size, min(-(-(left + width) // self.tile_size), self.done.shape[1]))
+        tiles = [(row, column) for row in rows for column in columns if not self.done[row, column]]
+        list(self._pool.map(lambda tile: self._render_tile(*tile), tiles))
+        return len(tiles)
+
+    def close(self):
+        """
+        Stops the render threads.
+
+        Returns:
+            None
+        """
+        self._pool.shutdown()
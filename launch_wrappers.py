@@ -0,0 +1,189 @@
+"""
+Launch wrappers that point games at their generated confs.
+
+DXVK and vkBasalt only read a conf from a custom location when DXVK_CONFIG_FILE, ENABLE_VKBASALT
+and VKBASALT_CONFIG_FILE are set in the game's environment. For every application this module
+writes a small shell script next to its confs that sets them and runs the game, and builds the
+equivalent Steam launch option string:
+
+    DXVK_CONFIG_FILE='.../dxvk.conf' ENABLE_VKBASALT=1 VKBASALT_CONFIG_FILE='.../vkBasalt.conf' %command%
+
+Usage:
+    python -m launch_wrappers [--root CONF_ROOT] [--steam-options OUTPUT]
+
+Without arguments a wrapper is generated for every application in the profile store of the
+GUI. Wrappers are written through a ConfWriter, so unchanged wrappers are not rewritten.
+This module must stay free of any PyQt6 imports.
+"""
+import argparse
+import json
+import os
+import shlex
+import stat
+import sys
+import time
+from string import Template
+
+from app_paths import cache_dir, config_dir
+from conf_compiler import app_conf_dir, conf_paths
+from conf_render import HEADER
+from conf_writer import ConfWriter, load_hashes, save_hashes, HASHES_FILE, WRITTEN
+
+WRAPPER_NAME = "launch.sh"
+
+# Directory under the config directory holding a conf directory per application, shared with
+# the save pipeline of the GUI
+CONF_ROOT_NAME = "confs"
+
+# Templates are parsed once, every wrapper only substitutes its quoted paths
+ENVIRONMENT_TEMPLATE = Template("DXVK_CONFIG_FILE=$dxvk ENABLE_VKBASALT=1 VKBASALT_CONFIG_FILE=$vkbasalt")
+WRAPPER_TEMPLATE = Template(f"#!/bin/sh\n{HEADER}\nexport $environment\nexec \"$$@\"\n")
+STEAM_TEMPLATE = Template("$environment %command%")
+
+EXECUTABLE = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+
+
+def default_conf_root():
+    """
+    Gets the directory the GUI writes the confs of every application to.
+
+    Returns:
+        str: Path of the conf root in the config directory.
+    """
+    return os.path.join(config_dir(), CONF_ROOT_NAME)
+
+
+def wrapper_path(root, app):
+    """
+    Gets the path of the launch wrapper of an app.
+
+    Args:
+        root (str): Directory holding the conf directory of every app.
+        app (str): Name or path identifying the application.
+
+    Returns:
+        str: Absolute path of the wrapper script.
+    """
+    return os.path.join(os.path.abspath(app_conf_dir(root, app)), WRAPPER_NAME)
+
+
+def environment(root, app):
+    """
+    Builds the environment assignments pointing an app at its confs.
+
+    Args:
+        root (str): Directory holding the conf directory of every app.
+        app (str): Name or path identifying the application.
+
+    Returns:
+        str: Shell assignments, quoted for sh.
+    """
+    vkbasalt_path, dxvk_path = conf_paths(root, app)
+    return ENVIRONMENT_TEMPLATE.substitute(dxvk=shlex.quote(dxvk_path), vkbasalt=shlex.quote(vkbasalt_path))
+
+
+def steam_launch_options(root, app):
+    """
+    Builds the Steam launch option string of an app.
+
+    Args:
+        root (str): Directory holding the conf directory of every app.
+        app (str): Name or path identifying the application.
+
+    Returns:
+        str: Launch options to paste into the game's properties in Steam.
+    """
+    return STEAM_TEMPLATE.substitute(environment=environment(root, app))
+
+
+def render_wrapper(root, app):
+    """
+    Renders the launch wrapper script of an app.
+
+    Args:
+        root (str): Directory holding the conf directory of every app.
+        app (str): Name or path identifying the application.
+
+    Returns:
+        str: Contents of the wrapper script.
+    """
+    return WRAPPER_TEMPLATE.substitute(environment=environment(root, app))
+
+
+def write_wrapper(writer, root, app):
+    """
+    Writes the launch wrapper of an app unless it is unchanged, making it executable.
+
+    Args:
+        writer (ConfWriter): Writer whose hash cache decides which wrappers are unchanged.
+        root (str): Directory holding the conf directory of every app.
+        app (str): Name or path identifying the application.
+
+    Returns:
+        str: WRITTEN, SKIPPED or FAILED.
+    """
+    path = wrapper_path(root, app)
+    outcome = writer.write(path, render_wrapper(root, app))
+    if outcome == WRITTEN:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+        if mode & EXECUTABLE != EXECUTABLE:
+            # Only the permission bits change, the hash cache entry stays valid
+            os.chmod(path, mode | EXECUTABLE)
+    return outcome
+
+
+def write_wrappers(apps, root, writer=None):
+    """
+    Writes the launch wrappers of many apps.
+
+    Args:
+        apps (iterable): Names or paths identifying the applications.
+        root (str): Directory holding the conf directory of every app.
+        writer (ConfWriter): Writer whose hash cache and counts are used, a new one if None.
+
+    Returns:
+        ConfWriter: The writer, holding the counts of the written, unchanged and failed wrappers.
+    """
+    writer = writer if writer is not None else ConfWriter()
+    for app in apps:
+        write_wrapper(writer, root, app)
+    return writer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m launch_wrappers",
+                                     description="Generate launch wrappers for every application in the profile store.")
+    parser.add_argument("--root", default=None, help="conf root of the applications (default: the GUI's)")
+    parser.add_argument("--steam-options", default=None,
+                        help="also write the Steam launch options of every application to this JSON file")
+    args = parser.parse_args(argv)
+
+    from profile_store import ProfileStore, default_store_path
+    store = ProfileStore(default_store_path())
+    apps = [app for app, _ in store.items()]
+    store.close()
+    root = args.root if args.root is not None else default_conf_root()
+
+    hashes_path = os.path.join(cache_dir(), HASHES_FILE)
+    writer = ConfWriter(load_hashes(hashes_path))
+    start = time.perf_counter()
+    write_wrappers(apps, root, writer)
+    elapsed = time.perf_counter() - start
+    try:
+        save_hashes(hashes_path, writer.hashes)
+    except OSError:
+        pass
+
+    if args.steam_options:
+        with open(args.steam_options, "w") as file:
+            json.dump({app: steam_launch_options(root, app) for app in apps}, file, indent=4)
+
+    for path, error in writer.errors:
+        print(f"{path}: {error}", file=sys.stderr)
+    print(f"Generated {len(apps)} wrappers in {elapsed:.3f}s, {writer.written} written, "
+          f"{writer.skipped} unchanged, {writer.failed} failed")
+    return 1 if writer.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,34 @@
+import time
+
+# Taken before anything else is imported, every startup timing is measured from here
+START = time.perf_counter()
+
+import os
 import sys
 from PyQt6.QtWidgets import QApplication
 from main_window import MainWindow
 
+# When set, the startup timings are printed as JSON and the application quits once usable
+STARTUP_REPORT_ENV = "SETTINGS_MANAGER_STARTUP_REPORT"
+
+
 def main():
+    timings = {"imports": time.perf_counter() - START}
     app = QApplication(sys.argv)
     window = MainWindow()
+
+    def mark(name):
+        timings[name] = time.perf_counter() - START
+
+    window.firstPainted.connect(lambda: mark("first_paint"))
+    window.startupFinished.connect(lambda: mark("interactive"))
+    if os.environ.get(STARTUP_REPORT_ENV):
+        import json
+        window.startupFinished.connect(lambda: print(json.dumps(timings), flush=True))
+        window.startupFinished.connect(window.close)
+
     window.show()
+    mark("shown")
     sys.exit(app.exec())
 
 if __name__ == "__main__":
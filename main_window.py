@@ -1,28 +1,632 @@
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QSplitter
-from settings_panel import SettingsPanel
+import os
+import sys
+from PyQt6.QtCore import Qt, QTimer, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QSplitter, QLabel, QProgressDialog, QDockWidget,
+                             QFileDialog)
+from app_index import SOURCE_MANUAL
 from app_list_panel import AppListPanel
+from workers import Worker
+
+
+class LoadingPlaceholder(QLabel):
+    """
+    Stands in for the settings panel until the window has been painted once.
+
+    Signals:
+        painted(): Emitted after the placeholder is first painted.
+    """
+
+    painted = pyqtSignal()
+
+    def __init__(self):
+        super().__init__("Loading settings...")
+        self._painted = False
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            self.painted.emit()
+
 
 class MainWindow(QMainWindow):
+    """
+    Main window of the settings manager.
+
+    Only the application list is built before the window is shown. The settings panel, the
+    profile store and the library scan are set up once the window has been painted, so the
+    window appears as early as possible.
+
+    Signals:
+        firstPainted(): Emitted once the window has been painted for the first time.
+        startupFinished(): Emitted once the settings panel is built and the window is usable.
+    """
+
+    firstPainted = pyqtSignal()
+    startupFinished = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Graphics Settings Manager")
 
+        # Profile store, save pipeline and settings panel, created after the first paint
+        self.profile_store = None
+        self.save_pipeline = None
+        self.settings_panel = None
+        self.current_app = None
+
+        # Shared layer shown in the settings panel instead of the application's own profile
+        self.current_layer = None
+
+        # Sharpening preview dock, created the first time it is opened
+        self.preview_dock = None
+
+        # Bulk apply that is currently running and its progress dialog
+        self.apply_worker = None
+        self.apply_progress = None
+
+        # Frametime log being analyzed, and the cost model fitted to the stored logs, built in
+        # the background after startup
+        self.log_worker = None
+        self.cost_model = None
+        self.model_worker = None
+
+        # Whether the cost model is being built, and the applications whose logs were imported
+        # meanwhile
+        self.model_building = False
+        self.model_imports = set()
+
         # Create main layout
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
         layout = QVBoxLayout(main_widget)
 
         # Create splitter
-        splitter = QSplitter()
-        layout.addWidget(splitter)
+        self.splitter = QSplitter()
+        layout.addWidget(self.splitter)
 
-        # Create app list panel and settings panel
+        # Create app list panel and a placeholder for the settings panel
         self.app_list_panel = AppListPanel()
-        self.settings_panel = SettingsPanel()
+        self.placeholder = LoadingPlaceholder()
 
         # Add panels to splitter
-        splitter.addWidget(self.app_list_panel)
-        splitter.addWidget(self.settings_panel)
+        self.splitter.addWidget(self.app_list_panel)
+        self.splitter.addWidget(self.placeholder)
 
         # Set sizes for the splitter
-        splitter.setSizes([400, 600])  # Adjust the sizes as needed
+        self.splitter.setSizes([400, 600])  # Adjust the sizes as needed
+
+        # Finish starting up once the first frame is on screen
+        self.placeholder.painted.connect(self.first_paint)
+
+    def first_paint(self):
+        """
+        Schedules the rest of the startup once the window has been painted.
+
+        Returns:
+            None
+        """
+        self.firstPainted.emit()
+        QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """
+        Builds the settings panel, opens the profile store and starts the library scan.
+
+        Returns:
+            None
+        """
+        # Imported here so the settings registry and the panel aren't loaded before the
+        # window is on screen
+        from settings_panel import SettingsPanel
+        from profile_layers import LAYER_TITLES, FAMILY_TITLES
+        from profile_store import ProfileStore, default_store_path
+        from save_pipeline import SavePipeline
+
+        self.profile_store = ProfileStore(default_store_path())
+        self.save_pipeline = SavePipeline(self.profile_store, parent=self)
+        self.save_pipeline.saved.connect(self.profiles_saved)
+        self.save_pipeline.failed.connect(self.save_failed)
+        self.settings_panel = SettingsPanel()
+        self.splitter.replaceWidget(1, self.settings_panel)
+        self.placeholder.deleteLater()
+        self.placeholder = None
+
+        # Connect the panels to the profile store
+        self.app_list_panel.appSelected.connect(self.select_app)
+        self.settings_panel.add_app_button.clicked.connect(self.save_profile)
+        self.settings_panel.apply_button.clicked.connect(self.apply_to_selected)
+        self.app_list_panel.selectionCountChanged.connect(self.selection_count_changed)
+        self.selection_count_changed(self.app_list_panel.selection_count())
+
+        # Let the shared layers and the API family of the selected application be edited
+        self.settings_panel.layer_box.addItem("Selected Application", None)
+        for name, title in LAYER_TITLES.items():
+            self.settings_panel.layer_box.addItem(title, name)
+        self.settings_panel.family_box.addItem("Unknown", None)
+        for family, title in FAMILY_TITLES.items():
+            self.settings_panel.family_box.addItem(title, family)
+        self.settings_panel.layer_box.activated.connect(self.select_layer)
+        self.settings_panel.family_box.activated.connect(self.set_app_family)
+
+        # Add the menu opening the sharpening preview, which pulls in NumPy when first opened
+        view_menu = self.menuBar().addMenu("View")
+        view_menu.addAction("Sharpening Preview", self.show_preview)
+        self.settings_panel.model.dataChanged.connect(self.update_preview)
+
+        # Add the menu importing frametime logs of the selected application
+        tools_menu = self.menuBar().addMenu("Tools")
+        self.import_log_action = tools_menu.addAction("Import Frametime Log...", self.import_frametime_log)
+        self.import_log_action.setEnabled(False)
+
+        # Estimate the cost of the options from the stored frametime logs
+        self.settings_panel.model.valueChanged.connect(self.show_profile_cost)
+        self.build_cost_model()
+
+        # Discover the installed games in the background, then list the stored applications
+        # the scan didn't find
+        self.app_list_panel.scanFinished.connect(self.add_stored_apps)
+        self.app_list_panel.add_application()
+        self.startupFinished.emit()
+
+    def add_stored_apps(self):
+        """
+        Adds the applications that have a stored profile but weren't found by the library scan,
+        such as executables added by hand, to the application list as manually added ones.
+
+        Returns:
+            None
+        """
+        self.app_list_panel.add_apps((os.path.basename(app.rstrip(os.sep)) or app, app, SOURCE_MANUAL)
+                                     for app in self.profile_store.apps())
+
+    def select_app(self, app):
+        """
+        Shows the stored profile of an application in the settings panel.
+
+        Args:
+            app (str): Path of the selected application.
+
+        Returns:
+            None
+        """
+        self.current_app = app
+        self.current_layer = None
+        values = self.save_pipeline.unsaved_values(app)
+        if values is None:
+            values = self.profile_store.get(app)
+        if values is None:
+            values = [0] * len(self.settings_panel.values())
+        self.settings_panel.load_values(values)
+        self.settings_panel.add_app_button.setEnabled(True)
+        self.settings_panel.layer_box.setCurrentIndex(0)
+        family = self.save_pipeline.unsaved_family(app, self.profile_store.family(app))
+        self.settings_panel.family_box.setCurrentIndex(self.settings_panel.family_box.findData(family))
+        self.settings_panel.family_box.setEnabled(True)
+        self.import_log_action.setEnabled(self.log_worker is None)
+        self.selection_count_changed(self.app_list_panel.selection_count())
+        self.show_option_notes()
+
+    def select_layer(self, index):
+        """
+        Shows a shared layer in the settings panel, or the selected application's profile again.
+
+        Args:
+            index (int): Item picked in the layer box.
+
+        Returns:
+            None
+        """
+        name = self.settings_panel.layer_box.itemData(index)
+        if name is None:
+            if self.current_app is not None:
+                self.select_app(self.current_app)
+            else:
+                self.current_layer = None
+                self.settings_panel.load_values([0] * len(self.settings_panel.values()))
+                self.settings_panel.add_app_button.setEnabled(False)
+            return
+        self.current_layer = name
+        values = self.save_pipeline.unsaved_layer(name)
+        if values is None:
+            values = self.profile_store.get_layer(name)
+        if values is None:
+            values = [0] * len(self.settings_panel.values())
+        self.settings_panel.load_values(values)
+        self.settings_panel.add_app_button.setEnabled(True)
+        self.settings_panel.family_box.setEnabled(False)
+        self.import_log_action.setEnabled(False)
+        self.selection_count_changed(self.app_list_panel.selection_count())
+        self.show_option_notes()
+
+    def set_app_family(self, index):
+        """
+        Changes the API family of the selected application, whose confs are then rewritten
+        through the layer of its new family.
+
+        Args:
+            index (int): Item picked in the family box.
+
+        Returns:
+            None
+        """
+        if self.current_app is not None and self.current_layer is None:
+            self.save_pipeline.request_family(self.current_app, self.settings_panel.family_box.itemData(index))
+
+    def build_cost_model(self):
+        """
+        Fits the cost model to every stored frametime log in the background, if there are any.
+
+        Returns:
+            None
+        """
+        store, settings = self.profile_store, self.settings_panel.model.settings
+
+        def build(worker):
+            runs = store.all_runs()
+            if not runs:
+                return None
+            # Pulls in NumPy, only needed once frametime logs have been stored
+            from cost_model import CostModel
+            model = CostModel(settings)
+            model.add_runs(runs)
+            return model
+
+        self.model_building = True
+        self.model_worker = Worker(build)
+        self.model_worker.signals.result.connect(self.cost_model_built)
+        self.model_worker.signals.error.connect(self.cost_model_failed)
+        self.model_worker.signals.finished.connect(lambda: setattr(self, "model_worker", None))
+        QThreadPool.globalInstance().start(self.model_worker)
+
+    def cost_model_built(self, model):
+        """
+        Shows the estimates of the newly built cost model.
+
+        Args:
+            model (CostModel): The cost model, None if no frametime logs are stored.
+
+        Returns:
+            None
+        """
+        # Logs imported from here on go straight into the model
+        self.model_building = False
+        if self.model_imports:
+            # Only the runs of the applications whose logs were imported during the build are
+            # added, the model already holds every run stored before it
+            if model is None:
+                from cost_model import CostModel
+                model = CostModel(self.settings_panel.model.settings)
+            for app in self.model_imports:
+                model.add_runs((app, *run) for run in self.profile_store.runs(app))
+            self.model_imports.clear()
+        if model is None:
+            return
+        self.cost_model = model
+        self.show_option_notes()
+
+    def cost_model_failed(self, error):
+        """
+        Reports a cost model build that raised, and starts the model from the logs imported
+        since.
+
+        Args:
+            error (str): Traceback of the exception.
+
+        Returns:
+            None
+        """
+        print(error, file=sys.stderr)
+        self.cost_model_built(None)
+
+    def show_option_notes(self):
+        """
+        Shows the estimated cost of every option and the frametimes measured for the selected
+        application next to the options of the settings panel.
+
+        Returns:
+            None
+        """
+        app = self.current_app if self.current_layer is None else None
+        runs = self.profile_store.runs(app) if app is not None else []
+        if runs or self.cost_model is not None:
+            # Pulls in NumPy, only needed once frametime logs have been stored
+            from cost_model import option_notes
+            from frametime_log import option_costs
+            settings = self.settings_panel.model.settings
+            costs = self.cost_model.option_costs() if self.cost_model is not None else {}
+            self.settings_panel.model.set_option_notes(option_notes(costs, option_costs(runs, settings)))
+        else:
+            self.settings_panel.model.set_option_notes({})
+        self.show_profile_cost()
+
+    def show_profile_cost(self):
+        """
+        Shows the estimated cost of the profile in the settings panel.
+
+        Returns:
+            None
+        """
+        cost = self.cost_model.profile_cost(self.settings_panel.values()) if self.cost_model is not None else None
+        self.settings_panel.label.setText("Settings" if cost is None else f"Settings  (estimated {cost:+.1f} ms per frame)")
+
+    def import_frametime_log(self):
+        """
+        Asks for a MangoHud or PresentMon frametime log of the selected application and stores
+        its statistics with the application's saved profile, analyzing it in the background.
+
+        Returns:
+            None
+        """
+        if self.current_app is None or self.current_layer is not None or self.log_worker is not None:
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Import Frametime Log", "", "Frametime Logs (*.csv);;All Files (*)")
+        if not path:
+            return
+        from frametime_log import analyze_log
+        from profile_layers import LayeredProfiles
+        app, store = self.current_app, self.profile_store
+
+        def analyze(worker):
+            def on_progress(done, size):
+                # Logs can be larger than a signal's int holds, so progress is sent in percent
+                worker.signals.progress.emit(done * 100 // max(size, 1), 100)
+
+            stats = analyze_log(path, on_progress=on_progress, cancelled=worker.is_cancelled)
+            if stats is not None:
+                # The log was recorded with the confs on disk, so it is stored with the saved
+                # profile, resolved through its own layers to stay clear of the save pipeline's
+                values = LayeredProfiles(store).resolve(app)
+                store.put_run(app, os.path.abspath(path), values, os.path.getmtime(path), stats)
+            return stats
+
+        self.import_log_action.setEnabled(False)
+        self.log_worker = Worker(analyze)
+        self.log_worker.signals.progress.connect(
+            lambda percent, total: self.statusBar().showMessage(f"Analyzing {os.path.basename(path)}... {percent}%"))
+        self.log_worker.signals.result.connect(lambda stats: self.frametime_log_done(app, stats))
+        self.log_worker.signals.error.connect(self.frametime_log_failed)
+        self.log_worker.signals.finished.connect(self.frametime_log_finished)
+        QThreadPool.globalInstance().start(self.log_worker)
+
+    def frametime_log_done(self, app, stats):
+        """
+        Reports the statistics of an imported frametime log.
+
+        Args:
+            app (str): Application the log was imported for.
+            stats (dict): Statistics of the log, None if the import was cancelled.
+
+        Returns:
+            None
+        """
+        if stats is None:
+            return
+        from frametime_log import format_summary
+        self.statusBar().showMessage(format_summary(stats), 10000)
+        # Only the new log is added to the cost model, which is then solved again; while the
+        # model is still being built, it is added once the build is done
+        if self.model_building:
+            self.model_imports.add(app)
+        else:
+            if self.cost_model is None:
+                from cost_model import CostModel
+                self.cost_model = CostModel(self.settings_panel.model.settings)
+            self.cost_model.add_runs((app, *run) for run in self.profile_store.runs(app))
+        self.show_option_notes()
+
+    def frametime_log_failed(self, error):
+        """
+        Reports a frametime log that couldn't be analyzed.
+
+        Args:
+            error (str): Traceback of the exception.
+
+        Returns:
+            None
+        """
+        print(error, file=sys.stderr)
+        self.statusBar().showMessage(f"Importing the frametime log failed: {error.strip().splitlines()[-1]}", 5000)
+
+    def frametime_log_finished(self):
+        """
+        Allows importing the next frametime log.
+
+        Returns:
+            None
+        """
+        self.log_worker = None
+        self.import_log_action.setEnabled(self.current_app is not None and self.current_layer is None)
+
+    def save_profile(self):
+        """
+        Stores the settings shown in the settings panel as the profile of the selected application,
+        or as the shared layer being edited.
+
+        Returns:
+            None
+        """
+        values = self.settings_panel.values()
+        if self.current_layer is not None:
+            self.save_pipeline.request_layer(self.current_layer, values)
+            self.settings_panel.loaded_values = values
+        elif self.current_app is not None:
+            self.save_pipeline.request(self.current_app, values)
+            self.settings_panel.loaded_values = values
+
+    def profiles_saved(self, count):
+        """
+        Shows how many profiles a save batch wrote and the recent save latencies.
+
+        Args:
+            count (int): Number of applications written.
+
+        Returns:
+            None
+        """
+        latencies = "  ".join(f"p{point} {latency:.0f} ms"
+                              for point, latency in self.save_pipeline.latency_percentiles().items())
+        self.statusBar().showMessage(f"Saved {count} profile{'s' if count != 1 else ''}  |  {latencies}", 5000)
+
+    def save_failed(self, error):
+        """
+        Reports a save batch that raised or failed to write some of its files.
+
+        Args:
+            error (str): Traceback of the exception, or the files that weren't written.
+
+        Returns:
+            None
+        """
+        print(error, file=sys.stderr)
+        self.statusBar().showMessage("Saving failed, see the log for details", 5000)
+
+    def selection_count_changed(self, count):
+        """
+        Enables applying the changed settings while applications are selected.
+
+        Args:
+            count (int): Number of selected applications.
+
+        Returns:
+            None
+        """
+        # Settings changed in a shared layer are saved to the layer, not applied to applications
+        self.settings_panel.apply_button.setEnabled(count > 0 and self.apply_worker is None
+                                                    and self.current_layer is None)
+        self.settings_panel.apply_button.setText(f"Apply to Selected ({count})" if count > 1 else "Apply to Selected")
+
+    def apply_to_selected(self):
+        """
+        Applies the settings changed in the settings panel to every selected application, in
+        the background, a chunk of applications per transaction.
+
+        Returns:
+            None
+        """
+        apps = self.app_list_panel.selected_apps()
+        changes = self.settings_panel.changed_values()
+        if self.apply_worker is not None or not apps:
+            return
+        if not changes:
+            self.statusBar().showMessage("No settings have been changed", 3000)
+            return
+
+        # The selection and the shown profile must not change under the apply, so the panels
+        # stay disabled until it ends; the store is only locked a chunk at a time
+        self.app_list_panel.setEnabled(False)
+        self.settings_panel.setEnabled(False)
+
+        self.apply_progress = QProgressDialog(f"Applying {len(changes)} settings to {len(apps)} applications...",
+                                              "Cancel", 0, len(apps), self)
+        self.apply_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.apply_progress.setMinimumDuration(250)
+        self.apply_progress.setAutoReset(False)
+
+        store = self.profile_store
+
+        def apply(worker):
+            return store.update_many(apps, changes, on_progress=worker.signals.progress.emit,
+                                     cancelled=worker.is_cancelled)
+
+        self.apply_worker = Worker(apply)
+        self.apply_worker.signals.progress.connect(self.apply_progress.setValue)
+        self.apply_worker.signals.result.connect(lambda count: self.apply_done(apps, count))
+        self.apply_worker.signals.error.connect(self.apply_failed)
+        self.apply_worker.signals.finished.connect(self.apply_finished)
+        self.apply_progress.canceled.connect(self.apply_worker.cancel)
+        QThreadPool.globalInstance().start(self.apply_worker)
+
+    def apply_done(self, apps, count):
+        """
+        Reports the outcome of a bulk apply.
+
+        Args:
+            apps (list): Applications the settings were applied to.
+            count (int): Number of profiles written, None if the apply was cancelled.
+
+        Returns:
+            None
+        """
+        if count is None:
+            self.statusBar().showMessage("Cancelled, no profiles were changed", 5000)
+            return
+        self.statusBar().showMessage(f"Applied to {count} applications", 5000)
+
+        # The confs of the changed profiles are rewritten by the save pipeline
+        self.save_pipeline.request_many(apps)
+
+        # The changes are now part of the shown profile if it was among the selected ones
+        if self.current_app in apps:
+            self.settings_panel.loaded_values = self.settings_panel.values()
+
+    def apply_failed(self, error):
+        """
+        Reports a bulk apply that raised, none of its changes were kept.
+
+        Args:
+            error (str): Traceback of the exception.
+
+        Returns:
+            None
+        """
+        print(error, file=sys.stderr)
+        self.statusBar().showMessage("Applying the settings failed, no profiles were changed", 5000)
+
+    def apply_finished(self):
+        """
+        Re-enables the panels once a bulk apply is over.
+
+        Returns:
+            None
+        """
+        self.apply_worker = None
+        self.apply_progress.close()
+        self.apply_progress.deleteLater()
+        self.apply_progress = None
+        self.app_list_panel.setEnabled(True)
+        self.settings_panel.setEnabled(True)
+        self.selection_count_changed(self.app_list_panel.selection_count())
+
+    def show_preview(self):
+        """
+        Shows the sharpening preview dock, creating it on first use.
+
+        Returns:
+            None
+        """
+        if self.preview_dock is None:
+            from preview_pane import SharpenPreview
+            self.preview_dock = QDockWidget("Sharpening Preview", self)
+            self.preview_dock.setWidget(SharpenPreview())
+            self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.preview_dock)
+        self.preview_dock.show()
+        self.update_preview()
+
+    def update_preview(self):
+        """
+        Shows the sharpening options of the settings panel in the preview, if it is open.
+
+        Returns:
+            None
+        """
+        if self.preview_dock is not None and self.preview_dock.isVisible():
+            from profile_codec import vector_profile
+            self.preview_dock.widget().set_profile(vector_profile(self.settings_panel.values()))
+
+    def closeEvent(self, event):
+        # The scan's signals must outlive its worker, which is still running on the pool
+        self.app_list_panel.cancel_scan()
+        workers = (self.apply_worker, self.log_worker, self.model_worker)
+        if any(worker is not None for worker in workers):
+            for worker in workers:
+                if worker is not None:
+                    worker.cancel()
+            QThreadPool.globalInstance().waitForDone()
+        if self.preview_dock is not None:
+            self.preview_dock.widget().shutdown()
+        if self.save_pipeline is not None:
+            self.save_pipeline.close()
+        if self.profile_store is not None:
+            self.profile_store.close()
+        super().closeEvent(event)
@@ -0,0 +1,352 @@
+"""
+Preview pane that shows the sharpening or the anti-aliasing edges of the selected profile on a
+screenshot.
+
+The sharpening is rendered through image_filters.TileRenderer. Only the tiles in view are
+rendered, on the thread pool, whenever the CAS or DLS options change or the view is scrolled.
+The FXAA and SMAA edges are drawn over the whole screenshot from an edge_masks.EdgePlanes, which
+keeps the planes of the loaded screenshot, so changing a threshold only redoes the comparison.
+"""
+import time
+import numpy as np
+from PyQt6.QtCore import Qt, QThreadPool
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QScrollArea, QFileDialog, QComboBox
+from edge_masks import EdgePlanes, edge_parameters, FXAA_EDGES, SMAA_EDGES
+from image_filters import TileRenderer, preview_filters
+from Settings import SETTINGS_BY_KEY
+from workers import Worker
+
+
+def image_array(image):
+    """
+    Copies a QImage into an RGB array.
+
+    Args:
+        image (QImage): Image to copy.
+
+    Returns:
+        numpy.ndarray: (height, width, 3) uint8 RGB array.
+    """
+    image = image.convertToFormat(QImage.Format.Format_RGB888)
+    width, height = image.width(), image.height()
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, dtype=np.uint8).reshape(height, image.bytesPerLine())
+    return rows[:, :width * 3].reshape(height, width, 3).copy()
+
+
+def render_edges(planes, edges, profile):
+    """
+    Draws the pixels an edge pass processes over a screenshot and counts them for every option.
+
+    Args:
+        planes (EdgePlanes): Planes of the screenshot.
+        edges (str): FXAA_EDGES or SMAA_EDGES.
+        profile (dict): Setting key -> selected option label.
+
+    Returns:
+        tuple: (overlaid RGB array, pixels processed, option counts), see EdgePlanes.option_counts().
+    """
+    mask = planes.mask(edges, edge_parameters(profile)[edges])
+    return planes.overlay(mask), int(np.count_nonzero(mask)), planes.option_counts(edges, profile)
+
+
+class PreviewCanvas(QWidget):
+    """
+    Draws an RGB array, repainting only the exposed area.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pixels = None
+        self.image = None
+
+    def set_pixels(self, pixels):
+        """
+        Shows an RGB array, which is drawn without being copied.
+
+        Args:
+            pixels (numpy.ndarray): (height, width, 3) uint8 C-contiguous RGB array.
+
+        Returns:
+            None
+        """
+        # The array must outlive the QImage drawn from its buffer
+        self.pixels = pixels
+        height, width = pixels.shape[:2]
+        self.image = QImage(pixels.data, width, height, pixels.strides[0], QImage.Format.Format_RGB888)
+        self.setFixedSize(width, height)
+        self.update()
+
+    def paintEvent(self, event):
+        if self.image is None:
+            return
+        painter = QPainter(self)
+        painter.drawImage(event.rect(), self.image, event.rect())
+
+
+class SharpenPreview(QWidget):
+    """
+    Screenshot with the CAS and DLS options of the shown profile applied, or with the pixels
+    its FXAA or SMAA thresholds select as edges highlighted.
+    """
+
+    # Mode label -> edge pass shown, None for the sharpening
+    MODES = {"Sharpening": None, "FXAA Edges": FXAA_EDGES, "SMAA Edges": SMAA_EDGES}
+
+    def __init__(self, parent=None):
+        """
+        Initializes the SharpenPreview widget.
+
+        Args:
+            parent (QWidget): Parent widget.
+
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        self.setLayout(QVBoxLayout())
+
+        # Add button to load a screenshot, the mode selector and a label for the render status
+        controls = QHBoxLayout()
+        self.open_button = QPushButton("Open Screenshot...")
+        self.mode_box = QComboBox()
+        self.mode_box.addItems(self.MODES)
+        self.status_label = QLabel("No screenshot loaded")
+        self.status_label.setWordWrap(True)
+        controls.addWidget(self.open_button)
+        controls.addWidget(self.mode_box)
+        controls.addWidget(self.status_label, 1)
+        self.layout().addLayout(controls)
+
+        # Add the scrollable canvas
+        self.canvas = PreviewCanvas()
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidget(self.canvas)
+        self.scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.layout().addWidget(self.scroll_area)
+
+        # Renderer of the loaded screenshot, the filters of the shown profile, and the render
+        # that is running; a render asked for while one runs starts once it is done
+        self.renderer = None
+        self.filters = ()
+        self.render_worker = None
+        self.render_pending = False
+
+        # Renders run on a pool of their own, so waiting for one doesn't wait for the library
+        # scan or the saves running on the global pool
+        self.render_pool = QThreadPool(self)
+        self.render_pool.setMaxThreadCount(1)
+
+        # Edge planes of the loaded screenshot, the shown profile, and the edge pass and
+        # parameters last drawn
+        self.planes = None
+        self.profile = {}
+        self.edges_shown = None
+
+        # Connect signals to handlers
+        self.open_button.clicked.connect(self.open_screenshot)
+        self.mode_box.currentTextChanged.connect(self.mode_changed)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self.schedule_render)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_render)
+
+    def open_screenshot(self):
+        """
+        Asks for a screenshot and loads it.
+
+        Returns:
+            None
+        """
+        path, _ = QFileDialog.getOpenFileName(self, "Open Screenshot", "", "Images (*.png *.jpg *.jpeg *.bmp *.webp)")
+        if path:
+            self.load_image(path)
+
+    def load_image(self, path):
+        """
+        Loads a screenshot and renders the part in view.
+
+        Args:
+            path (str): Path of the image.
+
+        Returns:
+            bool: True if the image could be loaded.
+        """
+        image = QImage(path)
+        if image.isNull():
+            self.status_label.setText(f"Could not load {path}")
+            return False
+        self.shutdown()
+        self.renderer = TileRenderer(image_array(image))
+        self.planes = EdgePlanes(self.renderer.image)
+        self.edges_shown = None
+        if self.edges() is None:
+            self.canvas.set_pixels(self.renderer.output)
+        self.schedule_render()
+        return True
+
+    def edges(self):
+        """
+        Gets the edge pass the selected mode shows.
+
+        Returns:
+            str: FXAA_EDGES or SMAA_EDGES, None when the sharpening is shown.
+        """
+        return self.MODES[self.mode_box.currentText()]
+
+    def mode_changed(self):
+        """
+        Switches between the sharpening and the edges.
+
+        Returns:
+            None
+        """
+        self.edges_shown = None
+        if self.renderer is not None and self.edges() is None:
+            self.canvas.set_pixels(self.renderer.output)
+        self.schedule_render()
+
+    def set_profile(self, profile):
+        """
+        Shows the sharpening or the edges of a profile.
+
+        Args:
+            profile (dict): Setting key -> selected option label.
+
+        Returns:
+            None
+        """
+        self.profile = profile
+        filters = preview_filters(profile)
+        changed = filters != self.filters
+        self.filters = filters
+        # Edges are only redrawn when their parameters changed, see schedule_edges()
+        if changed or self.edges() is not None:
+            self.schedule_render()
+
+    def visible_area(self):
+        """
+        Gets the part of the screenshot that is in view.
+
+        Returns:
+            tuple: (left, top, width, height) in image pixels.
+        """
+        viewport = self.scroll_area.viewport()
+        position = self.canvas.mapFrom(viewport, viewport.rect().topLeft())
+        return max(position.x(), 0), max(position.y(), 0), viewport.width(), viewport.height()
+
+    def schedule_render(self):
+        """
+        Renders the tiles in view that are missing, or the edges when they changed, in the
+        background.
+
+        Returns:
+            None
+        """
+        if self.renderer is None:
+            return
+        if self.render_worker is not None:
+            self.render_pending = True
+            return
+
+        edges = self.edges()
+        if edges is not None:
+            self.schedule_edges(edges)
+            return
+
+        # Filters only change between renders, the running one reads them
+        if self.renderer.set_filters(self.filters):
+            self.canvas.update()
+        renderer, area, start = self.renderer, self.visible_area(), time.perf_counter()
+        self.render_worker = Worker(lambda worker: renderer.render(*area))
+        self.render_worker.signals.result.connect(lambda tiles: self.render_done(tiles, start))
+        self.render_worker.signals.finished.connect(self.render_finished)
+        self.render_pool.start(self.render_worker)
+
+    def render_done(self, tiles, start):
+        """
+        Shows the newly rendered tiles.
+
+        Args:
+            tiles (int): Number of tiles rendered.
+            start (float): perf_counter() time the render was started at.
+
+        Returns:
+            None
+        """
+        if tiles:
+            names = ", ".join(name.upper() for name, _ in self.filters) or "no sharpening"
+            self.status_label.setText(f"{names}: {tiles} tiles in {(time.perf_counter() - start) * 1000:.0f} ms")
+        self.canvas.update()
+
+    def schedule_edges(self, edges):
+        """
+        Draws the edges of the shown profile in the background unless they are already shown.
+
+        Args:
+            edges (str): FXAA_EDGES or SMAA_EDGES.
+
+        Returns:
+            None
+        """
+        shown = (edges, edge_parameters(self.profile)[edges])
+        if shown == self.edges_shown:
+            return
+        self.edges_shown = shown
+        planes, profile, start = self.planes, self.profile, time.perf_counter()
+        self.render_worker = Worker(lambda worker: render_edges(planes, edges, profile))
+        self.render_worker.signals.result.connect(lambda result: self.edges_done(result, start))
+        self.render_worker.signals.finished.connect(self.render_finished)
+        self.render_pool.start(self.render_worker)
+
+    def edges_done(self, result, start):
+        """
+        Shows the drawn edges and how many pixels every option would process.
+
+        Args:
+            result (tuple): Result of render_edges().
+            start (float): perf_counter() time the render was started at.
+
+        Returns:
+            None
+        """
+        # The mode may have been switched back to the sharpening meanwhile
+        if self.edges() is None or self.planes is None:
+            return
+        pixels, processed, counts = result
+        self.canvas.set_pixels(pixels)
+        total = self.planes.pixels
+        lines = [f"{processed / total:.1%} of {total} pixels processed "
+                 f"({(time.perf_counter() - start) * 1000:.0f} ms)"]
+        for key, rows in counts.items():
+            options = ", ".join(f"{label} {count / total:.1%}" for label, count in rows)
+            lines.append(f"{SETTINGS_BY_KEY[key].title}: {options}")
+        self.status_label.setText("\n".join(lines))
+
+    def render_finished(self):
+        """
+        Starts the render that was asked for while the last one was running.
+
+        Returns:
+            None
+        """
+        self.render_worker = None
+        if self.render_pending:
+            self.render_pending = False
+            self.schedule_render()
+
+    def shutdown(self):
+        """
+        Waits for a running render and stops the render threads.
+
+        Returns:
+            None
+        """
+        if self.render_worker is not None:
+            self.render_pool.waitForDone()
+            self.render_worker = None
+        self.render_pending = False
+        if self.renderer is not None:
+            self.renderer.close()
+            self.renderer = None
+        self.planes = None
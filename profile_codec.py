@@ -0,0 +1,318 @@
+"""
+Compact encoding of settings vectors.
+
+Every setting has a short, fixed list of options, so a settings vector is packed into as few
+bits per setting as its largest option index needs, in registry order: the whole registry fits
+in a handful of bytes. Packed vectors also have a URL-safe text form for sharing profiles,
+which starts with a format version and a fingerprint of the registry layout so a code made
+with a different set of settings is rejected instead of decoded into the wrong options.
+
+A ProfileTable keeps one packed record per distinct profile and a 4 byte record ID per
+application, so thousands of applications sharing one profile cost a single record. The
+profile store's cache and the resolved profiles of the shared layers are held in one.
+
+This module must stay free of any PyQt6 imports, it is shared with the headless tooling.
+"""
+import base64
+import hashlib
+import operator
+from array import array
+
+from Settings import SETTINGS
+
+# Version of the text form, bumped whenever its layout changes
+TEXT_VERSION = 1
+
+# Bytes of the registry fingerprint in the text form
+FINGERPRINT_SIZE = 2
+
+
+def vector_profile(values, settings=SETTINGS):
+    """
+    Turns a settings vector into the profile dict the conf renderers take.
+
+    Args:
+        values (tuple): Option index of every setting, 0 where the setting is unset.
+        settings (tuple): Setting descriptors in vector order.
+
+    Returns:
+        dict: Setting key -> selected option label, for every setting that is set.
+    """
+    return {setting.key: setting.options[value] for setting, value in zip(settings, values) if value}
+
+
+def profile_vector(profile, settings=SETTINGS):
+    """
+    Turns a profile dict into a settings vector.
+
+    Args:
+        profile (dict): Setting key -> selected option label.
+        settings (tuple): Setting descriptors in vector order.
+
+    Returns:
+        tuple: Option index of every setting, 0 where the profile doesn't set it.
+
+    Raises:
+        ValueError: If the profile names an unknown setting or option.
+    """
+    unknown = set(profile).difference(setting.key for setting in settings)
+    if unknown:
+        raise ValueError(f"Unknown setting '{sorted(unknown)[0]}'")
+    return tuple(setting.option_index(profile[setting.key]) if setting.key in profile else 0
+                 for setting in settings)
+
+
+class ProfileCodec:
+    """
+    Packs settings vectors into bytes and text.
+    """
+
+    def __init__(self, settings=SETTINGS):
+        """
+        Initializes the ProfileCodec.
+
+        Args:
+            settings (tuple): Setting descriptors that define the layout of a settings vector.
+
+        Returns:
+            None
+        """
+        self.settings = settings
+        self.counts = tuple(len(setting.options) for setting in settings)
+        self.widths = tuple((count - 1).bit_length() for count in self.counts)
+
+        # Bit offset of every setting in the packed integer
+        self.offsets = []
+        offset = 0
+        for width in self.widths:
+            self.offsets.append(offset)
+            offset += width
+        self.bits = offset
+        self.size = (offset + 7) // 8
+        self.offsets = tuple(self.offsets)
+        self.masks = tuple((1 << width) - 1 for width in self.widths)
+
+        layout = ",".join(f"{setting.key}:{count}" for setting, count in zip(settings, self.counts))
+        self.fingerprint = hashlib.blake2b(layout.encode("utf-8"), digest_size=FINGERPRINT_SIZE).digest()
+
+    def pack(self, values):
+        """
+        Packs a settings vector.
+
+        Args:
+            values (list): Option index of every setting.
+
+        Returns:
+            bytes: Packed vector, size bytes long.
+
+        Raises:
+            ValueError: If the vector has the wrong length or an option index out of range.
+        """
+        if len(values) != len(self.counts):
+            raise ValueError(f"Expected {len(self.counts)} settings, got {len(values)}")
+        # Every index must be below its option count, checked without a Python level loop
+        if min(values) < 0 or max(map(operator.sub, values, self.counts)) >= 0:
+            setting = next(setting for setting, value, count in zip(self.settings, values, self.counts)
+                           if not 0 <= value < count)
+            raise ValueError(f"Option index out of range for setting '{setting.key}'")
+        return sum(map(operator.lshift, values, self.offsets)).to_bytes(self.size, "little")
+
+    def unpack(self, data):
+        """
+        Unpacks a settings vector.
+
+        Args:
+            data (bytes): Packed vector.
+
+        Returns:
+            tuple: Option index of every setting.
+
+        Raises:
+            ValueError: If the data has the wrong size or holds an option index out of range.
+        """
+        if len(data) != self.size:
+            raise ValueError(f"Expected {self.size} bytes, got {len(data)}")
+        packed = int.from_bytes(data, "little")
+        if packed >> self.bits:
+            raise ValueError("Packed vector has bits set past the last setting")
+        values = tuple((packed >> offset) & mask for offset, mask in zip(self.offsets, self.masks))
+        if max(map(operator.sub, values, self.counts)) >= 0:
+            setting = next(setting for setting, value, count in zip(self.settings, values, self.counts)
+                           if value >= count)
+            raise ValueError(f"Option index out of range for setting '{setting.key}'")
+        return values
+
+    def to_text(self, values):
+        """
+        Encodes a settings vector as URL-safe text.
+
+        Args:
+            values (list): Option index of every setting.
+
+        Returns:
+            str: Base64 text without padding.
+        """
+        data = bytes((TEXT_VERSION,)) + self.fingerprint + self.pack(values)
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+    def from_text(self, text):
+        """
+        Decodes a settings vector from its text form.
+
+        Args:
+            text (str): Text made by to_text.
+
+        Returns:
+            tuple: Option index of every setting.
+
+        Raises:
+            ValueError: If the text is malformed or was made for a different set of settings.
+        """
+        code = text.strip()
+        try:
+            # Characters outside the URL-safe alphabet are rejected instead of skipped
+            data = base64.b64decode(code + "=" * (-len(code) % 4), altchars=b"-_", validate=True)
+        except (ValueError, TypeError):
+            raise ValueError(f"Malformed profile code '{text}'") from None
+        if not data:
+            raise ValueError(f"Malformed profile code '{text}'")
+        if data[0] != TEXT_VERSION:
+            raise ValueError(f"Unsupported profile code version in '{text}'")
+        if data[1:1 + FINGERPRINT_SIZE] != self.fingerprint:
+            raise ValueError(f"Profile code '{text}' was made for a different set of settings")
+        return self.unpack(data[1 + FINGERPRINT_SIZE:])
+
+
+class ProfileTable:
+    """
+    Settings vectors of many applications, with identical vectors stored once.
+
+    Applications are identified by row, e.g. their row in an AppCatalog. Record 0 is the
+    vector with every setting unset, which rows hold until they are given a profile.
+    """
+
+    def __init__(self, codec=None):
+        """
+        Initializes the ProfileTable.
+
+        Args:
+            codec (ProfileCodec): Codec of the vectors, one over the Settings registry if None.
+
+        Returns:
+            None
+        """
+        self.codec = codec if codec is not None else ProfileCodec()
+        empty = self.codec.pack((0,) * len(self.codec.counts))
+
+        # Packed vector of every record and the number of rows holding it, the record of every
+        # packed vector, and record IDs freed for reuse
+        self.records = [empty]
+        self.references = array("I", [0])
+        self._record_of = {empty: 0}
+        self._free = []
+
+        # Record ID of every row, and vectors decoded so far by record ID
+        self.ids = array("I")
+        self._decoded = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def distinct(self):
+        """
+        Counts the distinct profiles held by at least one row.
+
+        Returns:
+            int: Number of live records, the empty profile included.
+        """
+        return len(self._record_of)
+
+    def _intern(self, values):
+        # Record of a settings vector, adding one if no row holds that vector yet; the caller
+        # takes the reference, so a new record is never left without one
+        packed = self.codec.pack(values)
+        record = self._record_of.get(packed)
+        if record is not None:
+            return record
+        if self._free:
+            record = self._free.pop()
+            self.records[record] = packed
+        else:
+            record = len(self.records)
+            self.records.append(packed)
+            self.references.append(0)
+        self._record_of[packed] = record
+        return record
+
+    def set(self, row, values):
+        """
+        Sets the settings vector of a row, growing the table if needed.
+
+        Args:
+            row (int): Row of the application.
+            values (list): Option index of every setting.
+
+        Returns:
+            int: Record ID now held by the row.
+        """
+        if row >= len(self.ids):
+            self.ids.frombytes(bytes(self.ids.itemsize * (row + 1 - len(self.ids))))
+        return self._assign(row, self._intern(values))
+
+    def _assign(self, row, record):
+        # Points a row at a record, moving its reference over from the record it held before
+        old = self.ids[row]
+        if old == record:
+            return record
+        self.ids[row] = record
+        if record:
+            self.references[record] += 1
+        if old:
+            self.references[old] -= 1
+            if not self.references[old]:
+                # Nothing holds the old vector any more, its record can be reused
+                del self._record_of[self.records[old]]
+                self._decoded.pop(old, None)
+                self._free.append(old)
+        return record
+
+    def clear(self, row):
+        """
+        Releases the profile of a row, which then holds the empty profile again.
+
+        Args:
+            row (int): Row of the application.
+
+        Returns:
+            None
+        """
+        if row < len(self.ids):
+            self._assign(row, 0)
+
+    def get(self, row):
+        """
+        Gets the settings vector of a row.
+
+        Args:
+            row (int): Row of the application.
+
+        Returns:
+            tuple: Option index of every setting, all 0 for rows without a profile.
+        """
+        record = self.ids[row] if row < len(self.ids) else 0
+        values = self._decoded.get(record)
+        if values is None:
+            values = self._decoded[record] = self.codec.unpack(self.records[record])
+        return values
+
+    def text(self, row):
+        """
+        Gets the text form of the settings vector of a row, see ProfileCodec.to_text.
+
+        Args:
+            row (int): Row of the application.
+
+        Returns:
+            str: Base64 text of the vector.
+        """
+        return self.codec.to_text(self.get(row))
@@ -0,0 +1,234 @@
+"""
+Layered profiles: global defaults, then an API family layer, then the per-application profile.
+
+Every layer is a settings vector in registry order where option index 0 (the "Select
+Option..." placeholder) means "inherit from the layer below". The resolved profile of an
+application takes every setting from the first layer that sets it, looking at the
+application's own profile first, then the layer of its API family (FAMILY_D3D9 or
+FAMILY_D3D11, when known) and finally the global layer.
+
+Resolved profiles are memoized in a ProfileTable (see profile_codec.py), so the many
+applications that resolve to the same profile share one record of it. For every family and
+setting, a flag array marks the cached applications that inherit that setting, so changing a
+setting of a shared layer re-resolves only the applications that read it from that layer
+instead of every cached application.
+
+This module must stay free of any PyQt6 imports, it is shared with the headless tooling.
+"""
+from itertools import compress
+
+from profile_codec import ProfileCodec, ProfileTable
+
+GLOBAL_LAYER = "global"
+FAMILY_D3D9 = "d3d9"
+FAMILY_D3D11 = "d3d11"
+FAMILIES = (FAMILY_D3D9, FAMILY_D3D11)
+
+# Names the layers and families are shown with
+LAYER_TITLES = {GLOBAL_LAYER: "Global Defaults", FAMILY_D3D9: "D3D9 Defaults", FAMILY_D3D11: "D3D11 Defaults"}
+FAMILY_TITLES = {FAMILY_D3D9: "D3D9", FAMILY_D3D11: "D3D11"}
+
+
+class LayeredProfiles:
+    """
+    Memoized resolution of per-application profiles on top of the shared layers of a
+    ProfileStore.
+    """
+
+    def __init__(self, store):
+        """
+        Loads the shared layers and the API families from a profile store.
+
+        Args:
+            store (ProfileStore): Store holding the layers, families and per-application profiles.
+
+        Returns:
+            None
+        """
+        self.store = store
+        self.size = len(store.schema.split(","))
+        self.layers = {name: store.get_layer(name) or (0,) * self.size for name in (GLOBAL_LAYER, *FAMILIES)}
+        self.family_of = store.families()
+
+        # Slot of every application that has been resolved, and its resolved profile by slot
+        self._slot = {}
+        self._apps = []
+        self._resolved = ProfileTable(ProfileCodec(store.settings))
+
+        # Family (None for apps without one) -> setting ID -> flag per slot, set while the
+        # cached app inherits that setting
+        self._inherits = {family: [bytearray() for _ in range(self.size)] for family in (None, *FAMILIES)}
+
+        # Number of profiles resolved so far, for measuring how much work a change caused
+        self.resolutions = 0
+
+    def __len__(self):
+        return len(self._slot)
+
+    def _resolve_slot(self, slot, own):
+        # Resolves the app in a slot and records which settings it inherits
+        family = self.family_of.get(self._apps[slot])
+        family_layer = self.layers[family] if family is not None else self.layers[GLOBAL_LAYER]
+        global_layer = self.layers[GLOBAL_LAYER]
+        resolved = tuple(value or family_value or global_value
+                         for value, family_value, global_value in zip(own, family_layer, global_layer))
+        self._resolved.set(slot, resolved)
+        for family_flags in self._inherits.values():
+            for flags in family_flags:
+                flags[slot] = 0
+        flags = self._inherits[family]
+        for setting_id, value in enumerate(own):
+            if not value:
+                flags[setting_id][slot] = 1
+        self.resolutions += 1
+        return resolved
+
+    def _own(self, app):
+        # Per-application overrides, every setting inherited if the app has no profile
+        return self.store.get(app) or (0,) * self.size
+
+    def resolve(self, app):
+        """
+        Gets the resolved profile of an application.
+
+        Args:
+            app (str): Path identifying the application.
+
+        Returns:
+            tuple: Option index of every setting, 0 only where no layer sets the setting.
+        """
+        slot = self._slot.get(app)
+        if slot is not None:
+            return self._resolved.get(slot)
+
+        slot = self._slot[app] = len(self._apps)
+        self._apps.append(app)
+        for family_flags in self._inherits.values():
+            for flags in family_flags:
+                flags.append(0)
+        return self._resolve_slot(slot, self._own(app))
+
+    def layer(self, name):
+        """
+        Gets the settings vector of a shared layer.
+
+        Args:
+            name (str): GLOBAL_LAYER or one of FAMILIES.
+
+        Returns:
+            tuple: Option index of every setting, 0 where the layer inherits.
+        """
+        return self.layers[name]
+
+    def set_layer(self, name, values):
+        """
+        Changes a shared layer and re-resolves the cached applications that inherit a changed
+        setting from it.
+
+        Args:
+            name (str): GLOBAL_LAYER or one of FAMILIES.
+            values (list): Option index of every setting, 0 to inherit.
+
+        Returns:
+            list: Applications re-resolved, whose resolved profile may have changed.
+        """
+        values = tuple(values)
+        old = self.layers[name]
+        changed = [setting_id for setting_id, (before, after) in enumerate(zip(old, values)) if before != after]
+        self.store.put_layer(name, values)
+        self.layers[name] = values
+        if not changed:
+            return []
+
+        # A global setting reaches an app through every family layer that doesn't set it
+        if name == GLOBAL_LAYER:
+            sources = [(family, setting_id) for family in self._inherits for setting_id in changed
+                       if family is None or not self.layers[family][setting_id]]
+        else:
+            sources = [(name, setting_id) for setting_id in changed]
+
+        affected = set()
+        slots = range(len(self._apps))
+        for family, setting_id in sources:
+            affected.update(compress(slots, self._inherits[family][setting_id]))
+        for slot in affected:
+            self._resolve_slot(slot, self._own(self._apps[slot]))
+        return [self._apps[slot] for slot in sorted(affected)]
+
+    def family(self, app):
+        """
+        Gets the API family of an application.
+
+        Args:
+            app (str): Path identifying the application.
+
+        Returns:
+            str: One of FAMILIES, None if unknown.
+        """
+        return self.family_of.get(app)
+
+    def set_family(self, app, family):
+        """
+        Changes the API family of an application.
+
+        Args:
+            app (str): Path identifying the application.
+            family (str): One of FAMILIES, None if unknown.
+
+        Returns:
+            None
+        """
+        if family is not None and family not in FAMILIES:
+            raise ValueError(f"Unknown API family '{family}'")
+        self.store.set_family(app, family)
+        if family is None:
+            self.family_of.pop(app, None)
+        else:
+            self.family_of[app] = family
+        self.invalidate(app)
+
+    def set_app(self, app, values):
+        """
+        Stores the overrides of an application and re-resolves it.
+
+        Args:
+            app (str): Path identifying the application.
+            values (list): Option index of every setting, 0 to inherit.
+
+        Returns:
+            tuple: Resolved profile of the application.
+        """
+        self.store.put(app, values)
+        self.invalidate(app)
+        return self.resolve(app)
+
+    def set_apps(self, items):
+        """
+        Stores the overrides of many applications in one transaction and re-resolves them.
+
+        Args:
+            items (iterable): (app, values) pairs.
+
+        Returns:
+            int: Number of applications stored.
+        """
+        items = list(items)
+        self.store.put_many(items)
+        for app, _ in items:
+            self.invalidate(app)
+        return len(items)
+
+    def invalidate(self, app):
+        """
+        Re-resolves a cached application after its own profile or family changed outside of
+        this object.
+
+        Args:
+            app (str): Path identifying the application.
+
+        Returns:
+            None
+        """
+        slot = self._slot.get(app)
+        if slot is not None:
+            self._resolve_slot(slot, self._own(app))
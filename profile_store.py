@@ -0,0 +1,440 @@
+"""
+Persistent per-application profile store.
+
+Profiles live in a SQLite database in WAL mode, one row per application holding its settings
+vector: the selected option index of every setting of the registry, one byte per setting, in
+registry order. Writes can be grouped into a single transaction, and recently used profiles
+are kept in an in-memory LRU so switching between applications doesn't touch the disk. The LRU
+holds its profiles in a ProfileTable (see profile_codec.py), so applications sharing a profile
+share one record of it.
+The store also holds the shared profile layers and the API family of every application, see
+profile_layers.py, and the frametime statistics measured with each profile, see
+frametime_log.py.
+
+This module must stay free of any PyQt6 imports, it is shared with the headless tooling.
+"""
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from app_paths import data_dir
+from profile_codec import ProfileCodec, ProfileTable
+from Settings import SETTINGS
+
+PROFILE_FILE = "profiles.sqlite3"
+
+
+def default_store_path():
+    """
+    Gets the path of the profile store used by the GUI.
+
+    Returns:
+        str: Path of the database in the data directory.
+    """
+    return os.path.join(data_dir(), PROFILE_FILE)
+
+
+class _UpdateCancelled(Exception):
+    # Raised to undo an update that was cancelled
+    pass
+
+
+class ProfileStore:
+    """
+    SQLite backed store of settings vectors keyed by application.
+
+    The store may be shared between threads, every access goes through one lock.
+    """
+
+    def __init__(self, path, cache_size=4096, settings=SETTINGS):
+        """
+        Opens or creates a profile store.
+
+        Args:
+            path (str): Path of the database, ":memory:" for a throwaway store.
+            cache_size (int): Number of decoded profiles kept in memory.
+            settings (tuple): Setting descriptors that define the layout of a settings vector.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self.settings = settings
+        self.schema = ",".join(setting.key for setting in settings)
+
+        # Cached app -> its row in the profile table, most recently used last, and the rows
+        # freed by evictions
+        self._cache = OrderedDict()
+        self._profiles = ProfileTable(ProfileCodec(settings))
+        self._free_rows = []
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+
+        # Transactions are managed by hand so a batch of writes is one transaction
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS profiles (app TEXT PRIMARY KEY, settings BLOB NOT NULL) WITHOUT ROWID")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS layers (name TEXT PRIMARY KEY, settings BLOB NOT NULL)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS families (app TEXT PRIMARY KEY, family TEXT NOT NULL) WITHOUT ROWID")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS frametime_runs (app TEXT NOT NULL, log TEXT NOT NULL, "
+                                "settings BLOB NOT NULL, recorded REAL NOT NULL, stats TEXT NOT NULL, "
+                                "PRIMARY KEY (app, log)) WITHOUT ROWID")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._migrate()
+
+    def _migrate(self):
+        # Rewrites the stored vectors if settings were added, removed or reordered
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        if row is not None and row[0] == self.schema:
+            return
+        with self.batch():
+            if row is not None:
+                old_positions = {key: position for position, key in enumerate(row[0].split(","))}
+                layout = [old_positions.get(key) for key in self.schema.split(",")]
+                for table, key in (("profiles", "app"), ("layers", "name"), ("frametime_runs", "app || char(0) || log")):
+                    rows = self.connection.execute(f"SELECT {key}, settings FROM {table}").fetchall()
+                    self.connection.executemany(
+                        f"UPDATE {table} SET settings = ? WHERE {key} = ?",
+                        [(bytes(0 if position is None or position >= len(vector) else vector[position]
+                                for position in layout), name) for name, vector in rows])
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)", (self.schema,))
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def __contains__(self, app):
+        return self.get(app) is not None
+
+    def close(self):
+        """
+        Closes the database.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.connection.close()
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups every write made inside the block into one transaction, which is rolled back if
+        the block raises. Batches may be nested, only the outermost one commits.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._batch_depth == 0:
+                self.connection.execute("BEGIN IMMEDIATE")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.connection.execute("ROLLBACK")
+                    # Cached profiles may hold writes that were just rolled back
+                    self._forget_all()
+                raise
+            else:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.connection.execute("COMMIT")
+
+    def _remember(self, app, values):
+        row = self._cache.get(app)
+        new = row is None
+        if new:
+            row = self._free_rows.pop() if self._free_rows else len(self._cache)
+        try:
+            self._profiles.set(row, values)
+        except ValueError:
+            # A vector the codec can't hold, e.g. one written with more options than a setting
+            # has now, is read from the database every time instead
+            if new:
+                self._free_rows.append(row)
+            else:
+                self._forget(app)
+            return
+        self._cache[app] = row
+        self._cache.move_to_end(app)
+        if len(self._cache) > self.cache_size:
+            self._forget(next(iter(self._cache)))
+
+    def _forget(self, app):
+        row = self._cache.pop(app, None)
+        if row is not None:
+            self._profiles.clear(row)
+            self._free_rows.append(row)
+
+    def _forget_all(self):
+        self._cache.clear()
+        self._profiles = ProfileTable(self._profiles.codec)
+        self._free_rows = []
+
+    def get(self, app):
+        """
+        Gets the settings vector of an application.
+
+        Args:
+            app (str): Path identifying the application.
+
+        Returns:
+            tuple: Option index of every setting, None if the application has no profile.
+        """
+        with self._lock:
+            cached = self._cache.get(app)
+            if cached is not None:
+                self._cache.move_to_end(app)
+                return self._profiles.get(cached)
+            row = self.connection.execute("SELECT settings FROM profiles WHERE app = ?", (app,)).fetchone()
+            if row is None:
+                return None
+            values = tuple(row[0])
+            self._remember(app, values)
+            return values
+
+    def put(self, app, values):
+        """
+        Stores the settings vector of an application.
+
+        Args:
+            app (str): Path identifying the application.
+            values (list): Option index of every setting.
+
+        Returns:
+            None
+        """
+        self.put_many(((app, values),))
+
+    def put_many(self, items):
+        """
+        Stores the settings vectors of many applications in a single transaction.
+
+        Args:
+            items (iterable): (app, values) pairs.
+
+        Returns:
+            int: Number of profiles written.
+        """
+        with self.batch():
+            rows = [(app, bytes(values)) for app, values in items]
+            self.connection.executemany("INSERT OR REPLACE INTO profiles (app, settings) VALUES (?, ?)", rows)
+            for app, vector in rows:
+                self._remember(app, tuple(vector))
+        return len(rows)
+
+    def update_many(self, apps, changes, on_progress=None, cancelled=None, chunk_size=512):
+        """
+        Changes some settings of many applications, leaving their other settings as they are.
+        Applications without a profile get one with every other setting unset. Every chunk is
+        a transaction of its own, so other threads only wait for one chunk to get at the
+        store; if the update is cancelled or raises, the chunks already committed are undone.
+
+        Args:
+            apps (list): Paths identifying the applications.
+            changes (dict): Setting ID -> option index to select.
+            on_progress (callable): Called with (applications done, applications in total)
+                after every chunk.
+            cancelled (callable): Returns True once the update should stop; every change
+                made so far is then undone.
+            chunk_size (int): Number of applications written between progress reports and
+                cancellation checks.
+
+        Returns:
+            int: Number of profiles written, None if the update was cancelled.
+        """
+        size = len(self.schema.split(","))
+        changes = sorted(changes.items())
+        # App -> its vector before the update, None if it had no profile
+        previous = {}
+        try:
+            for start in range(0, len(apps), chunk_size):
+                if cancelled is not None and cancelled():
+                    raise _UpdateCancelled()
+                with self.batch():
+                    rows = []
+                    for app in apps[start:start + chunk_size]:
+                        values = self.get(app)
+                        previous.setdefault(app, values)
+                        values = list(values or (0,) * size)
+                        for setting_id, option in changes:
+                            values[setting_id] = option
+                        rows.append((app, values))
+                    self.put_many(rows)
+                if on_progress is not None:
+                    on_progress(start + len(rows), len(apps))
+        except BaseException as error:
+            self._restore(list(previous.items()), chunk_size)
+            if isinstance(error, _UpdateCancelled):
+                return None
+            raise
+        return len(apps)
+
+    def _restore(self, previous, chunk_size):
+        # Puts back the profiles an unfinished update_many() changed, a chunk at a time
+        for start in range(0, len(previous), chunk_size):
+            with self.batch():
+                chunk = previous[start:start + chunk_size]
+                self.put_many((app, values) for app, values in chunk if values is not None)
+                removed = [(app,) for app, values in chunk if values is None]
+                self.connection.executemany("DELETE FROM profiles WHERE app = ?", removed)
+                for (app,) in removed:
+                    self._forget(app)
+
+    def delete(self, app):
+        """
+        Removes the profile of an application.
+
+        Args:
+            app (str): Path identifying the application.
+
+        Returns:
+            None
+        """
+        with self.batch():
+            self.connection.execute("DELETE FROM profiles WHERE app = ?", (app,))
+            self._forget(app)
+
+    def items(self):
+        """
+        Gets every stored profile.
+
+        Returns:
+            list: (app, values) pairs ordered by app.
+        """
+        with self._lock:
+            rows = self.connection.execute("SELECT app, settings FROM profiles ORDER BY app").fetchall()
+        return [(app, tuple(vector)) for app, vector in rows]
+
+    def apps(self):
+        """
+        Gets the applications that have a stored profile, without decoding their vectors.
+
+        Returns:
+            list: Paths identifying the applications, ordered by app.
+        """
+        with self._lock:
+            return [row[0] for row in self.connection.execute("SELECT app FROM profiles ORDER BY app")]
+
+    def get_layer(self, name):
+        """
+        Gets the settings vector of a shared profile layer.
+
+        Args:
+            name (str): Name of the layer.
+
+        Returns:
+            tuple: Option index of every setting, None if the layer has never been stored.
+        """
+        with self._lock:
+            row = self.connection.execute("SELECT settings FROM layers WHERE name = ?", (name,)).fetchone()
+        return None if row is None else tuple(row[0])
+
+    def put_layer(self, name, values):
+        """
+        Stores the settings vector of a shared profile layer.
+
+        Args:
+            name (str): Name of the layer.
+            values (list): Option index of every setting.
+
+        Returns:
+            None
+        """
+        with self.batch():
+            self.connection.execute("INSERT OR REPLACE INTO layers (name, settings) VALUES (?, ?)",
+                                    (name, bytes(values)))
+
+    def families(self):
+        """
+        Gets the API family of every application that has one.
+
+        Returns:
+            dict: App -> family name.
+        """
+        with self._lock:
+            return dict(self.connection.execute("SELECT app, family FROM families").fetchall())
+
+    def family(self, app):
+        """
+        Gets the API family of an application.
+
+        Args:
+            app (str): Path identifying the application.
+
+        Returns:
+            str: Name of the family, None if it has none.
+        """
+        with self._lock:
+            row = self.connection.execute("SELECT family FROM families WHERE app = ?", (app,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_family(self, app, family):
+        """
+        Stores the API family of an application.
+
+        Args:
+            app (str): Path identifying the application.
+            family (str): Name of the family, None to remove it.
+
+        Returns:
+            None
+        """
+        with self.batch():
+            if family is None:
+                self.connection.execute("DELETE FROM families WHERE app = ?", (app,))
+            else:
+                self.connection.execute("INSERT OR REPLACE INTO families (app, family) VALUES (?, ?)", (app, family))
+
+    def put_run(self, app, log, values, recorded, stats):
+        """
+        Stores the frametime statistics of a log recorded with a profile, replacing the ones
+        stored for the same log before.
+
+        Args:
+            app (str): Path identifying the application.
+            log (str): Path of the frametime log.
+            values (list): Option index of every setting of the profile the log was recorded with.
+            recorded (float): Time the log was recorded at, in seconds since the epoch.
+            stats (dict): JSON serializable statistics of the log.
+
+        Returns:
+            None
+        """
+        with self.batch():
+            self.connection.execute("INSERT OR REPLACE INTO frametime_runs (app, log, settings, recorded, stats) "
+                                    "VALUES (?, ?, ?, ?, ?)", (app, log, bytes(values), recorded, json.dumps(stats)))
+
+    def runs(self, app):
+        """
+        Gets the frametime statistics stored for an application.
+
+        Args:
+            app (str): Path identifying the application.
+
+        Returns:
+            list: (log, values, recorded, stats) tuples ordered by the time they were recorded at.
+        """
+        with self._lock:
+            rows = self.connection.execute("SELECT log, settings, recorded, stats FROM frametime_runs "
+                                           "WHERE app = ? ORDER BY recorded", (app,)).fetchall()
+        return [(log, tuple(vector), recorded, json.loads(stats)) for log, vector, recorded, stats in rows]
+
+    def all_runs(self):
+        """
+        Gets the frametime statistics stored for every application.
+
+        Returns:
+            list: (app, log, values, recorded, stats) tuples.
+        """
+        with self._lock:
+            rows = self.connection.execute("SELECT app, log, settings, recorded, stats FROM frametime_runs").fetchall()
+        return [(app, log, tuple(vector), recorded, json.loads(stats)) for app, log, vector, recorded, stats in rows]
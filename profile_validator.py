@@ -0,0 +1,255 @@
+"""
+Fleet-wide validation of stored and imported profiles.
+
+The settings panel only lets a setting be changed while its `requires` constraints hold, but
+profiles written by the importer, by bulk edits or by hand never went through the panel. This
+module loads any number of profiles as an (apps x settings) uint8 matrix and checks every
+constraint against whole columns at once, so a million profiles are checked with a few dozen
+array operations instead of a Python loop per profile.
+
+A profile violates a constraint when it sets a setting (option index other than 0) while one of
+the conditions the setting requires doesn't hold, e.g. both VSync variants on, or an FXAA
+sub-option set while FXAA isn't enabled. The suggested fix is to unset the setting that may not
+be used, keeping the setting it conflicts with.
+
+Usage:
+    python -m profile_validator [MANIFEST] [--fix] [-o FIXED_MANIFEST] [--limit N]
+
+Without a manifest the profile store of the GUI is validated, and --fix writes the fixed
+profiles back to it. A manifest is validated in the conf_compiler format and its fixed copy is
+written to FIXED_MANIFEST. This module must stay free of any PyQt6 imports.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from profile_codec import ProfileCodec, profile_vector, vector_profile
+from Settings import SETTINGS, DependencyGraph
+
+
+class ProfileValidator:
+    """
+    Constraints of the settings registry compiled into lookup tables over option indices.
+    """
+
+    def __init__(self, settings=SETTINGS):
+        """
+        Compiles the constraints of the given settings.
+
+        Args:
+            settings (tuple): Setting descriptors, the position of a setting is its column.
+
+        Returns:
+            None
+        """
+        self.settings = settings
+        self.counts = np.array([len(setting.options) for setting in settings], dtype=np.uint8)
+        graph = DependencyGraph(settings)
+
+        # (target ID, source ID, table) for every condition, where table[option] tells whether
+        # the source having that option lets the target be set. Targets are checked from the
+        # last one up so a fix keeps the earlier setting of a mutually exclusive pair.
+        self.constraints = []
+        for target in reversed(range(len(settings))):
+            for source, allowed in graph.conditions[target]:
+                table = np.zeros(256, dtype=bool)
+                table[sorted(allowed)] = True
+                self.constraints.append((target, source, table))
+
+    def matrix(self, vectors):
+        """
+        Builds the matrix of a list of settings vectors.
+
+        Args:
+            vectors (iterable): Settings vectors, tuples or the bytes of a stored profile.
+
+        Returns:
+            numpy.ndarray: (apps x settings) uint8 matrix.
+        """
+        data = b"".join(bytes(vector) for vector in vectors)
+        return np.frombuffer(data, dtype=np.uint8).reshape(-1, len(self.settings))
+
+    def out_of_range(self, matrix):
+        """
+        Finds option indices past the options of their setting.
+
+        Args:
+            matrix (numpy.ndarray): (apps x settings) uint8 matrix.
+
+        Returns:
+            numpy.ndarray: (apps x settings) bool mask of the invalid cells.
+        """
+        return matrix >= self.counts
+
+    def check(self, matrix):
+        """
+        Finds the profiles violating each constraint.
+
+        Args:
+            matrix (numpy.ndarray): (apps x settings) uint8 matrix.
+
+        Returns:
+            list: (target ID, source ID, rows) for every constraint with violations, rows being
+                the indices of the violating profiles.
+        """
+        violations = []
+        for target, source, table in self.constraints:
+            rows = np.flatnonzero((matrix[:, target] != 0) & ~table[matrix[:, source]])
+            if rows.size:
+                violations.append((target, source, rows))
+        return violations
+
+    def fix(self, matrix):
+        """
+        Unsets every setting that violates a constraint, as well as out of range options, until
+        every profile is valid.
+
+        Args:
+            matrix (numpy.ndarray): (apps x settings) uint8 matrix, left untouched.
+
+        Returns:
+            tuple: (fixed matrix, bool mask of the rows that were changed).
+        """
+        fixed = matrix.copy()
+        fixed[self.out_of_range(fixed)] = 0
+        # Unsetting a setting can break the conditions of the settings that require it to be
+        # set, so passes are repeated until nothing changes
+        for _ in range(len(self.settings) + 1):
+            changed = False
+            for target, source, table in self.constraints:
+                rows = (fixed[:, target] != 0) & ~table[fixed[:, source]]
+                if rows.any():
+                    fixed[rows, target] = 0
+                    changed = True
+            if not changed:
+                break
+        return fixed, (fixed != matrix).any(axis=1)
+
+    def describe(self, matrix, fixed, row, target, source):
+        """
+        Describes a violation and its suggested fix.
+
+        Args:
+            matrix (numpy.ndarray): (apps x settings) uint8 matrix.
+            fixed (numpy.ndarray): Matrix returned by fix().
+            row (int): Row of the violating profile.
+            target (int): ID of the setting that may not be set.
+            source (int): ID of the setting whose option forbids it.
+
+        Returns:
+            str: Human readable description.
+        """
+        target_setting, source_setting = self.settings[target], self.settings[source]
+        target_label = target_setting.options[matrix[row, target]]
+        source_label = source_setting.options[matrix[row, source]]
+        # Of a mutually exclusive pair the fix unsets only one, which settles both violations
+        reset = target_setting if fixed[row, target] == 0 else source_setting
+        return (f"{target_setting.title} is '{target_label}' while {source_setting.title} is "
+                f"'{source_label}'; suggested fix: reset {reset.title}")
+
+    def report(self, matrix, fixed, apps, limit=20):
+        """
+        Builds a text report of every violation.
+
+        Args:
+            matrix (numpy.ndarray): (apps x settings) uint8 matrix.
+            fixed (numpy.ndarray): Matrix returned by fix().
+            apps (list): Name of the application of every row.
+            limit (int): Number of violating applications listed per constraint.
+
+        Returns:
+            list: Lines of the report.
+        """
+        lines = []
+        invalid = np.flatnonzero(self.out_of_range(matrix).any(axis=1))
+        if invalid.size:
+            lines.append(f"{invalid.size} profiles hold options that don't exist; suggested fix: reset them")
+            lines.extend(f"    {apps[row]}" for row in invalid[:limit])
+        for target, source, rows in self.check(matrix):
+            lines.append(f"{self.settings[target].key} requires {self.settings[source].key}: {rows.size} profiles")
+            lines.extend(f"    {apps[row]}: {self.describe(matrix, fixed, row, target, source)}" for row in rows[:limit])
+            if rows.size > limit:
+                lines.append(f"    ... and {rows.size - limit} more")
+        return lines
+
+
+def load_manifest(path, codec=None):
+    """
+    Loads the profiles of a conf_compiler manifest as settings vectors.
+
+    Args:
+        path (str): Path of the manifest.
+        codec (ProfileCodec): Codec for the profile codes, one over the registry if None.
+
+    Returns:
+        tuple: (apps, vectors, failures) lists; failures holds an (app, message) pair for every
+            profile naming an unknown setting, option or profile code, which is left out.
+    """
+    codec = codec if codec is not None else ProfileCodec()
+    with open(path) as file:
+        manifest = json.load(file)
+    apps, vectors, failures = [], [], []
+    for app, profile in manifest.get("apps", {}).items():
+        try:
+            vector = codec.from_text(profile) if isinstance(profile, str) else profile_vector(profile)
+        except ValueError as error:
+            failures.append((app, str(error)))
+            continue
+        apps.append(app)
+        vectors.append(vector)
+    return apps, vectors, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m profile_validator",
+                                     description="Check stored or imported profiles against the setting constraints.")
+    parser.add_argument("manifest", nargs="?", default=None, help="JSON profile manifest (default: the profile store)")
+    parser.add_argument("--fix", action="store_true", help="unset the settings that violate a constraint")
+    parser.add_argument("-o", "--output", default=None, help="where to write the fixed manifest")
+    parser.add_argument("--limit", type=int, default=20, help="applications listed per constraint (default: 20)")
+    args = parser.parse_args(argv)
+    if args.manifest is not None and args.fix and args.output is None:
+        parser.error("--fix needs -o when validating a manifest")
+
+    validator = ProfileValidator()
+    store = None
+    failures = []
+    if args.manifest is None:
+        from profile_store import ProfileStore, default_store_path
+        store = ProfileStore(default_store_path())
+        rows = store.items()
+        apps = [app for app, _ in rows]
+        matrix = validator.matrix(vector for _, vector in rows)
+    else:
+        apps, vectors, failures = load_manifest(args.manifest)
+        matrix = validator.matrix(vectors)
+
+    start = time.perf_counter()
+    fixed, changed = validator.fix(matrix)
+    lines = validator.report(matrix, fixed, apps, args.limit)
+    elapsed = time.perf_counter() - start
+    for app, error in failures:
+        print(f"{app}: {error}", file=sys.stderr)
+    for line in lines:
+        print(line)
+    print(f"Checked {len(apps)} profiles in {elapsed:.3f}s, {int(changed.sum())} need fixing")
+
+    if args.fix:
+        fixed_rows = np.flatnonzero(changed)
+        if store is not None:
+            store.put_many((apps[row], fixed[row].tobytes()) for row in fixed_rows)
+        else:
+            with open(args.output, "w") as file:
+                json.dump({"apps": {app: vector_profile(vector) for app, vector in zip(apps, fixed.tolist())}},
+                          file, indent=4)
+        print(f"Fixed {fixed_rows.size} profiles")
+    if store is not None:
+        store.close()
+    return 1 if failures or (changed.any() and not args.fix) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
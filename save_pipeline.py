@@ -0,0 +1,374 @@
+"""
+Background save pipeline of the GUI.
+
+Saving a profile stores it in the profile store and writes the application's vkBasalt.conf and
+dxvk.conf, resolved through the shared profile layers, along with its launch wrapper. Saves are
+not written right away: repeated saves of the same application within the debounce delay are
+coalesced into one write of the latest values, and the saves of every application pending when
+the delay runs out are written together, in one store transaction, on a pool thread. Changes
+to a shared layer or to the API family of an application go through the same batches, and
+rewrite the confs of every application whose resolved profile they change. The time from a
+save request to its confs being on disk is recorded and reported as percentiles.
+"""
+import os
+import sys
+import time
+from collections import deque
+from PyQt6.QtCore import QObject, QTimer, QThreadPool, pyqtSignal
+
+from app_paths import cache_dir
+from conf_compiler import conf_paths
+from conf_render import render_dxvk, render_vkbasalt
+from conf_writer import ConfWriter, load_hashes, save_hashes, FAILED, HASHES_FILE
+from launch_wrappers import default_conf_root, write_wrapper
+from profile_codec import vector_profile
+from profile_layers import LayeredProfiles
+from Settings import VKBASALT, DXVK
+from workers import Worker
+
+# Percentiles of the save latency that are reported
+PERCENTILES = (50, 95, 99)
+
+
+def percentiles(samples, points=PERCENTILES):
+    """
+    Computes nearest-rank percentiles.
+
+    Args:
+        samples (iterable): Measured values.
+        points (tuple): Percentiles to compute, between 0 and 100.
+
+    Returns:
+        dict: Percentile -> value, empty if there are no samples.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    return {point: ordered[min(len(ordered) - 1, max(0, -(-point * len(ordered) // 100) - 1))] for point in points}
+
+
+class SavePipeline(QObject):
+    """
+    Debounces, coalesces and batches profile saves and writes them on a pool thread.
+
+    Signals:
+        saved(int): Number of applications written by a finished batch.
+        failed(str): Traceback of a batch that raised, or the files a batch failed to write.
+    """
+
+    saved = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, store, root=None, delay=200, max_delay=1000, history=1024, parent=None):
+        """
+        Initializes the SavePipeline.
+
+        Args:
+            store (ProfileStore): Store the profiles are saved to.
+            root (str): Directory the confs are written to, see default_conf_root().
+            delay (int): Milliseconds without a new save before pending saves are written.
+            max_delay (int): Longest a save waits while new saves keep coming, in milliseconds.
+            history (int): Number of save latencies kept for the percentiles.
+            parent (QObject): Parent object.
+
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        self.store = store
+        self.root = root if root is not None else default_conf_root()
+        self.delay = delay
+        self.max_delay = max_delay
+
+        # Layers and conf writer are only used by the batch that is running, one at a time
+        self.layers = LayeredProfiles(store)
+        self.hashes_path = os.path.join(cache_dir(), HASHES_FILE)
+        self.writer = ConfWriter(load_hashes(self.hashes_path))
+
+        # App -> [values or None to re-render the stored profile, time of the first request],
+        # layer -> [values, time of the first request], app -> new API family, and the time of
+        # the oldest request
+        self.pending = {}
+        self.pending_layers = {}
+        self.pending_families = {}
+        self.oldest = 0.0
+
+        # Batches run on a pool of their own, so waiting for one doesn't wait for scans or
+        # imports running on the global pool
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        # Running batch and the saves, layers and families it is writing
+        self.worker = None
+        self.writing = {}
+        self.writing_layers = {}
+        self.writing_families = {}
+
+        # Save latencies in seconds, and the number of requests merged into a pending save
+        self.latencies = deque(maxlen=history)
+        self.coalesced = 0
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    def request(self, app, values=None):
+        """
+        Queues a save of an application.
+
+        Args:
+            app (str): Path identifying the application.
+            values (list): Option index of every setting to store, None to only rewrite the
+                confs of the stored profile.
+
+        Returns:
+            None
+        """
+        self._queue(app, values, time.perf_counter())
+        self._schedule()
+
+    def request_many(self, apps):
+        """
+        Queues a rewrite of the confs of applications whose stored profiles changed.
+
+        Args:
+            apps (iterable): Paths identifying the applications.
+
+        Returns:
+            None
+        """
+        now = time.perf_counter()
+        for app in apps:
+            self._queue(app, None, now)
+        self._schedule()
+
+    def request_layer(self, name, values):
+        """
+        Queues a change of a shared layer, which rewrites the confs of the applications that
+        inherit a changed setting from it.
+
+        Args:
+            name (str): GLOBAL_LAYER or one of FAMILIES, see profile_layers.py.
+            values (list): Option index of every setting, 0 to inherit.
+
+        Returns:
+            None
+        """
+        now = time.perf_counter()
+        entry = self.pending_layers.get(name)
+        if entry is None:
+            if not self.pending and not self.pending_layers:
+                self.oldest = now
+            self.pending_layers[name] = [values, now]
+        else:
+            self.coalesced += 1
+            entry[0] = values
+        self._schedule()
+
+    def request_family(self, app, family):
+        """
+        Queues a change of the API family of an application, which rewrites its confs.
+
+        Args:
+            app (str): Path identifying the application.
+            family (str): One of FAMILIES, None if unknown.
+
+        Returns:
+            None
+        """
+        self.pending_families[app] = family
+        self.request(app)
+
+    def _queue(self, app, values, now):
+        entry = self.pending.get(app)
+        if entry is None:
+            if not self.pending and not self.pending_layers:
+                self.oldest = now
+            self.pending[app] = [values, now]
+        else:
+            self.coalesced += 1
+            if values is not None:
+                entry[0] = values
+
+    def _schedule(self):
+        # Wait for the saves to settle, but never hold the oldest one past the maximum delay
+        remaining = self.max_delay - (time.perf_counter() - self.oldest) * 1000
+        self.timer.start(int(max(0, min(self.delay, remaining))))
+
+    def unsaved_values(self, app):
+        """
+        Gets the values of a save of an application that hasn't reached the store yet.
+
+        Args:
+            app (str): Path identifying the application.
+
+        Returns:
+            list: Option index of every setting, None if no save of the application is pending.
+        """
+        for saves in (self.pending, self.writing):
+            entry = saves.get(app)
+            if entry is not None and entry[0] is not None:
+                return entry[0]
+        return None
+
+    def unsaved_layer(self, name):
+        """
+        Gets the values of a change of a shared layer that hasn't reached the store yet.
+
+        Args:
+            name (str): GLOBAL_LAYER or one of FAMILIES.
+
+        Returns:
+            list: Option index of every setting, None if no change of the layer is pending.
+        """
+        for layers in (self.pending_layers, self.writing_layers):
+            entry = layers.get(name)
+            if entry is not None:
+                return entry[0]
+        return None
+
+    def unsaved_family(self, app, default=None):
+        """
+        Gets the API family of an application whose change hasn't reached the store yet.
+
+        Args:
+            app (str): Path identifying the application.
+            default (str): Returned if no change of the family is pending.
+
+        Returns:
+            str: One of FAMILIES or None, default if no change is pending.
+        """
+        for families in (self.pending_families, self.writing_families):
+            if app in families:
+                return families[app]
+        return default
+
+    def flush(self):
+        """
+        Starts writing the pending saves, unless a batch is still running; the saves are then
+        written once it finishes.
+
+        Returns:
+            None
+        """
+        self.timer.stop()
+        if not (self.pending or self.pending_layers) or self.worker is not None:
+            return
+        saves, self.pending = self.pending, {}
+        layers, self.pending_layers = self.pending_layers, {}
+        families, self.pending_families = self.pending_families, {}
+        self.writing, self.writing_layers, self.writing_families = saves, layers, families
+        self.worker = Worker(lambda worker: self.write(saves, layers, families))
+        self.worker.signals.result.connect(self.batch_written)
+        self.worker.signals.error.connect(self.failed.emit)
+        self.worker.signals.finished.connect(self.batch_finished)
+        self.pool.start(self.worker)
+
+    def batch_written(self, result):
+        """
+        Reports the applications a batch wrote and the files it failed to write.
+
+        Args:
+            result (tuple): (number of applications written, (path, message) of every failed write).
+
+        Returns:
+            None
+        """
+        count, errors = result
+        self.saved.emit(count)
+        if errors:
+            self.failed.emit("\n".join(f"{path}: {message}" for path, message in errors))
+
+    def batch_finished(self):
+        """
+        Starts the next batch if saves were requested while the last one was running.
+
+        Returns:
+            None
+        """
+        self.worker = None
+        self.writing, self.writing_layers, self.writing_families = {}, {}, {}
+        if (self.pending or self.pending_layers) and not self.timer.isActive():
+            self.flush()
+
+    def write(self, saves, layers=None, families=None):
+        """
+        Writes a batch of saves: the profiles in one transaction, then the confs and launch
+        wrapper of every application. Called on a pool thread, or on the GUI thread by close().
+
+        Args:
+            saves (dict): App -> [values or None, time of the first request].
+            layers (dict): Layer -> [values, time of the first request] of the changed layers.
+            families (dict): App -> new API family of the applications whose family changed.
+
+        Returns:
+            tuple: (number of applications whose files were all written, (path, message) of
+                every failed write).
+        """
+        for app, family in (families or {}).items():
+            self.layers.set_family(app, family)
+        stores = [(app, values) for app, (values, _) in saves.items() if values is not None]
+        self.layers.set_apps(stores)
+        for app, (values, _) in saves.items():
+            if values is None:
+                self.layers.invalidate(app)
+
+        apps = dict.fromkeys(saves)
+        if layers:
+            # Every stored profile is resolved first, so the layers know which applications
+            # inherit the changed settings; later changes only re-resolve those
+            for app in self.store.apps():
+                self.layers.resolve(app)
+            for name, (values, _) in layers.items():
+                apps.update(dict.fromkeys(self.layers.set_layer(name, values)))
+
+        written = 0
+        for app in apps:
+            profile = vector_profile(self.layers.resolve(app))
+            vkbasalt_path, dxvk_path = conf_paths(self.root, app)
+            outcomes = (self.writer.write(vkbasalt_path, render_vkbasalt(profile), VKBASALT),
+                        self.writer.write(dxvk_path, render_dxvk(profile), DXVK),
+                        write_wrapper(self.writer, self.root, app))
+            written += FAILED not in outcomes
+        errors, self.writer.errors = self.writer.errors, []
+
+        done = time.perf_counter()
+        self.latencies.extend(done - requested for _, requested in saves.values())
+        self.latencies.extend(done - requested for _, requested in (layers or {}).values())
+        return written, errors
+
+    def latency_percentiles(self):
+        """
+        Gets the percentiles of the recent save latencies.
+
+        Returns:
+            dict: Percentile -> latency in milliseconds, see PERCENTILES.
+        """
+        return {point: value * 1000 for point, value in percentiles(self.latencies).items()}
+
+    def close(self):
+        """
+        Writes every pending save before the application quits and stores the conf hash cache.
+
+        Returns:
+            None
+        """
+        self.timer.stop()
+        if self.worker is not None:
+            self.pool.waitForDone()
+            self.worker = None
+        if self.pending or self.pending_layers:
+            saves, self.pending = self.pending, {}
+            layers, self.pending_layers = self.pending_layers, {}
+            families, self.pending_families = self.pending_families, {}
+            try:
+                _, errors = self.write(saves, layers, families)
+            except Exception as error:
+                print(f"Saving {len(saves) + len(layers)} profiles failed: {error}", file=sys.stderr)
+            else:
+                for path, message in errors:
+                    print(f"{path}: {message}", file=sys.stderr)
+        try:
+            save_hashes(self.hashes_path, self.writer.hashes)
+        except OSError as error:
+            print(f"Saving the conf hash cache failed: {error}", file=sys.stderr)
@@ -0,0 +1,240 @@
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, pyqtSignal
+from Settings import SETTINGS, GROUPS, DEPENDENCIES, DependencyGraph
+from tooltips import tooltip_html
+
+# Custom item data roles
+OptionsRole = Qt.ItemDataRole.UserRole + 1      # tuple: Option labels of a setting
+OptionIndexRole = Qt.ItemDataRole.UserRole + 2  # int: Selected option index of a setting
+SettingIdRole = Qt.ItemDataRole.UserRole + 3    # int: ID of a setting
+OptionNotesRole = Qt.ItemDataRole.UserRole + 4  # tuple: Note shown next to every option, None for none
+
+TITLE_COLUMN = 0
+VALUE_COLUMN = 1
+
+
+class SettingsModel(QAbstractItemModel):
+    """
+    Two level model of the settings: the groups at the top level, their settings below.
+
+    Column 0 holds the titles and column 1 the selected option of each setting. Settings whose
+    requirements aren't met are reported without Qt.ItemFlag.ItemIsEnabled.
+
+    Signals:
+        valueChanged(int, int): Setting ID and newly selected option index.
+    """
+
+    valueChanged = pyqtSignal(int, int)
+
+    def __init__(self, settings=SETTINGS, groups=GROUPS, parent=None):
+        """
+        Initializes the SettingsModel.
+
+        Args:
+            settings (tuple): Setting descriptors, the position of a setting is its ID.
+            groups (tuple): (title, first ID, ID after the last one) of every group.
+            parent (QObject): Parent object.
+
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        self.settings = settings
+        self.groups = groups
+        self.graph = DEPENDENCIES if settings is SETTINGS else DependencyGraph(settings)
+
+        # Group of every setting, used to build the parent index of a setting
+        self.group_of = [0] * len(settings)
+        for group, (_, first, stop) in enumerate(groups):
+            for setting_id in range(first, stop):
+                self.group_of[setting_id] = group
+
+        # Selected option and enabled state of every setting
+        self.selected = [0] * len(settings)
+        self.enabled = self.graph.evaluate(self.selected)
+
+        # Setting ID -> note shown next to every option, e.g. the measured frametimes
+        self.notes = {}
+
+    # Index helpers
+
+    def setting_index(self, setting_id, column=VALUE_COLUMN):
+        """
+        Gets the model index of a setting.
+
+        Args:
+            setting_id (int): ID of the setting.
+            column (int): Column of the index.
+
+        Returns:
+            QModelIndex: Index of the setting.
+        """
+        group = self.group_of[setting_id]
+        # The internal ID of a setting row is its group number plus one, 0 marks a group row
+        return self.createIndex(setting_id - self.groups[group][1], column, group + 1)
+
+    def setting_id(self, index):
+        """
+        Gets the ID of the setting at an index.
+
+        Args:
+            index (QModelIndex): Index in the model.
+
+        Returns:
+            int: ID of the setting, None for group rows.
+        """
+        if not index.isValid() or index.internalId() == 0:
+            return None
+        return self.groups[index.internalId() - 1][1] + index.row()
+
+    # QAbstractItemModel interface
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        return self.createIndex(row, column, parent.row() + 1)
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.groups)
+        if parent.internalId() == 0 and parent.column() == 0:
+            _, first, stop = self.groups[parent.row()]
+            return stop - first
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 2
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return ("Setting", "Value")[section]
+        return None
+
+    def flags(self, index):
+        setting_id = self.setting_id(index)
+        if setting_id is None:
+            return Qt.ItemFlag.ItemIsEnabled
+        if not self.enabled[setting_id]:
+            return Qt.ItemFlag.ItemNeverHasChildren
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemNeverHasChildren
+        if index.column() == VALUE_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        setting_id = self.setting_id(index)
+
+        # Group rows only have a title
+        if setting_id is None:
+            if role == Qt.ItemDataRole.DisplayRole and index.column() == TITLE_COLUMN:
+                return self.groups[index.row()][0]
+            return None
+
+        setting = self.settings[setting_id]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.column() == TITLE_COLUMN:
+                indent = "    -" if setting.sub else ""
+                return f"{indent}{setting.title}    \u2753"
+            option = self.selected[setting_id]
+            note = self.notes.get(setting_id, ())[option:option + 1]
+            return f"{setting.options[option]}    {note[0]}" if note and note[0] else setting.options[option]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            # Only built on request, the settings panel shows cached documents instead
+            return f'<html><body>{tooltip_html(setting)}</body></html>'
+        if role in (Qt.ItemDataRole.EditRole, OptionIndexRole):
+            return self.selected[setting_id]
+        if role == OptionsRole:
+            return setting.options
+        if role == OptionNotesRole:
+            return self.notes.get(setting_id)
+        if role == SettingIdRole:
+            return setting_id
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        setting_id = self.setting_id(index)
+        if setting_id is None or role not in (Qt.ItemDataRole.EditRole, OptionIndexRole):
+            return False
+        return self.set_option(setting_id, value)
+
+    # Selection
+
+    def set_option(self, setting_id, option):
+        """
+        Selects an option of a setting and updates the settings that depend on it.
+
+        Args:
+            setting_id (int): ID of the setting.
+            option (int): Option index to select.
+
+        Returns:
+            bool: True if the selection changed.
+        """
+        if self.selected[setting_id] == option:
+            return False
+        self.selected[setting_id] = option
+        changed = self.setting_index(setting_id)
+        self.dataChanged.emit(changed, changed)
+
+        # Only the dependents of the changed setting are re-evaluated
+        for dependent_id, enabled in self.graph.propagate(setting_id, option, self.selected):
+            if self.enabled[dependent_id] != enabled:
+                self.enabled[dependent_id] = enabled
+                self.dataChanged.emit(self.setting_index(dependent_id, TITLE_COLUMN),
+                                      self.setting_index(dependent_id, VALUE_COLUMN))
+
+        self.valueChanged.emit(setting_id, option)
+        return True
+
+    def set_option_notes(self, notes):
+        """
+        Sets the notes shown next to the options of the settings, replacing the previous ones.
+
+        Args:
+            notes (dict): Setting ID -> note of every option, None for options without one.
+
+        Returns:
+            None
+        """
+        if not notes and not self.notes:
+            return
+        self.notes = dict(notes)
+        for group, (_, first, stop) in enumerate(self.groups):
+            if stop > first:
+                self.dataChanged.emit(self.setting_index(first), self.setting_index(stop - 1))
+
+    def values(self):
+        """
+        Gets the selected option of every setting.
+
+        Returns:
+            list: Selected option index of every setting, ordered by ID.
+        """
+        return list(self.selected)
+
+    def load_values(self, values):
+        """
+        Selects the options of a whole profile, followed by a single dependency pass.
+
+        Args:
+            values (list): Option index of every setting, ordered by ID.
+
+        Returns:
+            None
+        """
+        self.selected = list(values)
+        self.enabled = self.graph.evaluate(self.selected)
+
+        # A single change notification per group covers every setting in it
+        for group, (_, first, stop) in enumerate(self.groups):
+            if stop > first:
+                self.dataChanged.emit(self.setting_index(first, TITLE_COLUMN),
+                                      self.setting_index(stop - 1, VALUE_COLUMN))
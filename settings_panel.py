@@ -1,187 +1,183 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QScrollArea, QFrame, QPushButton
-from Settings import *
+from PyQt6.QtCore import QEvent, QRect
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
+                             QTreeView, QHeaderView, QStyledItemDelegate, QAbstractItemView)
+from Settings import SETTINGS, GROUPS
+from settings_model import SettingsModel, OptionsRole, OptionIndexRole, OptionNotesRole, TITLE_COLUMN, VALUE_COLUMN
+from tooltips import TooltipCache, TooltipPopup
+
+
+class OptionDelegate(QStyledItemDelegate):
+    """
+    Edits the value column of the settings view with a combobox.
+
+    Only the item being edited has a QComboBox, every other row is painted by the view from
+    the model, so the number of widgets stays the same however many settings there are.
+    """
+
+    def createEditor(self, parent, option, index):
+        combobox = QComboBox(parent)
+        labels = index.data(OptionsRole)
+        notes = index.data(OptionNotesRole)
+        if notes:
+            labels = [f"{label}    {note}" if note else label for label, note in zip(labels, notes)]
+        combobox.addItems(labels)
+        # Commit as soon as an option is picked instead of waiting for the editor to close
+        combobox.activated.connect(lambda: self.commit_and_close(combobox))
+        return combobox
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentIndex(index.data(OptionIndexRole))
+        editor.showPopup()
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentIndex(), OptionIndexRole)
+
+    def commit_and_close(self, editor):
+        """
+        Writes the picked option to the model and closes the editor.
+
+        Args:
+            editor (QComboBox): Editor that was changed.
+
+        Returns:
+            None
+        """
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QStyledItemDelegate.EndEditHint.NoHint)
+
 
 class SettingsPanel(QWidget):
-    def __init__(self):
+    def __init__(self, settings=SETTINGS, groups=GROUPS):
         """
         Initializes the SettingsPanel widget.
 
         Args:
-            None
+            settings (tuple): Setting descriptors to show, defaults to the Settings registry.
+            groups (tuple): (title, first ID, ID after the last one) of every group.
 
         Returns:
             None
         """
         super().__init__()
 
-        # Set up the scroll area
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
         self.setLayout(QVBoxLayout())
         self.label = QLabel("Settings")
         self.layout().addWidget(self.label)
-        self.layout().addWidget(scroll_area)
-
-        # Create the settings widget
-        self.settings_widget = QWidget()
-        scroll_area.setWidget(self.settings_widget)
-        self.settings_layout = QVBoxLayout(self.settings_widget)
-        self.settings_widget.setLayout(self.settings_layout)
-
-        # Dictionary to store comboboxes and their IDs
-        self.comboboxes = {}
-
-        # List of setting classes
-        setting_classes = [
-            FXAA(),                         #ID - 00 
-            FXAA_Quality_Subpixel(),        #ID - 01
-            FXAA_Quality_Edge_Threshold(),  #ID - 02
-            FXAA_Edge_Threshold_Bias(),     #ID - 03
-            SMAA(),                         #ID - 04
-            SMAA_Edge_Detection(),          #ID - 05
-            SMAA_Threshold(),               #ID - 06
-            SMAA_Search_Steps(),            #ID - 07
-            SMAA_Search_Steps_Diagonal(),   #ID - 08
-            SMAA_Corner_Rounding(),         #ID - 09
-            CAS(),                          #ID - 10
-            DLS_Sharpness(),                #ID - 11
-            DLS_Denoise(),                  #ID - 12
-            VSYNC(),                        #ID - 13
-            Frame_Limit(),                  #ID - 14
-            VSYNC_D3D9(),                   #ID - 15
-            Frame_Limit_D3D9(),             #ID - 16
-            Anistropic_Filtering(),         #ID - 17
-            LOD_Bias(),                     #ID - 18
-            Clamp_Negative_LOD(),           #ID - 19
-            Anistropic_Filtering_D3D9(),    #ID - 20
-            LOD_Bias_D3D9(),                #ID - 21
-            Clamp_Negative_LOD_D3D9(),      #ID - 22
-            HDR(),                          #ID - 23
-            D3D_Level()                     #ID - 24
-            ]
-
-        # Populate the settings
-        self.populate_settings(setting_classes)
-
-        # Add save button
-        self.add_app_button = QPushButton("Save Settings")
-        self.layout().addWidget(self.add_app_button)
 
-    def populate_settings(self, setting_classes):
+        # Add the profile being edited, the selected application's or a shared layer, and the
+        # API family of the application; their items are filled in by the window
+        profile_row = QHBoxLayout()
+        self.layer_box = QComboBox()
+        self.family_box = QComboBox()
+        self.family_box.setEnabled(False)
+        profile_row.addWidget(QLabel("Edit:"))
+        profile_row.addWidget(self.layer_box, 1)
+        profile_row.addWidget(QLabel("API:"))
+        profile_row.addWidget(self.family_box)
+        self.layout().addLayout(profile_row)
+
+        # Model holding the selected option of every setting
+        self.model = SettingsModel(settings, groups, self)
+
+        # Set up the view, rows are painted on demand and only the edited row gets an editor
+        self.view = QTreeView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegateForColumn(VALUE_COLUMN, OptionDelegate(self.view))
+        self.view.setUniformRowHeights(True)
+        self.view.setAlternatingRowColors(True)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.CurrentChanged |
+                                  QAbstractItemView.EditTrigger.SelectedClicked)
+        self.view.header().setStretchLastSection(True)
+        self.view.header().setSectionResizeMode(TITLE_COLUMN, QHeaderView.ResizeMode.Interactive)
+        self.view.header().resizeSection(TITLE_COLUMN, 340)
+        self.view.expandAll()
+        self.layout().addWidget(self.view)
+
+        # Tooltips are laid out on first hover and drawn from a cache afterwards
+        self.tooltip_cache = TooltipCache()
+        self.tooltip_popup = TooltipPopup(self)
+        self.view.setMouseTracking(True)
+        self.view.viewport().installEventFilter(self)
+
+        # Options of the profile loaded last, to tell which settings have been changed since
+        self.loaded_values = self.model.values()
+
+        # Add save button, enabled once an application is selected, and a button applying the
+        # changed settings to every selected application
+        buttons = QHBoxLayout()
+        self.add_app_button = QPushButton("Save Settings")
+        self.add_app_button.setEnabled(False)
+        self.apply_button = QPushButton("Apply to Selected")
+        self.apply_button.setEnabled(False)
+        buttons.addWidget(self.add_app_button)
+        buttons.addWidget(self.apply_button)
+        self.layout().addLayout(buttons)
+
+    def eventFilter(self, watched, event):
+        if watched is self.view.viewport():
+            event_type = event.type()
+            if event_type == QEvent.Type.ToolTip:
+                self.show_tooltip(event.pos(), event.globalPos())
+                return True
+            if event_type in (QEvent.Type.Leave, QEvent.Type.MouseButtonPress, QEvent.Type.Wheel):
+                self.tooltip_popup.hide()
+            elif event_type == QEvent.Type.MouseMove and self.tooltip_popup.isVisible():
+                if not self.tooltip_popup.area.contains(event.globalPosition().toPoint()):
+                    self.tooltip_popup.hide()
+        return super().eventFilter(watched, event)
+
+    def show_tooltip(self, position, global_position):
         """
-        Populates the settings panel with the provided setting classes.
+        Shows the tooltip of the setting under the mouse pointer.
 
         Args:
-            setting_classes (list): List of setting classes to populate the panel with.
+            position (QPoint): Position of the pointer in the viewport.
+            global_position (QPoint): Global position of the pointer.
 
         Returns:
             None
         """
-        for setting_class in setting_classes:
-            title = setting_class.get_title()
-            options = setting_class.get_options()
-            tooltip_header = setting_class.get_tooltip_header()
-            tooltip_body = setting_class.get_tooltip_body()
-            self.add_setting(title, options, tooltip_header, tooltip_body)
-
-    def add_setting(self, title, options, tooltip_header, tooltip_body):
+        index = self.view.indexAt(position)
+        setting_id = self.model.setting_id(index)
+        if setting_id is None:
+            self.tooltip_popup.hide()
+            return
+
+        # The tooltip stays up while the pointer is over the same row
+        row = self.view.visualRect(index)
+        row = QRect(0, row.top(), self.view.viewport().width(), row.height())
+        area = QRect(self.view.viewport().mapToGlobal(row.topLeft()), row.size())
+        document = self.tooltip_cache.document(self.model.settings[setting_id])
+        self.tooltip_popup.show_document(document, global_position, area)
+
+    def values(self):
         """
-        Adds a setting to the settings panel.
-
-        Args:
-            title (str): Title of the setting.
-            options (list): List of options for the setting.
-            tooltip_header (str): Header text for the tooltip.
-            tooltip_body (str): Body text for the tooltip.
+        Gets the selected option of every setting.
 
         Returns:
-            None
+            list: Selected option index of every setting, ordered by ID.
         """
-        container = QWidget()
-        container_layout = QVBoxLayout(container)
-
-        # Create label
-        label = QLabel(f'<html><body>{title}</body></html>')
-
-        # Create combobox
-        combobox = QComboBox()
-        combobox.addItems(options)
-
-        # Set tooltip for label
-        label.setToolTip(f'<html><body>{tooltip_header}{tooltip_body}</body></html>')
-        
-        container_layout.addWidget(label)
-        container_layout.addWidget(combobox)
-
-        # Add horizontal rule after specific combobox indices
-        hr = QFrame()
-        hr.setFrameShape(QFrame.Shape.HLine)
-        hr.setFrameShadow(QFrame.Shadow.Plain)
-        
-        if (len(self.settings_layout) == 3 or 
-            len(self.settings_layout) == 9 or 
-            len(self.settings_layout) == 10 or 
-            len(self.settings_layout) == 12 or 
-            len(self.settings_layout) == 16 or 
-            len(self.settings_layout) == 22 or 
-            len(self.settings_layout) == 23):
-            container_layout.addWidget(hr)
-
-        self.settings_layout.addWidget(container)
-
-        # Assign an ID to the combobox and store it in the dictionary
-        combobox_id = len(self.comboboxes)
-        combobox.setProperty("id", combobox_id)
-        self.comboboxes[combobox_id] = combobox
-
-        # Connect the combobox signal to the function for enabling or disabling other comboboxes
-        combobox.currentIndexChanged.connect(self.toggle_comboboxes)
-
-        # Disable specific comboboxes initially
-        if combobox_id in [1, 2, 3, 5, 6, 7, 8, 9]:
-            combobox.setEnabled(False)
-
-    def toggle_comboboxes(self, index):
+        return self.model.values()
+
+    def load_values(self, values):
         """
-        Toggles the state of comboboxes based on the index of the selected item.
+        Selects the options of a whole profile, followed by a single dependency pass.
 
         Args:
-            index (int): Index of the selected item in the combobox.
+            values (list): Option index of every setting, ordered by ID.
 
         Returns:
             None
         """
-        # Get the combobox that emitted the signal
-        sender_combobox = self.sender()
-        # Get the combobox ID
-        combobox_id = sender_combobox.property("id")
-
-        # Determine which comboboxes to activate based on the sender_combobox
-        if combobox_id == 0 and index == 1:
-            for id in range(1, 4):
-                self.comboboxes[id].setEnabled(True)
-        elif combobox_id == 0 and index in [0, 2]:
-            for id in range(1, 4):
-                self.comboboxes[id].setEnabled(False)
-        elif combobox_id == 4 and index == 1:
-            for id in range(5, 10):
-                self.comboboxes[id].setEnabled(True)
-        elif combobox_id == 4 and index in [0, 2]:
-            for id in range(5, 10):
-                self.comboboxes[id].setEnabled(False)
-        elif combobox_id == 13 and index in [1, 2]:
-            self.comboboxes[15].setEnabled(False)
-        elif combobox_id == 13 and index in [0, 3]:
-            self.comboboxes[15].setEnabled(True)
-        elif combobox_id == 15 and index in [1, 2]:
-            self.comboboxes[13].setEnabled(False)
-        elif combobox_id == 15 and index in [0, 3]:
-            self.comboboxes[13].setEnabled(True)
-        elif combobox_id == 14 and index in [1, 2, 3, 4, 5, 6]:
-            self.comboboxes[16].setEnabled(False)
-        elif combobox_id == 14 and index in [0, 7]:
-            self.comboboxes[16].setEnabled(True)
-        elif combobox_id == 16 and index in [1, 2, 3, 4, 5, 6]:
-            self.comboboxes[14].setEnabled(False)
-        elif combobox_id == 16 and index in [0, 7]:
-            self.comboboxes[14].setEnabled(True)
\ No newline at end of file
+        self.loaded_values = list(values)
+        self.model.load_values(values)
+
+    def changed_values(self):
+        """
+        Gets the settings whose option differs from the profile loaded last.
+
+        Returns:
+            dict: Setting ID -> selected option index.
+        """
+        return {setting_id: option for setting_id, (loaded, option)
+                in enumerate(zip(self.loaded_values, self.model.values())) if loaded != option}
@@ -0,0 +1,267 @@
+"""
+Discovers the games installed by Steam.
+
+Every library folder listed in libraryfolders.vdf is searched for appmanifest_*.acf files,
+which are parsed on a thread pool. The parsed manifests are kept in an on-disk index keyed by
+library, file name, modification time and size, so a rescan only parses the manifests that
+changed and a warm rescan costs little more than listing the steamapps directories.
+
+This module must stay free of any PyQt6 imports, the GUI runs it on a Worker.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from app_index import SOURCE_STEAM
+from app_paths import cache_dir
+
+INDEX_FILE = "steam_index.json"
+INDEX_VERSION = 1
+
+# Steam installs that are runtimes and tools rather than games
+TOOL_PREFIXES = ("Proton", "Steam Linux Runtime", "Steamworks Common Redistributables")
+
+
+def steam_roots():
+    """
+    Finds the Steam installations of the current user.
+
+    Returns:
+        list: Real paths of the Steam root directories that exist.
+    """
+    home = os.path.expanduser("~")
+    candidates = (
+        os.path.join(home, ".steam", "steam"),
+        os.path.join(home, ".local", "share", "Steam"),
+        os.path.join(home, ".var", "app", "com.valvesoftware.Steam", ".local", "share", "Steam"),
+    )
+    roots = []
+    for candidate in candidates:
+        path = os.path.realpath(candidate)
+        if os.path.isdir(os.path.join(path, "steamapps")) and path not in roots:
+            roots.append(path)
+    return roots
+
+
+def parse_vdf(text):
+    """
+    Parses Valve's KeyValues text format, as used by .vdf and .acf files.
+
+    Args:
+        text (str): File contents.
+
+    Returns:
+        dict: Nested dicts of string keys and values.
+    """
+    root = {}
+    stack = [root]
+    key = None
+    i = 0
+    length = len(text)
+    while i < length:
+        ch = text[i]
+        if ch.isspace():
+            i += 1
+        elif ch == "/" and text.startswith("//", i):
+            newline = text.find("\n", i)
+            i = length if newline < 0 else newline + 1
+        elif ch == "{":
+            child = {}
+            stack[-1][key] = child
+            stack.append(child)
+            key = None
+            i += 1
+        elif ch == "}":
+            if len(stack) > 1:
+                stack.pop()
+            i += 1
+        else:
+            # A quoted or bare token, which is either a key or the value of the pending key
+            if ch == '"':
+                end = i + 1
+                chars = []
+                while end < length and text[end] != '"':
+                    if text[end] == "\\" and end + 1 < length:
+                        end += 1
+                    chars.append(text[end])
+                    end += 1
+                token = "".join(chars)
+                i = end + 1
+            else:
+                end = i
+                while end < length and not text[end].isspace() and text[end] not in '{}"':
+                    end += 1
+                token = text[i:end]
+                i = end
+            if key is None:
+                key = token
+            else:
+                stack[-1][key] = token
+                key = None
+    return root
+
+
+def library_folders(root):
+    """
+    Lists the library folders of a Steam installation.
+
+    Args:
+        root (str): Steam root directory.
+
+    Returns:
+        list: Real paths of the library folders, the root's own library first.
+    """
+    folders = [root]
+    try:
+        with open(os.path.join(root, "steamapps", "libraryfolders.vdf"), encoding="utf-8", errors="replace") as file:
+            data = parse_vdf(file.read())
+    except OSError:
+        return folders
+
+    section = data.get("libraryfolders") or data.get("LibraryFolders") or {}
+    for value in section.values():
+        # Newer files hold a dict per library, older ones just the path
+        path = value.get("path") if isinstance(value, dict) else value
+        if isinstance(path, str) and path:
+            path = os.path.realpath(path)
+            if path not in folders and os.path.isdir(os.path.join(path, "steamapps")):
+                folders.append(path)
+    return folders
+
+
+def parse_manifest(path):
+    """
+    Reads the fields of an appmanifest_*.acf file the app list needs.
+
+    Args:
+        path (str): Path of the manifest.
+
+    Returns:
+        list: [app ID, name, install directory name], None if the manifest can't be read.
+    """
+    try:
+        with open(path, encoding="utf-8", errors="replace") as file:
+            state = parse_vdf(file.read()).get("AppState", {})
+    except OSError:
+        return None
+    if not isinstance(state, dict) or "appid" not in state:
+        return None
+    return [state["appid"], state.get("name", state["appid"]), state.get("installdir", "")]
+
+
+def _list_manifests(library):
+    # (file name, mtime_ns, size) of every manifest in a library
+    steamapps = os.path.join(library, "steamapps")
+    found = []
+    try:
+        with os.scandir(steamapps) as entries:
+            for entry in entries:
+                if entry.name.startswith("appmanifest_") and entry.name.endswith(".acf"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    found.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    except OSError:
+        pass
+    return found
+
+
+def load_index(path):
+    """
+    Loads the on-disk manifest index.
+
+    Args:
+        path (str): Path of the index file.
+
+    Returns:
+        dict: Library -> {manifest file name -> [mtime_ns, size, app ID, name, install directory name]}.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != INDEX_VERSION:
+        return {}
+    return data.get("manifests", {})
+
+
+def save_index(path, manifests):
+    """
+    Writes the on-disk manifest index, replacing the old one atomically.
+
+    Args:
+        path (str): Path of the index file.
+        manifests (dict): Library -> {manifest file name -> [mtime_ns, size, app ID, name, install directory name]}.
+
+    Returns:
+        None
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump({"version": INDEX_VERSION, "manifests": manifests}, file, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+def scan_steam_libraries(roots=None, index_path=None, on_batch=None, jobs=8):
+    """
+    Finds every game installed in the Steam libraries.
+
+    Args:
+        roots (list): Steam root directories, found automatically if None.
+        index_path (str): Path of the on-disk index, defaults to one in the cache directory.
+        on_batch (callable): Called with the list of app entries of each library as soon as
+            that library has been scanned.
+        jobs (int): Number of threads used for listing libraries and parsing manifests.
+
+    Returns:
+        list: (name, install path, SOURCE_STEAM) app entries.
+    """
+    roots = steam_roots() if roots is None else roots
+    index_path = index_path or os.path.join(cache_dir(), INDEX_FILE)
+    index = load_index(index_path)
+    fresh_index = {}
+    entries = []
+
+    libraries = []
+    for root in roots:
+        for folder in library_folders(root):
+            if folder not in libraries:
+                libraries.append(folder)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        listings = pool.map(_list_manifests, libraries)
+        for library, manifests in zip(libraries, listings):
+            cached_library = index.get(library, {})
+            fresh_library = fresh_index[library] = {}
+
+            # Parse only the manifests whose modification time or size changed
+            stale = []
+            for name, mtime_ns, size in manifests:
+                cached = cached_library.get(name)
+                if cached is not None and cached[0] == mtime_ns and cached[1] == size:
+                    fresh_library[name] = cached
+                else:
+                    stale.append((name, mtime_ns, size))
+            steamapps = os.path.join(library, "steamapps")
+            parsed = pool.map(parse_manifest, [os.path.join(steamapps, item[0]) for item in stale])
+            for (name, mtime_ns, size), fields in zip(stale, parsed):
+                if fields is not None:
+                    fresh_library[name] = [mtime_ns, size, *fields]
+
+            batch = []
+            common = os.path.join(steamapps, "common")
+            for _, _, _, title, install_dir in fresh_library.values():
+                if not title.startswith(TOOL_PREFIXES):
+                    batch.append((title, os.path.join(common, install_dir), SOURCE_STEAM))
+            entries.extend(batch)
+            if on_batch is not None and batch:
+                on_batch(batch)
+
+    if fresh_index != index:
+        try:
+            save_index(index_path, fresh_index)
+        except OSError:
+            pass
+    return entries
@@ -0,0 +1,177 @@
+"""
+Rich text tooltips of the settings panel.
+
+Tooltips are kept as plain text in the setting descriptors. The first time a setting is hovered,
+its tooltip is turned into HTML and laid out into a QTextDocument. The document is kept in an
+LRU keyed by setting and locale and drawn by a TooltipPopup. QToolTip would parse the rich text
+again every time it is shown.
+"""
+from collections import OrderedDict
+from html import escape
+from PyQt6.QtCore import Qt, QCoreApplication, QLocale, QPoint, QRect
+from PyQt6.QtGui import QTextDocument, QPainter, QPalette, QAbstractTextDocumentLayout
+from PyQt6.QtWidgets import QFrame, QToolTip, QApplication
+
+# Style of the header, description and notes of a tooltip
+HEADER_STYLE = 'style="font-weight: bold; text-decoration: underline;"'
+BODY_STYLE = 'style="font-weight: bold;"'
+NOTES_STYLE = 'style="font-style: italic;"'
+
+# Widest a tooltip gets before its lines wrap, in pixels
+TOOLTIP_WIDTH = 480
+
+
+def tooltip_html(setting):
+    """
+    Builds the HTML of a setting's tooltip, translating its text for the current locale.
+
+    Args:
+        setting (BaseSetting): Setting whose tooltip to build.
+
+    Returns:
+        str: Tooltip encoded in HTML.
+    """
+    def lines(texts):
+        return "<br>".join(escape(QCoreApplication.translate("Settings", text), quote=False) for text in texts)
+
+    parts = [f'<h3 {HEADER_STYLE}>{lines((setting.tooltip_header,))}</h3>']
+    if setting.tooltip_body:
+        parts.append(f'<p {BODY_STYLE}>{lines(setting.tooltip_body)}</p>')
+    if setting.tooltip_notes:
+        parts.append(f'<p {NOTES_STYLE}>{lines(setting.tooltip_notes)}</p>')
+    return "".join(parts)
+
+
+class TooltipCache:
+    """
+    LRU of laid out tooltip documents, keyed by setting key and locale name.
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Initializes the TooltipCache.
+
+        Args:
+            capacity (int): Number of documents kept.
+
+        Returns:
+            None
+        """
+        self.capacity = capacity
+        self._documents = OrderedDict()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def document(self, setting):
+        """
+        Gets the laid out tooltip of a setting, building it on first use.
+
+        Args:
+            setting (BaseSetting): Setting whose tooltip to get.
+
+        Returns:
+            QTextDocument: Tooltip document, sized to its contents.
+        """
+        key = (setting.key, QLocale().name())
+        document = self._documents.get(key)
+        if document is not None:
+            self._documents.move_to_end(key)
+            return document
+
+        document = QTextDocument()
+        document.setDefaultFont(QToolTip.font())
+        document.setDocumentMargin(0)
+        document.setHtml(tooltip_html(setting))
+        # Shrink short tooltips to their widest line, wrap long ones
+        document.setTextWidth(TOOLTIP_WIDTH)
+        document.setTextWidth(min(document.idealWidth(), TOOLTIP_WIDTH))
+
+        self._documents[key] = document
+        if len(self._documents) > self.capacity:
+            self._documents.popitem(last=False)
+        return document
+
+    def clear(self):
+        """
+        Drops every cached document, e.g. after the font or locale changed.
+
+        Returns:
+            None
+        """
+        self._documents.clear()
+
+
+class TooltipPopup(QFrame):
+    """
+    Tooltip window that draws a prepared QTextDocument.
+    """
+
+    MARGIN = 6
+
+    def __init__(self, parent=None):
+        """
+        Initializes the TooltipPopup.
+
+        Args:
+            parent (QWidget): Parent widget.
+
+        Returns:
+            None
+        """
+        super().__init__(parent, Qt.WindowType.ToolTip)
+        self.document = None
+
+        # Area the tooltip belongs to, in global coordinates
+        self.area = QRect()
+
+        palette = QToolTip.palette()
+        palette.setColor(QPalette.ColorRole.Window, palette.color(QPalette.ColorRole.ToolTipBase))
+        palette.setColor(QPalette.ColorRole.WindowText, palette.color(QPalette.ColorRole.ToolTipText))
+        self.setPalette(palette)
+        self.setAutoFillBackground(True)
+        self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Plain)
+
+    def show_document(self, document, position, area):
+        """
+        Shows a document next to the mouse pointer.
+
+        Args:
+            document (QTextDocument): Tooltip to show.
+            position (QPoint): Global position of the mouse pointer.
+            area (QRect): Global rectangle the tooltip belongs to, see area.
+
+        Returns:
+            None
+        """
+        self.document = document
+        self.area = area
+        padding = self.MARGIN + self.frameWidth()
+        size = document.size().toSize()
+        self.resize(size.width() + 2 * padding, size.height() + 2 * padding)
+
+        # Below and right of the pointer, moved back inside the screen if it doesn't fit
+        geometry = QRect(position + QPoint(2, 16), self.size())
+        screen = QApplication.screenAt(position)
+        if screen is not None:
+            available = screen.availableGeometry()
+            if geometry.right() > available.right():
+                geometry.moveRight(available.right())
+            if geometry.bottom() > available.bottom():
+                geometry.moveBottom(position.y() - 4)
+            geometry.moveLeft(max(geometry.left(), available.left()))
+            geometry.moveTop(max(geometry.top(), available.top()))
+        self.move(geometry.topLeft())
+        self.show()
+        self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.document is None:
+            return
+        painter = QPainter(self)
+        padding = self.MARGIN + self.frameWidth()
+        painter.translate(padding, padding)
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.ColorRole.Text, self.palette().color(QPalette.ColorRole.WindowText))
+        self.document.documentLayout().draw(painter, context)
@@ -0,0 +1,224 @@
+"""
+Discovers the game executables inside Wine and Proton prefixes.
+
+The drive_c of every prefix is walked with os.scandir on a thread pool. Trees that never hold
+games (the Windows directory, redistributables, installers...) are pruned. A directory-mtime
+cache stores the executables and subdirectories of every directory walked. On a rescan, a
+directory whose mtime hasn't changed is taken from the cache instead of being listed again.
+Executables are handed out in batches while the walk is still running.
+
+This module must stay free of any PyQt6 imports, the GUI runs it on a Worker.
+"""
+import json
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app_index import SOURCE_WINE
+from app_paths import cache_dir
+from steam_scanner import steam_roots, library_folders
+
+INDEX_FILE = "wine_index.json"
+INDEX_VERSION = 1
+
+# Directory names (case-folded) whose whole tree is skipped
+PRUNED_DIRS = frozenset((
+    "windows", "system32", "syswow64", "programdata", "users", "internet explorer",
+    "windows nt", "windows media player", "windows photo viewer", "common files",
+    "microsoft.net", "dotnet", "directx", "_commonredist", "commonredist", "redist",
+    "redists", "redistributable", "redistributables", "vcredist", "__installer",
+    "installer", "installers", "_installer", "support", "easyanticheat", "battleye",
+))
+
+# Executable name prefixes (case-folded) that are never games
+IGNORED_EXE_PREFIXES = (
+    "unins", "setup", "install", "vc_redist", "vcredist", "dxsetup", "dotnet",
+    "crashreport", "crashhandler", "unitycrashhandler", "easyanticheat", "uploader",
+)
+
+
+def wine_prefixes():
+    """
+    Finds the Wine and Proton prefixes of the current user.
+
+    Returns:
+        list: Real paths of the prefixes that have a drive_c.
+    """
+    home = os.path.expanduser("~")
+    candidates = [os.environ.get("WINEPREFIX", ""), os.path.join(home, ".wine")]
+
+    # Prefixes kept side by side, e.g. by winetricks or Lutris
+    for parent in (os.path.join(home, ".local", "share", "wineprefixes"), os.path.join(home, "Games")):
+        try:
+            candidates.extend(entry.path for entry in os.scandir(parent) if entry.is_dir())
+        except OSError:
+            pass
+
+    # Proton prefixes of every Steam library
+    for root in steam_roots():
+        for library in library_folders(root):
+            try:
+                compatdata = os.scandir(os.path.join(library, "steamapps", "compatdata"))
+            except OSError:
+                continue
+            with compatdata:
+                candidates.extend(os.path.join(entry.path, "pfx") for entry in compatdata if entry.is_dir())
+
+    prefixes = []
+    for candidate in candidates:
+        if not candidate:
+            continue
+        path = os.path.realpath(candidate)
+        if path not in prefixes and os.path.isdir(os.path.join(path, "drive_c")):
+            prefixes.append(path)
+    return prefixes
+
+
+def is_game_exe(name):
+    """
+    Checks whether a file name looks like a game executable.
+
+    Args:
+        name (str): File name.
+
+    Returns:
+        bool: True for .exe files that aren't installers, uninstallers or helpers.
+    """
+    folded = name.casefold()
+    return folded.endswith(".exe") and not folded.startswith(IGNORED_EXE_PREFIXES)
+
+
+def _list_directory(path, cached):
+    # Returns (path, mtime_ns, exe names, subdirectory names) of a directory
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return path, None, [], []
+    if cached is not None and cached[0] == mtime_ns:
+        return path, mtime_ns, cached[1], cached[2]
+
+    exes = []
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.casefold() not in PRUNED_DIRS:
+                            subdirs.append(entry.name)
+                    elif is_game_exe(entry.name):
+                        exes.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return path, None, [], []
+    return path, mtime_ns, exes, subdirs
+
+
+def load_index(path):
+    """
+    Loads the on-disk directory index.
+
+    Args:
+        path (str): Path of the index file.
+
+    Returns:
+        dict: Directory path -> [mtime_ns, exe names, subdirectory names].
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != INDEX_VERSION:
+        return {}
+    return data.get("directories", {})
+
+
+def save_index(path, directories):
+    """
+    Writes the on-disk directory index, replacing the old one atomically.
+
+    Args:
+        path (str): Path of the index file.
+        directories (dict): Directory path -> [mtime_ns, exe names, subdirectory names].
+
+    Returns:
+        None
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump({"version": INDEX_VERSION, "directories": directories}, file, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+def scan_wine_prefixes(prefixes=None, index_path=None, on_batch=None, jobs=8,
+                       batch_size=256, batch_interval=0.1, cancelled=None):
+    """
+    Finds the game executables in Wine and Proton prefixes.
+
+    Args:
+        prefixes (list): Prefix directories, found automatically if None.
+        index_path (str): Path of the on-disk index, defaults to one in the cache directory.
+        on_batch (callable): Called with lists of app entries while the walk is running, at
+            least every batch_interval seconds or batch_size entries.
+        jobs (int): Number of threads listing directories.
+        batch_size (int): Number of entries that triggers a batch.
+        batch_interval (float): Seconds after which pending entries are handed out anyway.
+        cancelled (callable): Returns True when the walk should stop early.
+
+    Returns:
+        list: (exe name, exe path, SOURCE_WINE) app entries.
+    """
+    prefixes = wine_prefixes() if prefixes is None else prefixes
+    index_path = index_path or os.path.join(cache_dir(), INDEX_FILE)
+    index = load_index(index_path)
+    fresh_index = {}
+    entries = []
+    pending = []
+    last_batch = time.monotonic()
+
+    # Finished listings arrive on a queue, each one queues the listings of its subdirectories
+    finished = queue.SimpleQueue()
+    outstanding = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        def submit(path):
+            pool.submit(_list_directory, path, index.get(path)).add_done_callback(finished.put)
+
+        for prefix in prefixes:
+            submit(os.path.join(prefix, "drive_c"))
+            outstanding += 1
+
+        while outstanding:
+            if cancelled is not None and cancelled():
+                pool.shutdown(cancel_futures=True)
+                return entries
+            try:
+                future = finished.get(timeout=batch_interval)
+            except queue.Empty:
+                future = None
+            if future is not None:
+                outstanding -= 1
+                path, mtime_ns, exes, subdirs = future.result()
+                if mtime_ns is not None:
+                    fresh_index[path] = [mtime_ns, exes, subdirs]
+                    pending.extend((exe, os.path.join(path, exe), SOURCE_WINE) for exe in exes)
+                    for subdir in subdirs:
+                        submit(os.path.join(path, subdir))
+                        outstanding += 1
+
+            now = time.monotonic()
+            if pending and (len(pending) >= batch_size or now - last_batch >= batch_interval or not outstanding):
+                entries.extend(pending)
+                if on_batch is not None:
+                    on_batch(pending)
+                pending = []
+                last_batch = now
+
+    if fresh_index != index:
+        try:
+            save_index(index_path, fresh_index)
+        except OSError:
+            pass
+    return entries
@@ -0,0 +1,74 @@
+import threading
+import traceback
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """
+    Signals of a Worker, emitted from the pool thread and delivered on the GUI thread.
+
+    Signals:
+        batch(object): A batch of partial results, e.g. applications found so far.
+        progress(int, int): Items done and items in total.
+        result(object): Return value of the task.
+        error(str): Traceback of an exception raised by the task.
+        finished(): Emitted last, whether the task succeeded, failed or was cancelled.
+    """
+
+    batch = pyqtSignal(object)
+    progress = pyqtSignal(int, int)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """
+    Runs a task on a QThreadPool so the GUI thread keeps painting.
+
+    The task is called with the worker itself, which it can use to report batches and
+    progress through the worker's signals and to check whether it has been cancelled.
+    """
+
+    def __init__(self, task):
+        """
+        Initializes the Worker.
+
+        Args:
+            task (callable): Called as task(worker), its return value is emitted as the result.
+
+        Returns:
+            None
+        """
+        super().__init__()
+        self.task = task
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+
+    def run(self):
+        try:
+            result = self.task(self)
+        except Exception:
+            self.signals.error.emit(traceback.format_exc())
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+    def cancel(self):
+        """
+        Asks the task to stop at its next check.
+
+        Returns:
+            None
+        """
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        """
+        Checks whether the worker has been cancelled.
+
+        Returns:
+            bool: True once cancel() has been called.
+        """
+        return self._cancelled.is_set()